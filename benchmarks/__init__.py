@@ -0,0 +1,4 @@
+"""
+Benchmarks of the hot paths of telegram_task, run locally with
+python -m benchmarks, compared against the stored baseline.
+"""
@@ -0,0 +1,7 @@
+"""Running the benchmarks as python -m benchmarks"""
+import logging
+import sys
+from benchmarks.run import main
+
+logging.basicConfig(level=logging.ERROR)
+sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Cases module holds the benchmarked scenarios.
+Each case returns its metrics keyed on their names,
+measured on smaller sizes when run quickly.
+"""
+from __future__ import annotations
+from typing import Callable
+from dataclasses import dataclass
+from datetime import datetime, time
+from time import perf_counter
+import asyncio
+import contextlib
+import gc
+import subprocess
+import sys
+from telegram_task.clock import Clock
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.fakebot import FakeBotApi
+from telegram_task.line import (
+    LineManager,
+    JobOrder,
+    CronJobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+)
+from telegram_task.outbox import ReportPipeline
+from telegram_task.president import President
+
+ADMIN_ID = 42
+UNLIMITED_RATE = 10**6
+ROUNDS = 3
+
+
+@dataclass
+class Metric:
+    """A measured value, and which way of it is better"""
+
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+class NoopWorker(Worker):
+    """Worker whose jobs do nothing, leaving only the overhead to be measured"""
+
+    async def perform_task(self, job_description: JobDescription) -> JobReport:
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
+class FixedClock(Clock):
+    """Clock stopped at the given time, so that every plan is the same"""
+
+    def __init__(self, now: datetime):
+        self.__now: datetime = now
+
+    def now(self) -> datetime:
+        return self.__now
+
+
+CASES: dict[str, Callable[[bool], dict[str, Metric]]] = {}
+
+
+def case(function: Callable[[bool], dict[str, Metric]]):
+    """Registers the function as a benchmark case"""
+    CASES[function.__name__] = function
+    return function
+
+
+@contextlib.contextmanager
+def garbage_collection_disabled():
+    """Keeps the collector from adding its pauses to the measurements"""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def best_of(function: Callable[[], float], repeat: int = ROUNDS) -> float:
+    """Returns the shortest seconds the function has measured over the rounds"""
+    with garbage_collection_disabled():
+        return min(function() for _ in range(repeat))
+
+
+def duration_of(function: Callable[[], None]) -> Callable[[], float]:
+    """Returns a function measuring the seconds a call to the function takes"""
+
+    def measure() -> float:
+        started_at = perf_counter()
+        function()
+        return perf_counter() - started_at
+
+    return measure
+
+
+def import_duration(module: str) -> float:
+    """Returns the seconds importing the module takes in a fresh interpreter"""
+    code = (
+        "import time; started_at = time.perf_counter(); "
+        + f"import {module}; print(time.perf_counter() - started_at)"
+    )
+    return float(
+        subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+    )
+
+
+def deputy_president(fake_api: FakeBotApi) -> tuple[TelegramDeputy, President]:
+    """Returns a deputy talking to the fake API, unthrottled, and its president"""
+    deputy = TelegramDeputy(
+        telegram_app=fake_api.build_application(),
+        telegram_admin_id=ADMIN_ID,
+        report_pipeline=ReportPipeline(
+            global_rate=UNLIMITED_RATE,
+            per_chat_rate=UNLIMITED_RATE,
+            per_chat_burst=UNLIMITED_RATE,
+        ),
+    )
+    president = President(telegram_deputy=deputy)
+    president.add_line(LineManager(worker=NoopWorker()))
+    return deputy, president
+
+
+@case
+def import_time(quick: bool) -> dict[str, Metric]:
+    """Importing the president headless, and along with the telegram deputy"""
+    return {
+        f"import[{x}]": Metric(
+            value=min(import_duration(x) for _ in range(ROUNDS if quick else 10)),
+            unit="s",
+        )
+        for x in ("telegram_task.president", "telegram_task.deputy")
+    }
+
+
+@case
+def cron_planning(quick: bool) -> dict[str, Metric]:
+    """Listing today's cron jobs and scheduling them, spread over ten lines"""
+    metrics = {}
+    for size in (1_000,) if quick else (1_000, 10_000, 100_000):
+        president = President(clock=FixedClock(datetime(2023, 1, 2, 0, 0, 30)))
+        for line_index in range(10):
+            line_manager = LineManager(
+                worker=NoopWorker(),
+                cron_job_orders=[
+                    CronJobOrder(
+                        daily_run_time=time(
+                            hour=x * 86399 // size // 3600,
+                            minute=x * 86399 // size // 60 % 60,
+                            second=x * 86399 // size % 60,
+                        )
+                    )
+                    for x in range(line_index, size, 10)
+                ],
+            )
+            line_manager.display_name = f"Line {line_index}"
+            president.add_line(line_manager)
+        repeat = ROUNDS if size > 10_000 else 10 * ROUNDS
+        metrics[f"get_daily_cron_jobs[{size}]"] = Metric(
+            value=best_of(duration_of(president.get_daily_cron_jobs), repeat),
+            unit="s",
+        )
+        metrics[f"plan_day[{size}]"] = Metric(
+            # pylint: disable=protected-access
+            value=best_of(duration_of(president._President__plan_day), repeat),
+            unit="s",
+        )
+    return metrics
+
+
+@case
+def perform_task(quick: bool) -> dict[str, Metric]:
+    """Overhead of a line performing a job which does nothing"""
+    count = 2_000 if quick else 20_000
+
+    async def perform_jobs() -> float:
+        line_manager = LineManager(worker=NoopWorker())
+        await line_manager.start()
+        started_at = perf_counter()
+        for _ in range(count):
+            await line_manager.perform_task(JobOrder())
+        elapsed = perf_counter() - started_at
+        await line_manager.stop()
+        return elapsed
+
+    elapsed = best_of(lambda: asyncio.run(perform_jobs()))
+    return {"perform_task.overhead": Metric(value=elapsed / count * 1e6, unit="us")}
+
+
+@case
+def telegram_listener(quick: bool) -> dict[str, Metric]:
+    """Updates handled per second, polled from the fake API"""
+    count = 500 if quick else 5_000
+
+    async def handle_updates() -> float:
+        fake_api = FakeBotApi()
+        deputy, president = deputy_president(fake_api)
+        async with president:
+            started_at = perf_counter()
+            for _ in range(count):
+                fake_api.push_message("noop", chat_id=ADMIN_ID)
+            while deputy.update_dispatcher.stats.handled < count:
+                await asyncio.sleep(0.001)
+            await deputy.update_dispatcher.drain()
+            return perf_counter() - started_at
+
+    elapsed = best_of(lambda: asyncio.run(handle_updates()))
+    return {
+        "telegram_listener.throughput": Metric(
+            value=count / elapsed, unit="updates/s", higher_is_better=True
+        )
+    }
+
+
+@case
+def telegram_report(quick: bool) -> dict[str, Metric]:
+    """Reports sent per second, submitted one at a time as the jobs go"""
+    count = 1_000 if quick else 10_000
+
+    async def send_reports() -> float:
+        deputy, president = deputy_president(FakeBotApi())
+        async with president:
+            await deputy.report_pipeline.flush()
+            started_at = perf_counter()
+            for index in range(count):
+                deputy.telegram_report(text=f"Report {index}")
+                await asyncio.sleep(0)
+            await deputy.report_pipeline.flush()
+            return perf_counter() - started_at
+
+    elapsed = best_of(lambda: asyncio.run(send_reports()))
+    return {
+        "telegram_report.throughput": Metric(
+            value=count / elapsed, unit="reports/s", higher_is_better=True
+        )
+    }
@@ -0,0 +1,108 @@
+"""
+Run module runs the benchmark cases, writes their metrics as JSON
+and compares them with a baseline, failing on regressions.
+"""
+from __future__ import annotations
+import argparse
+import json
+import pathlib
+import platform
+import sys
+from benchmarks.cases import CASES, Metric
+
+BASELINE_PATH = pathlib.Path(__file__).parent / "baseline.json"
+
+
+def run(names: list[str] = None, quick: bool = False) -> dict[str, Metric]:
+    """Runs the given cases, or all of them, returns their metrics"""
+    metrics = {}
+    for name in names if names else CASES:
+        metrics.update(CASES[name](quick))
+    return metrics
+
+
+def to_json(metrics: dict[str, Metric], quick: bool = False) -> dict:
+    """Returns the metrics, along with the host they are measured on, as JSON"""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": quick,
+        "metrics": {
+            name: {
+                "value": metric.value,
+                "unit": metric.unit,
+                "higher_is_better": metric.higher_is_better,
+            }
+            for name, metric in metrics.items()
+        },
+    }
+
+
+def compare(metrics: dict[str, Metric], baseline: dict) -> dict[str, float]:
+    """
+    Returns the relative speed-up of each metric found in the baseline,
+    negative when it has got slower, -50% being twice as slow
+    """
+    changes = {}
+    for name, metric in metrics.items():
+        base = baseline["metrics"].get(name)
+        if not base or not base["value"]:
+            continue
+        changes[name] = (
+            metric.value / base["value"] - 1
+            if metric.higher_is_better
+            else base["value"] / metric.value - 1
+        )
+    return changes
+
+
+def main(argv: list[str] = None) -> int:
+    """Command line entry, returns 1 if any metric has regressed"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--case", action="append", choices=list(CASES), help="run only this case"
+    )
+    parser.add_argument("--quick", action="store_true", help="run smaller sizes")
+    parser.add_argument("--output", type=pathlib.Path, help="write the results")
+    parser.add_argument("--baseline", type=pathlib.Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="slow-down allowed before a metric counts as regressed, "
+        + "baselines are only comparable on the machine they are taken on",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store the results in the baseline, replacing those of the cases run",
+    )
+    args = parser.parse_args(argv)
+    metrics = run(names=args.case, quick=args.quick)
+    results = to_json(metrics, quick=args.quick)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    baseline = (
+        json.loads(args.baseline.read_text())
+        if args.baseline.exists()
+        else {"metrics": {}}
+    )
+    if args.update_baseline:
+        # Cases left out of the run keep their baseline
+        results["metrics"] = {**baseline["metrics"], **results["metrics"]}
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        baseline = results
+    changes = compare(metrics, baseline)
+    regressions = [x for x, y in changes.items() if y < -args.tolerance]
+    for name, metric in metrics.items():
+        change = f"{changes[name]:+.1%}" if name in changes else "new"
+        flag = "  REGRESSED" if name in regressions else ""
+        print(f"{name:<36}{metric.value:>14.6g} {metric.unit:<10}{change:>8}{flag}")
+    if regressions:
+        print(
+            f"{len(regressions)} metrics have regressed by more than "
+            + f"{args.tolerance:.0%} against {args.baseline}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
@@ -5,7 +5,8 @@ from datetime import datetime, time, timedelta
 from logging.handlers import TimedRotatingFileHandler
 from dotenv import load_dotenv
 import telegram.ext
-from telegram_task.president import President, TelegramDeputy
+from telegram_task.president import President
+from telegram_task.deputy import TelegramDeputy
 from telegram_task.line import (
     LineManager,
     CronJobOrder,
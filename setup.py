@@ -13,7 +13,7 @@ A telegram bot token and the ID of the manager account are the only \
 essential input variables needed to enable this project as your \
 personal assistant in running and handling jobs on a daily basis.
     """,
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks"]),
     install_requires=[
         "python-telegram-bot[socks,job-queue]==20.6",
         "python-dotenv==1.0.0",
@@ -0,0 +1,110 @@
+"""
+Admission module holds the limiters used for capping
+the number of jobs run at once, either on a single line or
+on the whole enterprise.
+"""
+from __future__ import annotations
+from collections import deque
+import asyncio
+
+
+class AdmissionRejected(Exception):
+    """
+    Exception raised when a job is not admitted,
+    as the waiting queue is full or the limiter is closed
+    """
+
+
+class ConcurrencyLimiter:
+    """
+    ConcurrencyLimiter is a weighted semaphore with a bounded FIFO waiting queue.
+    Each job takes one unit of the capacity, unless the limiter is weighted
+    in which case the job order's weight is taken.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        max_queue_size: int = None,
+        weighted: bool = False,
+        name: str = None,
+    ):
+        if capacity < 1:
+            raise ValueError("Limiter capacity should be a positive number.")
+        self.capacity: int = capacity
+        self.max_queue_size: int = max_queue_size
+        self.weighted: bool = weighted
+        self.name: str = name if name else self.__class__.__name__
+        self.in_use: int = 0
+        self.is_closed: bool = False
+        self.__waiters: deque[tuple[int, asyncio.Future]] = deque()
+
+    def __str__(self) -> str:
+        return self.name
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting to be admitted"""
+        return len(self.__waiters)
+
+    def is_full(self) -> bool:
+        """Checks if a new job has to wait in the queue"""
+        return bool(self.__waiters) or self.in_use >= self.capacity
+
+    async def acquire(self, weight: int = 1) -> None:
+        """Waits for enough capacity, raises AdmissionRejected if queue is full"""
+        weight = weight if self.weighted else 1
+        if self.is_closed:
+            raise AdmissionRejected(f"{self} is closed to new jobs.")
+        if weight > self.capacity:
+            raise AdmissionRejected(
+                f"Weight {weight} exceeds the capacity of {self} ({self.capacity})."
+            )
+        if not self.__waiters and self.in_use + weight <= self.capacity:
+            self.in_use += weight
+            return
+        if self.max_queue_size is not None and self.queue_depth >= self.max_queue_size:
+            raise AdmissionRejected(
+                f"Waiting queue of {self} is full ({self.max_queue_size} jobs)."
+            )
+        future = asyncio.get_running_loop().create_future()
+        waiter = (weight, future)
+        self.__waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and not future.exception():
+                self.release(weight)
+            else:
+                if waiter in self.__waiters:
+                    self.__waiters.remove(waiter)
+                self.__wake_up_waiters()
+            raise
+
+    def close(self) -> None:
+        """Rejects the waiting jobs and any new one, admitted jobs go on"""
+        self.is_closed = True
+        while self.__waiters:
+            _, future = self.__waiters.popleft()
+            if not future.done():
+                future.set_exception(
+                    AdmissionRejected(f"{self} is closed to new jobs.")
+                )
+
+    def release(self, weight: int = 1) -> None:
+        """Gives the capacity back and admits the waiting jobs that fit"""
+        self.in_use -= weight if self.weighted else 1
+        self.__wake_up_waiters()
+
+    def __wake_up_waiters(self) -> None:
+        """Admits waiting jobs in FIFO order as long as they fit"""
+        while self.__waiters:
+            weight, future = self.__waiters[0]
+            if future.done():
+                self.__waiters.popleft()
+                continue
+            if self.in_use + weight > self.capacity:
+                break
+            self.__waiters.popleft()
+            self.in_use += weight
+            future.set_result(None)
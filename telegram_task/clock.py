@@ -0,0 +1,80 @@
+"""
+Clock module holds the source of the current time used by the president,
+its lines and its scheduler, and an event loop running on virtual time,
+so that days of schedules can be replayed in seconds.
+"""
+from __future__ import annotations
+from datetime import datetime, date, timedelta
+import asyncio
+import selectors
+
+
+class Clock:
+    """Clock of the host, the default of every component"""
+
+    def now(self) -> datetime:
+        """Returns the current naive local time"""
+        return datetime.now()
+
+    def today(self) -> date:
+        """Returns the current local date"""
+        return self.now().date()
+
+
+SYSTEM_CLOCK: Clock = Clock()
+
+
+class VirtualClock(Clock):
+    """Clock reading the time of a virtual time event loop"""
+
+    def __init__(self, loop: VirtualTimeEventLoop, start: datetime = None):
+        self.loop: VirtualTimeEventLoop = loop
+        self.start: datetime = start if start else datetime.now()
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self.loop.time())
+
+
+# pylint: disable=too-many-ancestors
+class _VirtualTimeSelector(selectors.DefaultSelector):
+    """
+    Selector which, instead of blocking until the next timer,
+    lets the loop's virtual time jump to it
+    """
+
+    def __init__(self, loop: VirtualTimeEventLoop):
+        super().__init__()
+        self.loop: VirtualTimeEventLoop = loop
+
+    def select(self, timeout: float = None) -> list:
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # No timer is pending, only I/O or threads can wake the loop up
+            return super().select(None)
+        self.loop.advance(timeout)
+        return []
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop whose time only advances when all its tasks wait on timers,
+    jumping straight to the earliest one.
+    Sleeps and timeouts take no real time, while the work done on the loop
+    takes no virtual time; work done on threads or processes is not waited
+    for before jumping, so workers are best run on the loop itself.
+    """
+
+    def __init__(self, start: datetime = None):
+        self.__virtual_time: float = 0
+        super().__init__(selector=_VirtualTimeSelector(loop=self))
+        self.clock: VirtualClock = VirtualClock(loop=self, start=start)
+
+    def time(self) -> float:
+        """Returns the virtual seconds elapsed since the loop was created"""
+        return self.__virtual_time
+
+    def advance(self, seconds: float) -> None:
+        """Moves the virtual time forward"""
+        self.__virtual_time += max(seconds, 0)
@@ -0,0 +1,678 @@
+"""
+Deputy module holds the telegram side of the president,
+kept apart so that the telegram stack is only imported when a bot is used.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Hashable
+import logging
+import uuid
+import asyncio
+import time
+from datetime import datetime
+import pytz
+import telegram
+import telegram.ext
+import telegram.error
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+import telegram_task.line
+import telegram_task.metrics
+import telegram_task.outbox
+import telegram_task.dispatch
+import telegram_task.panels
+import telegram_task.schema
+
+if TYPE_CHECKING:
+    import telegram_task.president
+
+
+# pylint: disable=too-many-instance-attributes
+class TelegramDeputy:
+    """
+    Takes over all the president's tasks
+    that are related to telegram
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    _INITIATOR_MESSAGE: str = "."
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        telegram_app: telegram.ext.Application = None,
+        telegram_admin_id: int = None,
+        report_pipeline: telegram_task.outbox.ReportPipeline = None,
+        max_concurrent_updates: int = 8,
+        max_job_panels: int = 100,
+        job_panel_ttl: float = 24 * 60 * 60,
+    ):
+        self.president: telegram_task.president.President = None
+        self.__telegram_app: telegram.ext.Application = telegram_app
+        self.__telegram_admin_id: int = (
+            int(telegram_admin_id) if telegram_admin_id else None
+        )
+        self.__telegram_que: telegram_task.dispatch.TimestampedQueue = None
+        self.__start_time_utc: datetime = None
+        self.update_dispatcher: telegram_task.dispatch.UpdateDispatcher = (
+            telegram_task.dispatch.UpdateDispatcher(
+                handler=self.__handle_update,
+                max_in_flight=max_concurrent_updates,
+                ordering_key=self.ordering_key,
+            )
+        )
+        self.__telegram_bot_username: str = None
+        self.__new_job_panels: telegram_task.panels.PanelStore = (
+            telegram_task.panels.PanelStore(
+                max_panels=max_job_panels, ttl=job_panel_ttl
+            )
+        )
+        self.report_pipeline: telegram_task.outbox.ReportPipeline = (
+            report_pipeline
+            if report_pipeline
+            else telegram_task.outbox.ReportPipeline()
+        )
+        if self.__telegram_app and not self.report_pipeline.bot:
+            self.report_pipeline.bot = self.__telegram_app.bot
+        self.__report_pipeline_task: asyncio.Task = None
+        self.__updater: telegram.ext.Updater = None
+
+    async def init_updater(self) -> None:
+        """Initiates the telegram updater and starts polling"""
+        if self.__telegram_app:
+            self._LOGGER.info("Initiating telegram bot.")
+            self.__telegram_que = telegram_task.dispatch.TimestampedQueue()
+            self.__updater = telegram.ext.Updater(
+                self.__telegram_app.bot, update_queue=self.__telegram_que
+            )
+            await self.__updater.initialize()
+            await self.__updater.start_polling()
+            await self.__telegram_app.job_queue.start()
+            self.__metric("telegram_task_telegram_queue_depth").labels().set_function(
+                lambda: self.report_pipeline.queue_depth
+            )
+            self.__metric(
+                "telegram_task_telegram_updates_in_flight"
+            ).labels().set_function(lambda: self.update_dispatcher.stats.in_flight)
+            if not self.__report_pipeline_task:
+                self.__report_pipeline_task = asyncio.create_task(
+                    self.report_pipeline.run()
+                )
+            self._LOGGER.info("Telegram bot is initiated.")
+
+    async def shutdown(self, timeout: float = None) -> None:
+        """
+        Stops polling, waits for the updates being handled
+        and sends the queued reports within the timeout,
+        then stops the updater and the job queue
+        """
+        if not self.__telegram_app:
+            return
+        if self.__updater and self.__updater.running:
+            await self.__updater.stop()
+        if not await self.update_dispatcher.drain(timeout=timeout):
+            self._LOGGER.warning(
+                "[%d] updates are still being handled at shutdown.",
+                self.update_dispatcher.stats.in_flight,
+            )
+        if self.__report_pipeline_task:
+            if not await self.report_pipeline.flush(timeout=timeout):
+                self._LOGGER.warning(
+                    "[%d] queued reports are not sent before shutdown.",
+                    self.report_pipeline.queue_depth,
+                )
+            self.report_pipeline.stop()
+            await self.__report_pipeline_task
+            self.__report_pipeline_task = None
+        if self.__updater:
+            await self.__updater.shutdown()
+            self.__updater = None
+        if self.__telegram_app.job_queue.scheduler.running:
+            await self.__telegram_app.job_queue.stop()
+        self.__metric("telegram_task_telegram_queue_depth").remove()
+        self.__metric("telegram_task_telegram_updates_in_flight").remove()
+        self._LOGGER.info("Telegram bot is stopped.")
+
+    async def telegram_listener(self) -> None:
+        """Waiting for updates from telegram, dispatching them concurrently"""
+        if self.__telegram_app:
+            self._LOGGER.info("telegram_listener loop has started.")
+            self.__start_time_utc = datetime.now(tz=pytz.utc)
+            updates = self.__metric("telegram_task_telegram_updates_total").labels()
+            update_lag = self.__metric(
+                "telegram_task_telegram_update_lag_seconds"
+            ).labels()
+            while self.president.is_running:
+                received_at, update = await self.__telegram_que.get()
+                updates.inc()
+                update_lag.observe(time.monotonic() - received_at)
+                self._LOGGER.info("Update from telegram %s", update)
+                await self.update_dispatcher.dispatch(
+                    update=update, received_at=received_at
+                )
+            self._LOGGER.info("telegram_listener is done.")
+
+    @staticmethod
+    def ordering_key(update: telegram.Update) -> Hashable:
+        """
+        Orders the updates on the job or panel they target rather than
+        on the admin chat they all come from, so that a slow edit of
+        one panel holds back only the updates of that same panel
+        """
+        if update.callback_query and update.callback_query.data:
+            action, _, target = update.callback_query.data.partition(",")
+            return target if target else action
+        words = (
+            update.message.text.split(" ")
+            if update.message and update.message.text
+            else []
+        )
+        if len(words) > 5 and words[1] == "SpecificNewJobPanelUpdate":
+            return words[5]
+        return telegram_task.dispatch.chat_of(update)
+
+    async def __handle_update(self, update: telegram.Update) -> None:
+        """Handles a single update from telegram"""
+        if self.__is_update_valid(update):
+            try:
+                if update.callback_query:
+                    await self.__handle_telegram_callback_query(update)
+                elif update.message and update.message.date > self.__start_time_utc:
+                    await self.__handle_telegram_message(update)
+            except ValueError:
+                self._LOGGER.error("ValueError: exception on converting input.")
+            except KeyError:
+                self._LOGGER.error("KeyError: exception on converting input.")
+            # pylint: disable=broad-except
+            # Preventing an exception on handling a message \
+            # from bringing down the whole operation
+            except Exception as ex:
+                self._LOGGER.fatal(
+                    "Exception on handling [%s]: %s",
+                    str(update),
+                    ex,
+                    exc_info=True,
+                )
+        elif update.message.chat.type == telegram.constants.ChatType.PRIVATE:
+            await self.__handle_message_from_unknown(update)
+
+    def telegram_report(self, text: str) -> None:
+        """Telegram simple report making"""
+        if self.__telegram_app:
+            is_queued = self.report_pipeline.submit(
+                telegram_task.outbox.OutboundMessage(
+                    chat_id=self.__telegram_admin_id,
+                    text=text,
+                    parse_mode=telegram.constants.ParseMode.HTML,
+                )
+            )
+            self.__metric("telegram_task_telegram_reports_total").labels(
+                "queued" if is_queued else "dropped"
+            ).inc()
+
+    def __metric(self, name: str) -> telegram_task.metrics.Metric:
+        """Returns one of the telegram metrics, registering it at first"""
+        metrics = self.president.metrics
+        match name:
+            case "telegram_task_telegram_updates_total":
+                return metrics.counter(name, "Updates received from telegram")
+            case "telegram_task_telegram_update_lag_seconds":
+                return metrics.histogram(
+                    name,
+                    "Seconds an update waits between being polled and dispatched",
+                    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10),
+                )
+            case "telegram_task_telegram_updates_in_flight":
+                return metrics.gauge(name, "Updates being handled")
+            case "telegram_task_telegram_reports_total":
+                return metrics.counter(
+                    name, "Reports submitted, by whether they are queued", ("result",)
+                )
+            case "telegram_task_telegram_queue_depth":
+                return metrics.gauge(name, "Reports waiting to be sent")
+        raise ValueError(f"Deputy has no metric named [{name}].")
+
+    async def publish_digest(self, text: str, message_id: int = None) -> int:
+        """Sends the digest message, or edits it in place if already sent"""
+        if not self.__telegram_app:
+            return message_id
+        if message_id:
+            try:
+                await self.report_pipeline.call(
+                    chat_id=self.__telegram_admin_id,
+                    request=lambda: self.__telegram_app.bot.edit_message_text(
+                        chat_id=self.__telegram_admin_id,
+                        message_id=message_id,
+                        text=text,
+                        parse_mode=telegram.constants.ParseMode.HTML,
+                    ),
+                )
+                return message_id
+            except telegram.error.BadRequest as ex:
+                if "not modified" in str(ex):
+                    return message_id
+                self._LOGGER.warning("Digest message could not be edited: %s", ex)
+        message = await self.report_pipeline.call(
+            chat_id=self.__telegram_admin_id,
+            request=lambda: self.__telegram_app.bot.send_message(
+                chat_id=self.__telegram_admin_id,
+                text=text,
+                parse_mode=telegram.constants.ParseMode.HTML,
+            ),
+        )
+        return message.message_id
+
+    async def __handle_message_from_unknown(self, update: telegram.Update) -> None:
+        """Handles a message received from an unknown user"""
+        self.telegram_report(
+            text=f"""
+⚠️ Alert ⚠️
+Message from unknown user [{update.effective_user.id}, \
+{update.effective_user.full_name}, @{update.effective_user.username}]
+"""
+        )
+        await self.report_pipeline.call(
+            chat_id=self.__telegram_admin_id,
+            request=lambda: self.__telegram_app.bot.forward_message(
+                chat_id=self.__telegram_admin_id,
+                from_chat_id=update.effective_chat.id,
+                message_id=update.effective_message.message_id,
+            ),
+        )
+
+    async def __handle_telegram_message(self, update: telegram.Update) -> None:
+        """Handle message from telegram admin"""
+        message_splitted = update.message.text.split(" ")
+        match message_splitted[0]:
+            case self._INITIATOR_MESSAGE:
+                self.__telegram_introduction_message(update)
+            case _:
+                if (
+                    message_splitted[0]
+                    == "@" + await self.__get_telegram_bot_username()
+                ):
+                    await self.__handle_telegram_inline_query(message_splitted)
+
+    async def __handle_telegram_inline_query(self, message_splitted: list[str]) -> None:
+        """Handle inline query from telegram admin"""
+        if len(message_splitted) > 1:
+            match message_splitted[1]:
+                case "SpecificNewJobPanelUpdate":
+                    await self.__telegram_specific_new_job_panel_update(
+                        message_splitted=message_splitted
+                    )
+
+    async def __handle_telegram_callback_query(self, update: telegram.Update) -> None:
+        """Handle callback query from telegram admin"""
+        callback_data_splitted = update.callback_query.data.split(",")
+        match callback_data_splitted[0]:
+            case "HighFive":
+                await self.__telegram_high_five(update=update)
+            case "DailyTaskReport":
+                self.report_daily_tasks(do_log=False)
+            case "NewJobPanel":
+                self.__telegram_new_job_panel()
+            case "SpecificNewJobPanel":
+                await self.__telegram_specific_new_job_panel(
+                    callback_data=callback_data_splitted
+                )
+            case "ExecuteSpecificNewJob":
+                await self.__telegram_execute_specific_new_job(
+                    callback_data=callback_data_splitted
+                )
+            case "RunningJobsPanel":
+                self.__telegram_running_jobs_panel()
+            case "CancelJob":
+                self.__telegram_cancel_job(callback_data=callback_data_splitted)
+            case "StatsPanel":
+                await self.__telegram_stats_panel()
+
+    async def __telegram_execute_specific_new_job(
+        self, callback_data: list[str]
+    ) -> None:
+        """Executes the new job from its specifications"""
+        if len(callback_data) > 1:
+            job_code = uuid.UUID(callback_data[1])
+            job_panel = self.__new_job_panels.pop(job_code)
+            if not job_panel:
+                self.__report_expired_panel(job_code)
+                return
+            text, _ = self.__telegram_specific_new_job_panel_message(
+                line_manager=job_panel.line, job_order=job_panel.job_order
+            )
+            await self.report_pipeline.call(
+                chat_id=self.__telegram_admin_id,
+                request=lambda: self.__telegram_app.bot.edit_message_text(
+                    chat_id=self.__telegram_admin_id,
+                    message_id=job_panel.message.id,
+                    text=f"{text}\n\nRoger that 🦾✅",
+                    parse_mode=telegram.constants.ParseMode.HTML,
+                ),
+            )
+            asyncio.create_task(
+                self.president.perform_job(
+                    line=job_panel.line, job_order=job_panel.job_order
+                )
+            )
+
+    async def __telegram_specific_new_job_panel_update(
+        self, message_splitted: list[str]
+    ) -> None:
+        """Updates some parameter in the new job panel"""
+        if len(message_splitted) > 7:
+            property_name = message_splitted[2]
+            job_code = uuid.UUID(hex=message_splitted[5])
+            new_value_str = message_splitted[7]
+            job_panel = self.__new_job_panels.get(job_code)
+            if not job_panel:
+                self.__report_expired_panel(job_code)
+                return
+            job_description = job_panel.job_order.job_description
+            schema = telegram_task.schema.schema_of(type(job_description))
+            setattr(
+                job_description,
+                property_name,
+                schema.convert(field_name=property_name, raw_val=new_value_str),
+            )
+            text, inline_keyboard = self.__telegram_specific_new_job_panel_message(
+                line_manager=job_panel.line, job_order=job_panel.job_order
+            )
+            job_panel.message = await self.report_pipeline.call(
+                chat_id=self.__telegram_admin_id,
+                request=lambda: self.__telegram_app.bot.edit_message_text(
+                    chat_id=self.__telegram_admin_id,
+                    message_id=job_panel.message.id,
+                    text=text,
+                    parse_mode=telegram.constants.ParseMode.HTML,
+                    reply_markup=inline_keyboard,
+                ),
+            )
+
+    def __report_expired_panel(self, job_code: uuid.UUID) -> None:
+        """Lets the admin know the panel is not available anymore"""
+        self.telegram_report(
+            text=f"Panel of job <b>{job_code}</b> has expired ⌛ please open a new one."
+        )
+
+    async def __telegram_specific_new_job_panel(self, callback_data: list[str]) -> None:
+        """
+        Sends the panel for a specific job
+        so that the user proceeds with the new job request
+        """
+        line = self.president.get_line(callback_data[1])
+        if not line:
+            self.telegram_report(text=f"No line named <b>{callback_data[1]}</b> 🤷")
+            return
+        job_order = telegram_task.line.JobOrder(
+            job_description=line.worker.default_job_description()
+        )
+        text, inline_keyboard = self.__telegram_specific_new_job_panel_message(
+            line_manager=line, job_order=job_order
+        )
+        message = await self.report_pipeline.call(
+            chat_id=self.__telegram_admin_id,
+            request=lambda: self.__telegram_app.bot.send_message(
+                chat_id=self.__telegram_admin_id,
+                text=text,
+                parse_mode=telegram.constants.ParseMode.HTML,
+                reply_markup=inline_keyboard,
+            ),
+        )
+        self.__new_job_panels.put(
+            telegram_task.panels.JobPanel(
+                line=line, job_order=job_order, message=message
+            )
+        )
+
+    def __telegram_specific_new_job_panel_message(
+        self,
+        line_manager: telegram_task.line.LineManager,
+        job_order: telegram_task.line.JobOrder,
+    ) -> tuple[str, InlineKeyboardMarkup]:
+        """Returns the message text and keyboard for a specific job request"""
+        schema = telegram_task.schema.schema_of(type(job_order.job_description))
+        text = f"""
+Please validate the job description for <b>{line_manager}</b> \
+📝 with code <b>{job_order.job_code}</b> 🔑
+
+""" + schema.render(
+            job_order.job_description
+        )
+        keybord_rows = schema.keyboard_rows(job_code=job_order.job_code)
+        keybord_rows.append(
+            [
+                InlineKeyboardButton(
+                    text="Execute ✅",
+                    callback_data=f"ExecuteSpecificNewJob,{job_order.job_code}",
+                )
+            ]
+        )
+        return text, InlineKeyboardMarkup(keybord_rows)
+
+    def __telegram_new_job_panel(self) -> None:
+        """Sends the panel so that the user chooses a new job"""
+        text = "Please choose a job 🦾\n" + "\n".join(
+            [f"{i+1}. <b>{x}</b>" for i, x in enumerate(self.president.lines)]
+        )
+        reply_markup_buttons = [
+            [
+                InlineKeyboardButton(
+                    text=str(i * 5 + j + 1),
+                    callback_data=f"SpecificNewJobPanel,{x.display_name}",
+                )
+                for j, x in enumerate(self.president.lines[i : i + 5])
+            ]
+            for i in range(0, len(self.president.lines), 5)
+        ]
+        self.report_pipeline.submit(
+            telegram_task.outbox.OutboundMessage(
+                chat_id=self.__telegram_admin_id,
+                text=text,
+                parse_mode=telegram.constants.ParseMode.HTML,
+                reply_markup=InlineKeyboardMarkup(reply_markup_buttons),
+            )
+        )
+
+    def __telegram_running_jobs_panel(self) -> None:
+        """Sends the list of running jobs, each with a button to cancel it"""
+        running_jobs = [
+            (line, job_code)
+            for line in self.president.lines
+            for job_code in line.running_jobs
+        ]
+        if not running_jobs:
+            self.telegram_report(text="No job is running at the moment 😴")
+            return
+        text = "Running jobs 🏃\n" + "\n".join(
+            [
+                f"{i+1}. <b>{line}</b> on job <b>{job_code}</b>"
+                for i, (line, job_code) in enumerate(running_jobs)
+            ]
+        )
+        reply_markup_buttons = [
+            [
+                InlineKeyboardButton(
+                    text=f"Cancel {i * 5 + j + 1} 🛑",
+                    callback_data=f"CancelJob,{job_code}",
+                )
+                for j, (_, job_code) in enumerate(running_jobs[i : i + 5])
+            ]
+            for i in range(0, len(running_jobs), 5)
+        ]
+        self.report_pipeline.submit(
+            telegram_task.outbox.OutboundMessage(
+                chat_id=self.__telegram_admin_id,
+                text=text,
+                parse_mode=telegram.constants.ParseMode.HTML,
+                reply_markup=InlineKeyboardMarkup(reply_markup_buttons),
+            )
+        )
+
+    def __telegram_cancel_job(self, callback_data: list[str]) -> None:
+        """Cancels a running job by its job code"""
+        if len(callback_data) > 1:
+            job_code = uuid.UUID(callback_data[1])
+            if not any(x.cancel_job(job_code) for x in self.president.lines):
+                self.telegram_report(
+                    text=f"Job <b>{job_code}</b> is not running anymore 🤷"
+                )
+
+    async def __telegram_stats_panel(self) -> None:
+        """Sends the duration percentiles and failure rate of each line"""
+        job_history = self.president.job_history
+        if not job_history:
+            self.telegram_report(text="No job history is kept 🤷")
+            return
+        stats = [
+            (x, await job_history.stats(x.display_name)) for x in self.president.lines
+        ]
+        self.telegram_report(
+            text=f"📈 Stats of the latest {job_history.window} runs per line\n"
+            + "\n".join(
+                [
+                    f"<b>{line}</b>: {x.runs} runs, ❌ {x.failure_rate:.1%} failed, "
+                    + f"⏱ p50 {x.p50:.1f}s, p95 {x.p95:.1f}s, p99 {x.p99:.1f}s"
+                    if x.runs
+                    else f"<b>{line}</b>: no runs yet"
+                    for line, x in stats
+                ]
+            )
+        )
+
+    async def __telegram_high_five(self, update: telegram.Update) -> None:
+        """Test method, high five on request"""
+        await self.report_pipeline.call(
+            chat_id=self.__telegram_admin_id,
+            request=lambda: self.__telegram_app.bot.answer_callback_query(
+                callback_query_id=update.callback_query.id,
+                text="One is glad to be of service 🙂 🙏",
+                show_alert=True,
+            ),
+        )
+
+    def __telegram_introduction_message(self, update: telegram.Update) -> None:
+        self.report_pipeline.submit(
+            telegram_task.outbox.OutboundMessage(
+                chat_id=self.__telegram_admin_id,
+                text=f"""
+Hello <b>{update.effective_user.first_name}</b> 🙂
+How may I help you today?
+""",
+                parse_mode=telegram.constants.ParseMode.HTML,
+                reply_markup=InlineKeyboardMarkup(
+                    [
+                        [
+                            InlineKeyboardButton(
+                                text="High Five 🙏", callback_data="HighFive"
+                            )
+                        ],
+                        [
+                            InlineKeyboardButton(
+                                text="Daily Task Report 📑",
+                                callback_data="DailyTaskReport",
+                            )
+                        ],
+                        [
+                            InlineKeyboardButton(
+                                text="Got a Job? 🦾", callback_data="NewJobPanel"
+                            )
+                        ],
+                        [
+                            InlineKeyboardButton(
+                                text="Running Jobs 🏃",
+                                callback_data="RunningJobsPanel",
+                            )
+                        ],
+                        [
+                            InlineKeyboardButton(
+                                text="Stats 📈",
+                                callback_data="StatsPanel",
+                            )
+                        ],
+                    ]
+                ),
+            )
+        )
+
+    async def __get_telegram_bot_username(self) -> str:
+        """Returns the telegram bot username, either from memory or by fetching"""
+        if self.__telegram_bot_username:
+            return self.__telegram_bot_username
+        self.__telegram_bot_username = (await self.__telegram_app.bot.get_me()).username
+        return self.__telegram_bot_username
+
+    def __is_update_valid(self, update: telegram.Update) -> bool:
+        """Checks if update is from the admin chat"""
+        return (
+            update.effective_chat
+            and int(update.effective_chat.id) == self.__telegram_admin_id
+        )
+
+    def report_daily_tasks(self, do_log: bool) -> None:
+        """Report daily tasks on telegram"""
+
+        def job_status_to_emoji(status: bool) -> str:
+            match status:
+                case True:
+                    return "✅"
+                case False:
+                    return "❌"
+                case _:
+                    return "⚙️"
+
+        report = (
+            (
+                f"📑 Cron jobs for {self.president.clock.now():%Y/%m/%d}:\n"
+                + "\n".join(
+                    [
+                        f"{job_status_to_emoji(x[2])} {x[0]} 🕔 {x[1].daily_run_time:%H:%M:%S}"
+                        for x in self.president.daily_cron_jobs
+                    ]
+                )
+                if self.president.daily_cron_jobs
+                else f"📑 No cron jobs for {self.president.clock.now():%Y/%m/%d}."
+            )
+            + self.__recurring_report()
+            + self.__load_report()
+            + self.__timer_report()
+        )
+        if do_log:
+            self._LOGGER.info(report)
+        self.telegram_report(report)
+
+    def __recurring_report(self) -> str:
+        """Returns the recurring jobs with their next fire times, if there is any"""
+        recurring_jobs = self.president.get_recurring_jobs()
+        if not recurring_jobs:
+            return ""
+        return "\n\n🔁 Recurring jobs:\n" + "\n".join(
+            [f"{x} {y.recurrence} ⏭ {z:%H:%M:%S}" for x, y, z in recurring_jobs]
+        )
+
+    def __timer_report(self) -> str:
+        """Returns how late the scheduler has been firing, if it has fired"""
+        stats = self.president.scheduler.stats
+        if not stats.fired:
+            return ""
+        return (
+            f"\n\n⏰ Timers: {stats.fired} fired, "
+            + f"{stats.mean_lateness:.2f}s late on average, "
+            + f"{stats.max_lateness:.2f}s at most"
+        )
+
+    def __load_report(self) -> str:
+        """Returns usage and queue depth of the limiters and pools, if any"""
+        limiters = [x.limiter for x in self.president.lines if x.limiter]
+        limiters.extend(self.president.limiters)
+        pools = [x.worker_pool for x in self.president.lines if x.worker_pool]
+        if not limiters and not pools:
+            return ""
+        return "\n\n🚦 Load:\n" + "\n".join(
+            [
+                f"{x}: {x.in_use}/{x.capacity} in use, {x.queue_depth} waiting"
+                for x in limiters
+            ]
+            + [
+                f"{x} workers: {x.busy_count}/{x.size} busy "
+                + f"(max {x.max_size}), {x.queue_depth} waiting"
+                for x in pools
+            ]
+        )
@@ -0,0 +1,169 @@
+"""
+Digest module holds the reporter which aggregates the job notifications
+of the lines into a periodic summary, edited in place on telegram.
+"""
+from __future__ import annotations
+from typing import Callable, Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+import asyncio
+import uuid
+
+
+@dataclass
+class LineDigest:
+    """Counts of a single line's jobs in the current digest period"""
+
+    started: int = 0
+    succeeded: int = 0
+    warned: int = 0
+    failed: int = 0
+
+    @property
+    def running(self) -> int:
+        """Jobs started but not finished yet"""
+        return self.started - self.succeeded - self.failed
+
+
+@dataclass
+class DigestPeriod:
+    """State of the digest message currently being edited"""
+
+    started_at: datetime
+    lines: dict[str, LineDigest] = field(default_factory=dict)
+    failures: list[str] = field(default_factory=list)
+    message_id: int = None
+
+
+class DigestReporter:
+    """
+    DigestReporter buffers job events and publishes one summary per interval.
+    The summary message of the day is edited in place, until it gets too long.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    MAX_TEXT_LENGTH: int = 4096
+    MAX_FAILURE_LENGTH: int = 1024
+
+    def __init__(
+        self,
+        interval: float = 60,
+        publisher: Callable[[str, int], Awaitable[int]] = None,
+    ):
+        self.interval: float = interval
+        self.publisher: Callable[[str, int], Awaitable[int]] = publisher
+        self.__period: DigestPeriod = DigestPeriod(started_at=datetime.now())
+        self.__is_dirty: bool = False
+        self.__is_running: bool = False
+
+    def job_started(self, line: object, job_code: uuid.UUID) -> None:
+        """Records the start of a job"""
+        self.__line_digest(line).started += 1
+        self.__is_dirty = True
+        self._LOGGER.debug("Digest recorded start of job [%s]", job_code)
+
+    def job_succeeded(self, line: object, job_code: uuid.UUID, warned: bool) -> None:
+        """Records a successful job, collapsed into the line's counts"""
+        line_digest = self.__line_digest(line)
+        line_digest.succeeded += 1
+        if warned:
+            line_digest.warned += 1
+        self.__is_dirty = True
+        self._LOGGER.debug("Digest recorded success of job [%s]", job_code)
+
+    def job_failed(
+        self, line: object, job_code: uuid.UUID, text: str, started: bool = True
+    ) -> None:
+        """Records a failed job, its report is listed in full"""
+        line_digest = self.__line_digest(line)
+        if not started:
+            line_digest.started += 1
+        line_digest.failed += 1
+        text = text.strip()
+        if len(text) > self.MAX_FAILURE_LENGTH:
+            text = text[: self.MAX_FAILURE_LENGTH] + " ✂️"
+        self.__period.failures.append(text)
+        self.__is_dirty = True
+        self._LOGGER.debug("Digest recorded failure of job [%s]", job_code)
+
+    def render(self) -> str:
+        """Returns the summary text of the current period"""
+        text, _ = self.__render()
+        return text
+
+    def __render(self) -> tuple[str, int]:
+        """Returns the summary text and the number of failures it could fit"""
+        text = (
+            f"📊 Digest since <b>{self.__period.started_at:%Y/%m/%d %H:%M:%S}</b>, "
+            + f"updated at <b>{datetime.now():%H:%M:%S}</b>\n"
+            + "\n".join(
+                [
+                    f"<b>{name}</b>: ⛏ {x.running} running, ✅ {x.succeeded} done"
+                    + (f" (⚠️ {x.warned} with warnings)" if x.warned else "")
+                    + f", ❌ {x.failed} failed"
+                    for name, x in self.__period.lines.items()
+                ]
+            )
+        )
+        failures = self.__period.failures
+        for i, failure in enumerate(failures):
+            tail = f"\n\n... and {len(failures) - i} more failures."
+            if len(text) + len(failure) + 2 + len(tail) > self.MAX_TEXT_LENGTH:
+                return text + tail, i
+            text += "\n\n" + failure
+        return text, len(failures)
+
+    async def flush(self) -> None:
+        """Publishes the summary if anything has changed since the last one"""
+        if not self.__is_dirty or not self.publisher:
+            return
+        self.__is_dirty = False
+        now = datetime.now()
+        if now.date() != self.__period.started_at.date():
+            self.__start_new_period(started_at=now, failures=[])
+        text, shown_failures = self.__render()
+        self.__period.message_id = await self.publisher(text, self.__period.message_id)
+        if shown_failures < len(self.__period.failures):
+            self.__start_new_period(
+                started_at=now, failures=self.__period.failures[shown_failures:]
+            )
+            self.__is_dirty = True
+
+    def __start_new_period(self, started_at: datetime, failures: list[str]) -> None:
+        """Starts a new summary message, carrying over the running jobs"""
+        self.__period = DigestPeriod(
+            started_at=started_at,
+            lines={
+                name: LineDigest(started=x.running)
+                for name, x in self.__period.lines.items()
+                if x.running
+            },
+            failures=failures,
+        )
+
+    async def run(self) -> None:
+        """Publishes the summary once every interval"""
+        self._LOGGER.info("Digest reporter has started.")
+        self.__is_running = True
+        while self.__is_running:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            # pylint: disable=broad-except
+            # Preventing a failed digest from stopping the next ones
+            except Exception as ex:
+                self._LOGGER.error("Digest could not be published: %s", ex)
+        self._LOGGER.info("Digest reporter has been stopped.")
+
+    def stop(self) -> None:
+        """Stops publishing the summary"""
+        self.__is_running = False
+
+    def __line_digest(self, line: object) -> LineDigest:
+        """Returns the counts of the given line, creating them if needed"""
+        name = str(line)
+        line_digest = self.__period.lines.get(name)
+        if not line_digest:
+            line_digest = self.__period.lines[name] = LineDigest()
+        return line_digest
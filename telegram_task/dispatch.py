@@ -0,0 +1,118 @@
+"""
+Dispatch module holds the dispatcher which handles telegram updates concurrently,
+while keeping the updates sharing an ordering key, by default their chat, in order.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Awaitable, Hashable
+from dataclasses import dataclass
+import logging
+import asyncio
+import time
+
+
+class TimestampedQueue(asyncio.Queue):
+    """Queue which records the monotonic time each item is put on it"""
+
+    def _put(self, item: Any) -> None:
+        super()._put((time.monotonic(), item))
+
+
+@dataclass
+class DispatchStats:
+    """Metrics of the dispatched updates"""
+
+    handled: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    last_lag: float = 0
+    max_lag: float = 0
+    total_lag: float = 0
+
+    @property
+    def mean_lag(self) -> float:
+        """Average seconds between receiving an update and handling it"""
+        return self.total_lag / self.handled if self.handled else 0
+
+    def record_lag(self, lag: float) -> None:
+        """Records the queue lag of an update which is being handled"""
+        self.handled += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+
+
+def chat_of(update: Any) -> Hashable:
+    """Default ordering key, the chat the update has come from"""
+    chat = getattr(update, "effective_chat", None)
+    return chat.id if chat else None
+
+
+class UpdateDispatcher:
+    """
+    UpdateDispatcher runs the handler of each update as a separate task.
+    The number of handlers in flight is bounded, and the handlers of updates
+    sharing an ordering key are run one after another.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        max_in_flight: int = 8,
+        ordering_key: Callable[[Any], Hashable] = chat_of,
+    ):
+        self.handler: Callable[[Any], Awaitable[None]] = handler
+        self.ordering_key: Callable[[Any], Hashable] = ordering_key
+        self.stats: DispatchStats = DispatchStats()
+        self.__slots: asyncio.Semaphore = asyncio.Semaphore(max_in_flight)
+        self.__last_tasks: dict[Hashable, asyncio.Task] = {}
+        self.__tasks: set[asyncio.Task] = set()
+
+    async def dispatch(self, update: Any, received_at: float = None) -> None:
+        """Starts handling the update, waiting if too many are in flight"""
+        await self.__slots.acquire()
+        key = self.ordering_key(update)
+        previous = self.__last_tasks.get(key)
+        task = asyncio.create_task(
+            self.__handle(
+                update=update,
+                received_at=received_at if received_at else time.monotonic(),
+                previous=previous,
+            )
+        )
+        self.__last_tasks[key] = task
+        self.__tasks.add(task)
+        self.stats.in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+        task.add_done_callback(lambda x: self.__on_done(key, x))
+
+    async def drain(self, timeout: float = None) -> bool:
+        """Waits for the handlers in flight, returns False on timeout"""
+        if not self.__tasks:
+            return True
+        _, pending = await asyncio.wait(set(self.__tasks), timeout=timeout)
+        return not pending
+
+    async def __handle(
+        self, update: Any, received_at: float, previous: asyncio.Task = None
+    ) -> None:
+        """Handles the update after the previous one with the same key"""
+        if previous and not previous.done():
+            await asyncio.wait([previous])
+        self.stats.record_lag(time.monotonic() - received_at)
+        await self.handler(update)
+
+    def __on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        """Frees the slot of a finished handler"""
+        self.__tasks.discard(task)
+        if self.__last_tasks.get(key) is task:
+            del self.__last_tasks[key]
+        self.stats.in_flight -= 1
+        self.__slots.release()
+        if not task.cancelled() and task.exception():
+            self._LOGGER.error(
+                "Handler of an update has failed: %s",
+                task.exception(),
+                exc_info=task.exception(),
+            )
@@ -0,0 +1,274 @@
+"""
+Fakebot module holds an in-process stand-in for the telegram Bot API,
+plugged into the bot as its request object, so that the deputy
+can be tested and load tested with no network nor live bot.
+"""
+from __future__ import annotations
+from typing import Any
+from collections import Counter, deque
+from dataclasses import dataclass
+import asyncio
+import itertools
+import json
+import math
+import time
+import telegram.ext
+import telegram.request
+
+
+@dataclass
+class FakeMessage:
+    """A message sent or forwarded by the bot"""
+
+    message_id: int
+    chat_id: int
+    text: str
+    parse_mode: str = None
+    reply_markup: dict = None
+    edits_count: int = 0
+
+
+# pylint: disable=too-many-instance-attributes
+class FakeBotApi(telegram.request.BaseRequest):
+    """
+    FakeBotApi answers the bot's requests in memory.
+    It supports getUpdates long polling over a scripted stream of updates,
+    sendMessage, editMessageText, answerCallbackQuery and forwardMessage.
+    Every request takes the given latency, and flood control errors
+    can be injected to exercise the retries on RetryAfter.
+    """
+
+    BOT_TOKEN: str = "123456:FAKE"
+
+    def __init__(
+        self,
+        latency: float = 0,
+        bot_id: int = 123456,
+        bot_username: str = "fake_bot",
+    ):
+        self.latency: float = latency
+        self.bot_user: dict = {
+            "id": bot_id,
+            "is_bot": True,
+            "first_name": "Fake",
+            "username": bot_username,
+        }
+        self.calls: Counter[str] = Counter()
+        self.messages: dict[int, FakeMessage] = {}
+        self.answered_callback_queries: list[str] = []
+        self.__message_ids: itertools.count = itertools.count(1)
+        self.__update_ids: itertools.count = itertools.count(1)
+        self.__updates: deque[dict] = deque()
+        self.__has_updates: asyncio.Event = asyncio.Event()
+        self.__floods: deque[tuple[float, set[str]]] = deque()
+
+    def build_application(self) -> telegram.ext.Application:
+        """Builds an application whose bot talks to this fake API only"""
+        return (
+            telegram.ext.ApplicationBuilder()
+            .token(self.BOT_TOKEN)
+            .request(self)
+            .get_updates_request(self)
+            .build()
+        )
+
+    @property
+    def sent_messages(self) -> list[FakeMessage]:
+        """The messages sent or forwarded by the bot, in order"""
+        return list(self.messages.values())
+
+    def push_message(self, text: str, chat_id: int, user_id: int = None) -> int:
+        """Scripts a private text message from the user, returns its update id"""
+        return self.push_update(
+            {
+                "message": self.__user_message(
+                    next(self.__message_ids), text, chat_id, user_id
+                )
+            }
+        )
+
+    def push_callback_query(self, data: str, chat_id: int, user_id: int = None) -> int:
+        """Scripts a press on an inline button, returns its update id"""
+        update_id = next(self.__update_ids)
+        return self.push_update(
+            {
+                "callback_query": {
+                    "id": str(update_id),
+                    "from": self.__user(user_id if user_id else chat_id),
+                    "chat_instance": str(chat_id),
+                    "data": data,
+                    "message": self.__user_message(
+                        next(self.__message_ids), "", chat_id, user_id
+                    ),
+                }
+            },
+            update_id=update_id,
+        )
+
+    def push_update(self, update: dict, update_id: int = None) -> int:
+        """Scripts a raw update, returns its update id"""
+        update_id = update_id if update_id else next(self.__update_ids)
+        self.__updates.append({"update_id": update_id, **update})
+        self.__has_updates.set()
+        return update_id
+
+    def inject_flood(
+        self, retry_after: float = 1, count: int = 1, methods: list[str] = None
+    ) -> None:
+        """Makes the next count requests, of the given methods or any, flooded"""
+        for _ in range(count):
+            self.__floods.append((retry_after, set(methods) if methods else set()))
+
+    async def initialize(self) -> None:
+        """Nothing to connect to"""
+
+    async def shutdown(self) -> None:
+        """Nothing to disconnect from"""
+
+    # pylint: disable=too-many-arguments,too-many-return-statements
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: telegram.request.RequestData = None,
+        read_timeout: float = None,
+        write_timeout: float = None,
+        connect_timeout: float = None,
+        pool_timeout: float = None,
+    ) -> tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        parameters = request_data.parameters if request_data else {}
+        self.calls[api_method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        flood = self.__take_flood(api_method)
+        if flood is not None:
+            return self.__error(
+                429, "Too Many Requests: retry later", {"retry_after": flood}
+            )
+        match api_method:
+            case "getMe":
+                return self.__result(self.bot_user)
+            case "getUpdates":
+                return self.__result(await self.__get_updates(parameters))
+            case "deleteWebhook":
+                return self.__result(True)
+            case "sendMessage":
+                return self.__result(self.__send_message(parameters))
+            case "editMessageText":
+                return self.__edit_message_text(parameters)
+            case "answerCallbackQuery":
+                self.answered_callback_queries.append(parameters["callback_query_id"])
+                return self.__result(True)
+            case "forwardMessage":
+                return self.__result(
+                    self.__send_message(
+                        {
+                            "chat_id": parameters["chat_id"],
+                            "text": f"Forwarded message {parameters['message_id']}",
+                        }
+                    )
+                )
+        return self.__error(400, f"Bad Request: {api_method} is not faked")
+
+    async def __get_updates(self, parameters: dict) -> list[dict]:
+        """Long polls the scripted updates from the given offset on"""
+        offset = parameters.get("offset", 0)
+        while self.__updates and self.__updates[0]["update_id"] < offset:
+            self.__updates.popleft()
+        if not self.__updates:
+            self.__has_updates.clear()
+            try:
+                await asyncio.wait_for(
+                    self.__has_updates.wait(), timeout=parameters.get("timeout", 0)
+                )
+            except asyncio.TimeoutError:
+                return []
+        limit = parameters.get("limit", 100)
+        return list(itertools.islice(self.__updates, limit))
+
+    def __send_message(self, parameters: dict) -> dict:
+        """Records a message sent by the bot"""
+        message = FakeMessage(
+            message_id=next(self.__message_ids),
+            chat_id=int(parameters["chat_id"]),
+            text=parameters["text"],
+            parse_mode=parameters.get("parse_mode"),
+            reply_markup=parameters.get("reply_markup"),
+        )
+        self.messages[message.message_id] = message
+        return self.__bot_message(message)
+
+    def __edit_message_text(self, parameters: dict) -> tuple[int, bytes]:
+        """Edits a message sent by the bot, as strict as telegram is"""
+        message = self.messages.get(int(parameters["message_id"]))
+        if not message or message.chat_id != int(parameters["chat_id"]):
+            return self.__error(400, "Bad Request: message to edit not found")
+        if message.text == parameters["text"]:
+            return self.__error(
+                400,
+                "Bad Request: message is not modified: specified new message "
+                + "content and reply markup are exactly the same",
+            )
+        message.text = parameters["text"]
+        message.parse_mode = parameters.get("parse_mode")
+        message.edits_count += 1
+        return self.__result(self.__bot_message(message))
+
+    def __take_flood(self, api_method: str) -> float | None:
+        """Returns the retry after of the next injected flood on the method"""
+        for index, (retry_after, methods) in enumerate(self.__floods):
+            if not methods or api_method in methods:
+                del self.__floods[index]
+                return retry_after
+        return None
+
+    def __bot_message(self, message: FakeMessage) -> dict:
+        """Returns the message as sent by the bot"""
+        return {
+            "message_id": message.message_id,
+            "date": self.__now(),
+            "chat": {"id": message.chat_id, "type": "private"},
+            "from": self.bot_user,
+            "text": message.text,
+        }
+
+    def __user_message(
+        self, message_id: int, text: str, chat_id: int, user_id: int = None
+    ) -> dict:
+        """Returns a private message from the user"""
+        return {
+            "message_id": message_id,
+            "date": self.__now(),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": self.__user(user_id if user_id else chat_id),
+            "text": text,
+        }
+
+    @staticmethod
+    def __user(user_id: int) -> dict:
+        """Returns a human user"""
+        return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"}
+
+    @staticmethod
+    def __now() -> int:
+        """
+        Telegram dates are whole seconds, rounded up here
+        so that a scripted message is never older than the listener
+        """
+        return math.ceil(time.time())
+
+    @staticmethod
+    def __result(result: Any) -> tuple[int, bytes]:
+        """Returns a successful response"""
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+    @staticmethod
+    def __error(
+        code: int, description: str, parameters: dict = None
+    ) -> tuple[int, bytes]:
+        """Returns an error response, with its parameters if any"""
+        body = {"ok": False, "error_code": code, "description": description}
+        if parameters:
+            body["parameters"] = parameters
+        return code, json.dumps(body).encode()
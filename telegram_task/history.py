@@ -0,0 +1,284 @@
+"""
+History module holds the durable store of job runs,
+kept in SQLite and summarized per line for the stats panel.
+"""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import asyncio
+import math
+import sqlite3
+import threading
+import uuid
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class JobRun:
+    """A single run of a job on a line, from the first attempt to the outcome"""
+
+    job_code: uuid.UUID
+    line: str
+    started_at: datetime
+    finished_at: datetime
+    outcome: str
+    attempts: int = 1
+    warnings_count: int = 0
+    report_size: int = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the start of the run to its outcome"""
+        return (self.finished_at - self.started_at).total_seconds()
+
+    @property
+    def failed(self) -> bool:
+        """Checks if the run did not end in success"""
+        return self.outcome != "SUCCESS"
+
+
+@dataclass
+class LineStats:
+    """Duration percentiles and failure rate of a line's recent runs"""
+
+    runs: int
+    failure_rate: float
+    p50: float
+    p95: float
+    p99: float
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0
+    return sorted_values[max(1, math.ceil(fraction * len(sorted_values))) - 1]
+
+
+class JobHistory:
+    """
+    JobHistory appends job runs to SQLite in WAL mode, inserting them in batches
+    on a thread so that the event loop never waits for a commit.
+    A rolling window of the latest runs per line is kept in memory,
+    so the stats never scan the full history. The runs of earlier operations
+    are read into the window once, off the event loop, by the first stats.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    _SCHEMA: list[str] = [
+        """
+        CREATE TABLE IF NOT EXISTS job_runs (
+            id INTEGER PRIMARY KEY,
+            job_code TEXT NOT NULL,
+            line TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            finished_at REAL NOT NULL,
+            outcome TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            warnings_count INTEGER NOT NULL,
+            report_size INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS job_runs_line ON job_runs (line, started_at)",
+        "CREATE INDEX IF NOT EXISTS job_runs_started_at ON job_runs (started_at)",
+    ]
+    _COLUMNS: str = (
+        "job_code, line, started_at, finished_at, outcome, "
+        + "attempts, warnings_count, report_size"
+    )
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        batch_size: int = 100,
+        flush_interval: float = 1,
+        window: int = 1000,
+    ):
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.window: int = window
+        self.__lock: threading.Lock = threading.Lock()
+        self.__connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False
+        )
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        with self.__connection:
+            for statement in self._SCHEMA:
+                self.__connection.execute(statement)
+        # Runs stored up to here belong to earlier operations
+        self.__last_earlier_id: int = self.__connection.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM job_runs"
+        ).fetchone()[0]
+        self.__pending: list[JobRun] = []
+        self.__windows: dict[str, deque[JobRun]] = {}
+        self.__earlier_reads: dict[str, asyncio.Task] = {}
+        self.__flushes: set[asyncio.Task] = set()
+        self.__is_running: bool = False
+
+    def record(self, job_run: JobRun) -> None:
+        """Buffers the run for insertion, flushing on a thread when the batch is full"""
+        self.__window_of(job_run.line).append(job_run)
+        self.__pending.append(job_run)
+        if len(self.__pending) >= self.batch_size:
+            try:
+                task = asyncio.get_running_loop().create_task(
+                    self.__flush_in_thread(self.__take_pending())
+                )
+            except RuntimeError:
+                self.flush()
+                return
+            self.__flushes.add(task)
+            task.add_done_callback(self.__flushes.discard)
+
+    def flush(self) -> int:
+        """Inserts the buffered runs in a single transaction"""
+        return self.__insert(self.__take_pending())
+
+    async def drain(self) -> None:
+        """Waits until the batches handed to the thread are inserted"""
+        while self.__flushes:
+            await asyncio.wait(set(self.__flushes))
+
+    async def __flush_in_thread(self, pending: list[JobRun]) -> None:
+        """Inserts the runs on a thread, logging instead of raising failures"""
+        try:
+            await asyncio.to_thread(self.__insert, pending)
+        # pylint: disable=broad-except
+        # Preventing a failed flush from stopping the next ones
+        except Exception as ex:
+            self._LOGGER.error("Job history could not be flushed: %s", ex)
+
+    def __take_pending(self) -> list[JobRun]:
+        """Returns the buffered runs, emptying the buffer"""
+        pending, self.__pending = self.__pending, []
+        return pending
+
+    def __insert(self, pending: list[JobRun]) -> int:
+        """Inserts the given runs in a single transaction"""
+        if not pending:
+            return 0
+        with self.__lock, self.__connection:
+            self.__connection.executemany(
+                f"INSERT INTO job_runs ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(x.job_code),
+                        x.line,
+                        x.started_at.timestamp(),
+                        x.finished_at.timestamp(),
+                        x.outcome,
+                        x.attempts,
+                        x.warnings_count,
+                        x.report_size,
+                    )
+                    for x in pending
+                ],
+            )
+        self._LOGGER.debug("Job history flushed [%d] runs", len(pending))
+        return len(pending)
+
+    def query(
+        self,
+        line: str = None,
+        since: datetime = None,
+        until: datetime = None,
+        limit: int = 100,
+    ) -> list[JobRun]:
+        """Returns the latest runs, filtered by line and start time"""
+        self.flush()
+        conditions, parameters = [], []
+        if line is not None:
+            conditions.append("line = ?")
+            parameters.append(line)
+        if since:
+            conditions.append("started_at >= ?")
+            parameters.append(since.timestamp())
+        if until:
+            conditions.append("started_at < ?")
+            parameters.append(until.timestamp())
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        parameters.append(limit)
+        return self.__select(
+            f"SELECT {self._COLUMNS} FROM job_runs {where}"
+            + "ORDER BY started_at DESC LIMIT ?",
+            parameters,
+        )
+
+    async def stats(self, line: str) -> LineStats:
+        """Returns the stats of the line's latest runs"""
+        earlier_read = self.__earlier_reads.get(line)
+        if earlier_read is None:
+            earlier_read = self.__earlier_reads[line] = asyncio.ensure_future(
+                self.__read_earlier_runs(line)
+            )
+        await asyncio.shield(earlier_read)
+        runs = self.__window_of(line)
+        durations = sorted(x.duration for x in runs if x.outcome != "REJECTED")
+        return LineStats(
+            runs=len(runs),
+            failure_rate=sum(x.failed for x in runs) / len(runs) if runs else 0,
+            p50=percentile(durations, 0.5),
+            p95=percentile(durations, 0.95),
+            p99=percentile(durations, 0.99),
+        )
+
+    async def run(self) -> None:
+        """Flushes the buffered runs once every interval"""
+        self._LOGGER.info("Job history has started.")
+        self.__is_running = True
+        while self.__is_running:
+            await asyncio.sleep(self.flush_interval)
+            await self.__flush_in_thread(self.__take_pending())
+        self._LOGGER.info("Job history has been stopped.")
+
+    def stop(self) -> None:
+        """Stops flushing periodically"""
+        self.__is_running = False
+
+    def close(self) -> None:
+        """Flushes the buffered runs and closes the database"""
+        self.stop()
+        self.flush()
+        with self.__lock:
+            self.__connection.close()
+
+    def __window_of(self, line: str) -> deque[JobRun]:
+        """Returns the line's latest runs kept in memory"""
+        runs = self.__windows.get(line)
+        if runs is None:
+            runs = self.__windows[line] = deque(maxlen=self.window)
+        return runs
+
+    async def __read_earlier_runs(self, line: str) -> None:
+        """Puts the line's runs of earlier operations before the recorded ones"""
+        earlier = await asyncio.to_thread(
+            self.__select,
+            f"SELECT {self._COLUMNS} FROM job_runs WHERE line = ? AND id <= ? "
+            + "ORDER BY started_at DESC LIMIT ?",
+            [line, self.__last_earlier_id, self.window],
+        )
+        self.__windows[line] = deque(
+            [*reversed(earlier), *self.__window_of(line)], maxlen=self.window
+        )
+
+    def __select(self, statement: str, parameters: list) -> list[JobRun]:
+        """Runs the query and converts its rows to job runs"""
+        with self.__lock:
+            rows = self.__connection.execute(statement, parameters).fetchall()
+        return [
+            JobRun(
+                job_code=uuid.UUID(x[0]),
+                line=x[1],
+                started_at=datetime.fromtimestamp(x[2]),
+                finished_at=datetime.fromtimestamp(x[3]),
+                outcome=x[4],
+                attempts=x[5],
+                warnings_count=x[6],
+                report_size=x[7],
+            )
+            for x in rows
+        ]
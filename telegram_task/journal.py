@@ -0,0 +1,229 @@
+"""
+Journal module holds the durable queue of jobs,
+written before they are performed and acknowledged once they are done,
+so that the unfinished ones are replayed after a restart.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, date, time
+import logging
+import asyncio
+import pickle
+import sqlite3
+import threading
+import uuid
+
+
+@dataclass
+class JournalEntry:
+    """An unfinished job found in the journal"""
+
+    job_code: uuid.UUID
+    line: str
+    slot: str
+    job_order: object
+    enqueued_at: datetime
+
+
+class JobJournal:
+    """
+    JobJournal keeps the jobs in SQLite, synced to disk on every commit.
+    Writes made while a commit is in progress are grouped into the next one,
+    so jobs share the cost of syncing instead of paying it one by one.
+    Cron runs are journaled with their day as the slot, manual ones without.
+    Entries finished before the current day are deleted on opening
+    and whenever the journal is pruned, so that it does not grow forever.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    _SCHEMA: list[str] = [
+        """
+        CREATE TABLE IF NOT EXISTS journal_entries (
+            job_code TEXT NOT NULL,
+            slot TEXT NOT NULL,
+            line TEXT NOT NULL,
+            job_order BLOB NOT NULL,
+            enqueued_at REAL NOT NULL,
+            finished_at REAL,
+            PRIMARY KEY (job_code, slot)
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS journal_entries_unfinished
+        ON journal_entries (enqueued_at) WHERE finished_at IS NULL
+        """,
+    ]
+    _PRUNE_STATEMENT: str = (
+        "DELETE FROM journal_entries "
+        + "WHERE finished_at IS NOT NULL AND finished_at < ?"
+    )
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.commit_count: int = 0
+        self.__lock: threading.Lock = threading.Lock()
+        self.__connection: sqlite3.Connection = sqlite3.connect(
+            path, check_same_thread=False
+        )
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=FULL")
+        with self.__connection:
+            for statement in self._SCHEMA:
+                self.__connection.execute(statement)
+            self.__connection.execute(self._PRUNE_STATEMENT, (self.__start_of_today(),))
+        self.__pending: list[tuple[str, tuple, asyncio.Future]] = []
+        self.__committer: asyncio.Task = None
+
+    async def enqueue(
+        self,
+        line: str,
+        job_order: object,
+        slot: str = "",
+        job_code: uuid.UUID = None,
+    ) -> None:
+        """
+        Writes the job to the journal, under the given code instead of
+        the job's own if there is one, returns once it is on disk
+        """
+        await self.__write(
+            "INSERT OR REPLACE INTO journal_entries "
+            + "(job_code, slot, line, job_order, enqueued_at, finished_at) "
+            + "VALUES (?, ?, ?, ?, ?, NULL)",
+            (
+                str(job_code if job_code else job_order.job_code),
+                slot,
+                line,
+                pickle.dumps(job_order),
+                datetime.now().timestamp(),
+            ),
+            wait=True,
+        )
+
+    def acknowledge(self, job_code: uuid.UUID, slot: str = "") -> None:
+        """Marks the job as finished, without waiting for the disk"""
+        self.__write(
+            "UPDATE journal_entries SET finished_at = ? "
+            + "WHERE job_code = ? AND slot = ?",
+            (datetime.now().timestamp(), str(job_code), slot),
+            wait=False,
+        )
+
+    def prune(self, before: datetime = None) -> None:
+        """
+        Deletes the entries finished before the given time,
+        the start of the current day by default, along with the next commit
+        """
+        self.__write(
+            self._PRUNE_STATEMENT,
+            (before.timestamp() if before else self.__start_of_today(),),
+            wait=False,
+        )
+
+    def unfinished(self) -> list[JournalEntry]:
+        """Returns the jobs which were enqueued but never acknowledged"""
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT job_code, slot, line, job_order, enqueued_at "
+                + "FROM journal_entries WHERE finished_at IS NULL "
+                + "ORDER BY enqueued_at"
+            ).fetchall()
+        entries = []
+        for job_code, slot, line, job_order, enqueued_at in rows:
+            try:
+                job_order = pickle.loads(job_order)
+            # pylint: disable=broad-except
+            # Preventing a single corrupt entry from blocking the replay
+            except Exception as ex:
+                self._LOGGER.error("Job [%s] can not be restored: %s", job_code, ex)
+                continue
+            entries.append(
+                JournalEntry(
+                    job_code=uuid.UUID(job_code),
+                    line=line,
+                    slot=slot,
+                    job_order=job_order,
+                    enqueued_at=datetime.fromtimestamp(enqueued_at),
+                )
+            )
+        return entries
+
+    def slot_status(self, job_code: uuid.UUID, slot: str) -> bool | None:
+        """
+        Returns True if the job has finished in the slot, False if it has
+        started without finishing and None if it has not been enqueued
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT finished_at FROM journal_entries "
+                + "WHERE job_code = ? AND slot = ?",
+                (str(job_code), slot),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0] is not None
+
+    async def drain(self) -> None:
+        """Waits until the pending writes are committed"""
+        while self.__committer and not self.__committer.done():
+            await asyncio.shield(self.__committer)
+
+    def flush(self) -> None:
+        """Commits the pending writes right away"""
+        batch, self.__pending = self.__pending, []
+        self.__commit_batch(batch)
+
+    def close(self) -> None:
+        """Commits the pending writes and closes the database"""
+        self.flush()
+        with self.__lock:
+            self.__connection.close()
+
+    def __write(self, statement: str, parameters: tuple, wait: bool):
+        """Queues the write for the next group commit"""
+        future = asyncio.get_running_loop().create_future() if wait else None
+        self.__pending.append((statement, parameters, future))
+        if not self.__committer or self.__committer.done():
+            self.__committer = asyncio.create_task(self.__commit_pending())
+        return future
+
+    async def __commit_pending(self) -> None:
+        """Commits the pending writes in groups until there are none left"""
+        while self.__pending:
+            batch, self.__pending = self.__pending, []
+            await asyncio.to_thread(self.__commit_batch, batch)
+
+    def __commit_batch(self, batch: list[tuple[str, tuple, asyncio.Future]]) -> None:
+        """Commits a group of writes in a single transaction"""
+        if not batch:
+            return
+        try:
+            with self.__lock, self.__connection:
+                for statement, parameters, _ in batch:
+                    self.__connection.execute(statement, parameters)
+            self.commit_count += 1
+            exception = None
+        # pylint: disable=broad-except
+        # The failure is handed over to the waiting jobs
+        except Exception as ex:
+            self._LOGGER.error("Journal could not commit: %s", ex)
+            exception = ex
+        for _, _, future in batch:
+            if future and not future.get_loop().is_closed():
+                future.get_loop().call_soon_threadsafe(
+                    self.__resolve, future, exception
+                )
+
+    @staticmethod
+    def __start_of_today() -> float:
+        """Timestamp of the current day's midnight"""
+        return datetime.combine(date.today(), time.min).timestamp()
+
+    @staticmethod
+    def __resolve(future: asyncio.Future, exception: Exception = None) -> None:
+        """Lets the waiting job know its write is committed"""
+        if future.done():
+            return
+        if exception:
+            future.set_exception(exception)
+        else:
+            future.set_result(None)
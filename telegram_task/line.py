@@ -1,11 +1,24 @@
 """This module contains the outline for workers and jobs/tasks"""
 from __future__ import annotations
 from typing import Callable
+from enum import Enum
 import logging
+import os
 import uuid
-from datetime import datetime, time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, date, time, timedelta
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+import telegram_task.admission
+import telegram_task.clock
+import telegram_task.digest
+import telegram_task.history
+import telegram_task.metrics
+import telegram_task.pool
+import telegram_task.recurrence
+import telegram_task.retry
+import telegram_task.scheduler
 
 
 @dataclass
@@ -22,10 +35,25 @@ class JobOrder:
 
     job_description: JobDescription = None
     job_code: uuid.UUID = None
+    weight: int = 1
+    timeout: float = None
+    deadline: datetime = None
+    retry_policy: telegram_task.retry.RetryPolicy = None
 
+    # pylint: disable=too-many-arguments
     def __init__(
-        self, job_description: JobDescription = None, job_code: uuid.UUID = None
+        self,
+        job_description: JobDescription = None,
+        job_code: uuid.UUID = None,
+        weight: int = 1,
+        timeout: float = None,
+        deadline: datetime = None,
+        retry_policy: telegram_task.retry.RetryPolicy = None,
     ):
+        self.weight = weight
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retry_policy = retry_policy
         if job_description:
             self.job_description = job_description
         else:
@@ -45,20 +73,74 @@ class CronJobOrder(JobOrder):
 
     daily_run_time: time = None
     off_days: list[int] = None
+    daily_deadline: time = None
+    catch_up: telegram_task.scheduler.CatchUpPolicy = None
 
+    # pylint: disable=too-many-arguments
     def __init__(
         self,
         daily_run_time: time,
         job_description: JobDescription = None,
-        job_code: uuid.UUID = uuid.uuid4(),
+        job_code: uuid.UUID = None,
         off_days: list[int] = None,
+        weight: int = 1,
+        timeout: float = None,
+        daily_deadline: time = None,
+        retry_policy: telegram_task.retry.RetryPolicy = None,
+        catch_up: telegram_task.scheduler.CatchUpPolicy = None,
     ):
         self.daily_run_time = daily_run_time
+        self.catch_up = catch_up
         if off_days:
             self.off_days = off_days
         else:
             self.off_days = []
-        super().__init__(job_description=job_description, job_code=job_code)
+        self.daily_deadline = daily_deadline
+        super().__init__(
+            job_description=job_description,
+            job_code=job_code,
+            weight=weight,
+            timeout=timeout,
+            retry_policy=retry_policy,
+        )
+
+    def deadline_on(self, day: date) -> datetime | None:
+        """Returns the deadline of the run on the given day, if any"""
+        if self.daily_deadline is None:
+            return None
+        return datetime.combine(day, self.daily_deadline)
+
+
+@dataclass
+class RecurringJobOrder(JobOrder):
+    """
+    RecurringJobOrder is like a JobOrder,
+    but it runs on every fire time of its recurrence rule
+    """
+
+    recurrence: telegram_task.recurrence.Recurrence = None
+    catch_up: telegram_task.scheduler.CatchUpPolicy = None
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        recurrence: telegram_task.recurrence.Recurrence,
+        job_description: JobDescription = None,
+        job_code: uuid.UUID = None,
+        weight: int = 1,
+        timeout: float = None,
+        retry_policy: telegram_task.retry.RetryPolicy = None,
+        catch_up: telegram_task.scheduler.CatchUpPolicy = None,
+    ):
+        self.recurrence = recurrence
+        self.catch_up = catch_up
+        super().__init__(
+            job_description=job_description,
+            job_code=job_code,
+            weight=weight,
+            timeout=timeout,
+            retry_policy=retry_policy,
+        )
 
 
 @dataclass
@@ -80,7 +162,12 @@ class JobReport:
 
 
 class Worker(ABC):
-    """Abstract class to be implemented for each kind of tasks the user may have"""
+    """
+    Abstract class to be implemented for each kind of tasks the user may have.
+    The lifecycle hooks run on the event loop, so that long-lived resources
+    such as connection pools are opened once instead of on every job;
+    workers run on a process pool get a copy of the instance on each job.
+    """
 
     _LOGGER = logging.getLogger(__name__)
 
@@ -93,6 +180,32 @@ class Worker(ABC):
     def default_job_description(cls) -> JobDescription:
         """Checks if the provided job description is of a suitable type"""
 
+    async def setup(self) -> None:
+        """Opens the worker's long-lived resources, before its first job"""
+
+    async def teardown(self) -> None:
+        """Releases the worker's long-lived resources, after its last job"""
+
+    async def health_check(self) -> bool:
+        """Checks the worker's resources are still usable, called periodically"""
+        return True
+
+
+class BlockingWorker(Worker):
+    """
+    Abstract class for workers whose tasks are blocking/synchronous code,
+    the line manager runs these tasks on its own bounded thread pool.
+    """
+
+    @abstractmethod
+    def perform_blocking_task(self, job_description: JobDescription) -> JobReport:
+        """Performs a specific task using the provided job description, blocking"""
+
+    async def perform_task(self, job_description: JobDescription) -> JobReport:
+        return await asyncio.to_thread(
+            self.perform_blocking_task, job_description=job_description
+        )
+
 
 class TaskException(Exception):
     """Exception raised by a particular shift."""
@@ -104,73 +217,663 @@ class TaskException(Exception):
         # Now for your custom code...
         self.html_message: str = html_message if html_message else message
 
+    def __reduce__(self):
+        # Keeping the html message when passed back from a worker process
+        return (self.__class__, (str(self), self.html_message))
+
+
+class JobOutcome(Enum):
+    """How running a job/task ended"""
+
+    SUCCESS = "success"
+    TASK_EXCEPTION = "task_exception"
+    UNFAMILIAR_EXCEPTION = "unfamiliar_exception"
+    TIMEOUT = "timeout"
+    CANCELLED = "cancelled"
+    REJECTED = "rejected"
+
+
+class ExecutionMode(Enum):
+    """Where the tasks of a line are executed"""
+
+    EVENT_LOOP = "event_loop"
+    THREAD_POOL = "thread_pool"
+    PROCESS_POOL = "process_pool"
+
+
+def _perform_task_in_pool(worker: Worker, job_description: JobDescription):
+    """Runs the worker's task inside a pool's thread or process"""
+    if isinstance(worker, BlockingWorker):
+        return worker.perform_blocking_task(job_description=job_description)
+    return asyncio.run(worker.perform_task(job_description=job_description))
+
 
+def _warm_up_process() -> None:
+    """Does nothing, only forces the pool to spawn its worker process"""
+
+
+# pylint: disable=too-many-instance-attributes
 class LineManager:
-    """Has a single worker of a specific type and manages its tasks"""
+    """
+    Has a worker of a specific type and manages its tasks.
+    Given a worker factory instead, each job runs on a free instance of a pool,
+    grown up to max_workers while jobs wait and shrunk back to min_workers
+    once the surplus instances have been idle for worker_idle_time seconds.
+    """
 
     _LOGGER = logging.getLogger(__name__)
 
-    def __init__(self, worker: Worker, cron_job_orders: list[CronJobOrder] = None):
-        self.worker: Worker = worker
-        self.display_name: str = worker.__class__.__name__
+    # pylint: disable=too-many-arguments,too-many-locals
+    def __init__(
+        self,
+        worker: Worker = None,
+        cron_job_orders: list[CronJobOrder] = None,
+        max_concurrency: int = None,
+        max_queue_size: int = None,
+        execution_mode: ExecutionMode = None,
+        process_pool_size: int = None,
+        thread_pool_size: int = None,
+        warm_up: bool = False,
+        digest_reporter: telegram_task.digest.DigestReporter = None,
+        default_timeout: float = None,
+        retry_policy: telegram_task.retry.RetryPolicy = None,
+        job_history: telegram_task.history.JobHistory = None,
+        recurring_job_orders: list[RecurringJobOrder] = None,
+        worker_factory: Callable[[], Worker] = None,
+        min_workers: int = 1,
+        max_workers: int = None,
+        worker_idle_time: float = 60,
+        clock: telegram_task.clock.Clock = None,
+        metrics: telegram_task.metrics.MetricsRegistry = None,
+    ):
+        if not worker and not worker_factory:
+            raise ValueError("Either a worker or a worker factory should be given.")
+        self.worker: Worker = worker if worker else worker_factory()
+        self.display_name: str = self.worker.__class__.__name__
+        self.worker_pool: telegram_task.pool.WorkerPool = (
+            telegram_task.pool.WorkerPool(
+                factory=worker_factory,
+                min_size=min_workers,
+                max_size=max_workers if max_workers else max(min_workers, 1),
+                idle_time=worker_idle_time,
+                name=self.display_name,
+                workers=[self.worker],
+                setup=lambda x: x.setup(),
+                teardown=lambda x: x.teardown(),
+            )
+            if worker_factory
+            else None
+        )
+        self.is_healthy: bool = True
+        self.clock: telegram_task.clock.Clock = (
+            clock if clock else telegram_task.clock.SYSTEM_CLOCK
+        )
+        self.metrics: telegram_task.metrics.MetricsRegistry = (
+            metrics if metrics else telegram_task.metrics.REGISTRY
+        )
+        self.__metric_values: dict[tuple, object] = {}
+        self.is_admitting: bool = True
+        self.jobs_in_flight: int = 0
+        self.__drained: asyncio.Event = asyncio.Event()
+        self.__drained.set()
         self.cron_job_orders: list[CronJobOrder] = (
             cron_job_orders if cron_job_orders else []
         )
+        self.recurring_job_orders: list[RecurringJobOrder] = (
+            recurring_job_orders if recurring_job_orders else []
+        )
+        self.limiter: telegram_task.admission.ConcurrencyLimiter = (
+            telegram_task.admission.ConcurrencyLimiter(
+                capacity=max_concurrency,
+                max_queue_size=max_queue_size,
+                name=self.display_name,
+            )
+            if max_concurrency
+            else None
+        )
+        self.shared_limiters: list[telegram_task.admission.ConcurrencyLimiter] = []
+        self.running_jobs_count: int = 0
+        self.peak_running_jobs_count: int = 0
+        if execution_mode is None:
+            execution_mode = (
+                ExecutionMode.THREAD_POOL
+                if isinstance(self.worker, BlockingWorker)
+                else ExecutionMode.EVENT_LOOP
+            )
+        self.execution_mode: ExecutionMode = execution_mode
+        self.process_pool_size: int = (
+            process_pool_size if process_pool_size else os.cpu_count()
+        )
+        self.thread_pool_size: int = (
+            thread_pool_size if thread_pool_size else min(32, os.cpu_count() + 4)
+        )
+        self.warm_up: bool = warm_up
+        self.__process_pool: ProcessPoolExecutor = None
+        self.__thread_pool: ThreadPoolExecutor = None
+        self.digest_reporter: telegram_task.digest.DigestReporter = digest_reporter
+        self.default_timeout: float = default_timeout
+        self.running_jobs: dict[uuid.UUID, asyncio.Task] = {}
+        self.__cancel_requests: set[uuid.UUID] = set()
+        self.retry_policy: telegram_task.retry.RetryPolicy = retry_policy
+        self.scheduler: telegram_task.scheduler.Scheduler = None
+        self.job_history: telegram_task.history.JobHistory = job_history
 
     def __str__(self) -> str:
         return self.display_name
 
+    @property
+    def limiters(self) -> list[telegram_task.admission.ConcurrencyLimiter]:
+        """Limiters a job should pass through, the line's own limiter first"""
+        return ([self.limiter] if self.limiter else []) + self.shared_limiters
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of this line's jobs waiting to be admitted or for a worker"""
+        return (self.limiter.queue_depth if self.limiter else 0) + (
+            self.worker_pool.queue_depth if self.worker_pool else 0
+        )
+
+    async def start(self) -> None:
+        """
+        Prepares the line before operation, setting up its workers
+        and warming up its pools if asked to
+        """
+        if self.worker_pool:
+            await self.worker_pool.start()
+        else:
+            await self.worker.setup()
+        self.__metric("telegram_task_line_queue_depth").labels(
+            self.display_name
+        ).set_function(lambda: self.queue_depth)
+        self.__metric("telegram_task_line_running_jobs").labels(
+            self.display_name
+        ).set_function(lambda: self.running_jobs_count)
+        if self.warm_up and self.execution_mode == ExecutionMode.PROCESS_POOL:
+            pool = self.__get_process_pool()
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(pool, _warm_up_process)
+                    for _ in range(self.process_pool_size)
+                ]
+            )
+            self._LOGGER.info("Process pool of [%s] is warmed up.", self)
+
+    async def stop(self) -> None:
+        """Tears down the line's workers, then releases its pools"""
+        try:
+            if self.worker_pool:
+                await self.worker_pool.close()
+            else:
+                await self.worker.teardown()
+        # pylint: disable=broad-except
+        # Preventing a failed teardown from keeping the pools
+        except Exception as ex:
+            self._LOGGER.error("Workers of [%s] failed to tear down: %s", self, ex)
+        finally:
+            self.__metric("telegram_task_line_queue_depth").remove(self.display_name)
+            self.__metric("telegram_task_line_running_jobs").remove(self.display_name)
+            self.shutdown()
+
+    async def check_health(self) -> bool:
+        """
+        Checks the health of the line's idle workers.
+        Unhealthy pooled instances are replaced,
+        while a single worker is torn down and set up again once no job runs.
+        """
+        if self.worker_pool:
+            unhealthy_count = await self.worker_pool.check_health(
+                lambda x: x.health_check()
+            )
+            self.is_healthy = unhealthy_count == 0
+            return self.is_healthy
+        try:
+            self.is_healthy = await self.worker.health_check() is True
+        # pylint: disable=broad-except
+        # Any failure of the check means the worker is unhealthy
+        except Exception as ex:
+            self._LOGGER.warning("Health check of [%s] failed: %s", self, ex)
+            self.is_healthy = False
+        # A worker shared by running jobs is left for the next check to recover
+        if not self.is_healthy and not self.running_jobs_count:
+            self._LOGGER.warning(
+                "Worker of [%s] is unhealthy, setting it up again", self
+            )
+            try:
+                await self.worker.teardown()
+                await self.worker.setup()
+            # pylint: disable=broad-except
+            # Keeping the line for the next check to recover
+            except Exception as ex:
+                self._LOGGER.error("Worker of [%s] failed to recover: %s", self, ex)
+        return self.is_healthy
+
+    def shutdown(self) -> None:
+        """Releases the pools held by the line"""
+        if self.__process_pool:
+            self.__process_pool.shutdown(wait=False, cancel_futures=True)
+            self.__process_pool = None
+        if self.__thread_pool:
+            self.__thread_pool.shutdown(wait=False, cancel_futures=True)
+            self.__thread_pool = None
+
+    def __get_process_pool(self) -> ProcessPoolExecutor:
+        """Returns the line's process pool, creating it on first use"""
+        if not self.__process_pool:
+            self.__process_pool = ProcessPoolExecutor(
+                max_workers=self.process_pool_size
+            )
+        return self.__process_pool
+
+    def __get_thread_pool(self) -> ThreadPoolExecutor:
+        """Returns the line's thread pool, creating it on first use"""
+        if not self.__thread_pool:
+            self.__thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_pool_size,
+                thread_name_prefix=self.display_name,
+            )
+        return self.__thread_pool
+
+    async def __execute(self, job_description: JobDescription) -> JobReport:
+        """
+        Runs the worker's task according to the line's execution mode,
+        on a free instance of the worker pool if the line has one
+        """
+        if not self.worker_pool:
+            return await self.__execute_on(self.worker, job_description)
+        worker = await self.worker_pool.acquire()
+        if self.execution_mode == ExecutionMode.EVENT_LOOP:
+            # Awaited in the job's own task, so a stall is traced back to the job
+            try:
+                return await self.__execute_on(worker, job_description)
+            finally:
+                self.worker_pool.release(worker)
+        future = asyncio.ensure_future(self.__execute_on(worker, job_description))
+        try:
+            # Tasks abandoned on a pool keep running, and holding their instance
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self.worker_pool.release(worker)
+            else:
+                future.add_done_callback(lambda x: self.__release_abandoned(worker, x))
+
+    def __release_abandoned(self, worker: Worker, future: asyncio.Future) -> None:
+        """Returns the instance of an abandoned task to the pool once it ends"""
+        if not future.cancelled() and future.exception():
+            self._LOGGER.warning(
+                "Abandoned task on [%s] ended with: %s", self, future.exception()
+            )
+        self.worker_pool.release(worker)
+
+    async def __execute_on(
+        self, worker: Worker, job_description: JobDescription
+    ) -> JobReport:
+        """Runs the task on the given worker instance"""
+        match self.execution_mode:
+            case ExecutionMode.PROCESS_POOL:
+                pool = self.__get_process_pool()
+            case ExecutionMode.THREAD_POOL:
+                pool = self.__get_thread_pool()
+            case _:
+                return await worker.perform_task(job_description=job_description)
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, _perform_task_in_pool, worker, job_description
+        )
+
+    def stop_admission(self) -> None:
+        """Rejects the queued jobs and any new one, running jobs go on"""
+        self.is_admitting = False
+        if self.limiter:
+            self.limiter.close()
+
+    async def drain(self) -> None:
+        """Waits for the jobs in flight, including those waiting for a retry"""
+        await self.__drained.wait()
+
     async def perform_task(
         self, job_order: JobOrder, reporter: Callable[[str], None] = None
     ) -> bool:
         """Handles the execution of a specific task using the provided job order"""
-        self.__handle_job_start(job_order.job_code, reporter)
+        jobs_in_flight = self.__metric_value(
+            "telegram_task_jobs_in_flight", self.display_name
+        )
+        jobs_in_flight.inc()
+        self.jobs_in_flight += 1
+        self.__drained.clear()
+        try:
+            return await self.__perform_with_retries(job_order, reporter)
+        finally:
+            jobs_in_flight.dec()
+            self.jobs_in_flight -= 1
+            if not self.jobs_in_flight:
+                self.__drained.set()
+
+    async def __perform_with_retries(
+        self, job_order: JobOrder, reporter: Callable[[str], None] = None
+    ) -> bool:
+        """Performs the attempts on the job allowed by its retry policy"""
+        retry_policy = (
+            job_order.retry_policy if job_order.retry_policy else self.retry_policy
+        )
+        started_at = self.clock.now()
+        loop_started_at = asyncio.get_running_loop().time()
+        attempt = 1
+        while True:
+            outcome, exception, report = await self.__perform_attempt(
+                job_order, reporter, self.__attempt_note(attempt, retry_policy)
+            )
+            if not self.__should_retry(
+                job_order, retry_policy, attempt, outcome, exception
+            ):
+                self.__record_run(job_order, started_at, attempt, outcome, report)
+                self.__metric_value(
+                    "telegram_task_jobs_total", self.display_name, outcome.value
+                ).inc()
+                self.__metric_value(
+                    "telegram_task_job_duration_seconds", self.display_name
+                ).observe(asyncio.get_running_loop().time() - loop_started_at)
+                return outcome == JobOutcome.SUCCESS
+            self.__metric_value(
+                "telegram_task_job_retries_total", self.display_name
+            ).inc()
+            attempt += 1
+            delay = retry_policy.delay(attempt - 1)
+            self.__handle_retry(
+                job_order.job_code,
+                self.__attempt_note(attempt, retry_policy),
+                delay,
+                reporter,
+            )
+            await self.__wait_for_retry(delay)
+
+    def __metric_value(self, name: str, *labels: str) -> object:
+        """Returns the value of a line metric for the labels, cached per registry"""
+        key = (self.metrics, name, labels)
+        value = self.__metric_values.get(key)
+        if value is None:
+            value = self.__metric_values[key] = self.__metric(name).labels(*labels)
+        return value
+
+    def __metric(self, name: str) -> telegram_task.metrics.Metric:
+        """Returns one of the line metrics, registering it at first"""
+        match name:
+            case "telegram_task_jobs_in_flight":
+                return self.metrics.gauge(
+                    name,
+                    "Jobs being performed, including those awaiting a retry",
+                    ("line",),
+                )
+            case "telegram_task_jobs_total":
+                return self.metrics.counter(
+                    name, "Jobs performed, by their final outcome", ("line", "outcome")
+                )
+            case "telegram_task_job_retries_total":
+                return self.metrics.counter(name, "Attempts retried", ("line",))
+            case "telegram_task_job_duration_seconds":
+                return self.metrics.histogram(
+                    name,
+                    "Seconds from the job's order to its outcome, retries included",
+                    ("line",),
+                )
+            case "telegram_task_line_queue_depth":
+                return self.metrics.gauge(
+                    name, "Jobs waiting to be admitted or for a worker", ("line",)
+                )
+            case "telegram_task_line_running_jobs":
+                return self.metrics.gauge(name, "Jobs running on a worker", ("line",))
+        raise ValueError(f"Line has no metric named [{name}].")
+
+    def __record_run(
+        self,
+        job_order: JobOrder,
+        started_at: datetime,
+        attempts: int,
+        outcome: JobOutcome,
+        report: JobReport = None,
+    ) -> None:
+        """Records the run of the job in the history, if there is one"""
+        if not self.job_history:
+            return
+        self.job_history.record(
+            telegram_task.history.JobRun(
+                job_code=job_order.job_code,
+                line=self.display_name,
+                started_at=started_at,
+                finished_at=self.clock.now(),
+                outcome=outcome.name,
+                attempts=attempts,
+                warnings_count=len(report.warnings) if report else 0,
+                report_size=sum(len(x) for x in report.information + report.warnings)
+                if report
+                else 0,
+            )
+        )
+
+    async def __perform_attempt(
+        self,
+        job_order: JobOrder,
+        reporter: Callable[[str], None] = None,
+        attempt_note: str = "",
+    ) -> tuple[JobOutcome, Exception, JobReport]:
+        """Makes a single attempt on the job, from admission to the report"""
         try:
-            report = await self.worker.perform_task(
+            acquired = await self.__admit(job_order)
+        except telegram_task.admission.AdmissionRejected as exception:
+            self.__handle_rejection(job_order.job_code, exception, reporter)
+            return JobOutcome.REJECTED, exception, None
+        self.running_jobs_count += 1
+        self.peak_running_jobs_count = max(
+            self.peak_running_jobs_count, self.running_jobs_count
+        )
+        try:
+            return await self.__perform_admitted_task(job_order, reporter, attempt_note)
+        finally:
+            self.running_jobs_count -= 1
+            for limiter in reversed(acquired):
+                limiter.release(job_order.weight)
+
+    def __should_retry(
+        self,
+        job_order: JobOrder,
+        retry_policy: telegram_task.retry.RetryPolicy,
+        attempt: int,
+        outcome: JobOutcome,
+        exception: Exception,
+    ) -> bool:
+        """
+        Checks if a failed attempt should be followed by another one,
+        never once the line has stopped admitting jobs
+        """
+        if (
+            not retry_policy
+            or not self.is_admitting
+            or attempt >= retry_policy.max_attempts
+            or outcome
+            in [JobOutcome.SUCCESS, JobOutcome.CANCELLED, JobOutcome.REJECTED]
+            or not retry_policy.is_retryable(
+                exception=exception, timed_out=outcome == JobOutcome.TIMEOUT
+            )
+        ):
+            return False
+        if retry_policy.budget and not retry_policy.budget.try_spend():
+            self._LOGGER.warning(
+                "Job [%s] is not retried as the retry budget is exhausted",
+                job_order.job_code,
+            )
+            return False
+        return True
+
+    def __attempt_note(
+        self, attempt: int, retry_policy: telegram_task.retry.RetryPolicy
+    ) -> str:
+        """Returns the attempt count shown in reports when retries are allowed"""
+        if not retry_policy or retry_policy.max_attempts < 2:
+            return ""
+        return f" (attempt {attempt}/{retry_policy.max_attempts})"
+
+    async def __wait_for_retry(self, delay: float) -> None:
+        """Waits for the retry, on the scheduler if it is running"""
+        if self.scheduler and self.scheduler.is_running:
+            await self.scheduler.sleep_until(
+                self.clock.now() + timedelta(seconds=delay)
+            )
+        else:
+            await asyncio.sleep(delay)
+
+    async def __admit(
+        self, job_order: JobOrder
+    ) -> list[telegram_task.admission.ConcurrencyLimiter]:
+        """Acquires all the limiters in order, waiting in their queues if needed"""
+        if not self.is_admitting:
+            raise telegram_task.admission.AdmissionRejected(f"{self} is shutting down.")
+        acquired = []
+        try:
+            for limiter in self.limiters:
+                if limiter.is_full():
+                    self._LOGGER.info(
+                        "Job [%s] is queued on [%s] with queue depth [%d]",
+                        job_order.job_code,
+                        limiter,
+                        limiter.queue_depth + 1,
+                    )
+                await limiter.acquire(job_order.weight)
+                acquired.append(limiter)
+        except BaseException:
+            for limiter in reversed(acquired):
+                limiter.release(job_order.weight)
+            raise
+        return acquired
+
+    def cancel_job(self, job_code: uuid.UUID) -> bool:
+        """Cancels a running job, returns False if no such job is running"""
+        task = self.running_jobs.get(job_code)
+        if not task or task.done():
+            return False
+        self._LOGGER.info("Cancelling the job [%s]", job_code)
+        self.__cancel_requests.add(job_code)
+        task.cancel()
+        return True
+
+    def __timeout_of(self, job_order: JobOrder) -> float | None:
+        """Returns the seconds the job is allowed to run, if limited"""
+        timeout = job_order.timeout if job_order.timeout else self.default_timeout
+        deadline = (
+            job_order.deadline_on(self.clock.today())
+            if isinstance(job_order, CronJobOrder)
+            else job_order.deadline
+        )
+        if deadline:
+            remaining = (deadline - self.clock.now()).total_seconds()
+            timeout = min(timeout, remaining) if timeout else remaining
+        return timeout
+
+    async def __perform_admitted_task(
+        self,
+        job_order: JobOrder,
+        reporter: Callable[[str], None] = None,
+        attempt_note: str = "",
+    ) -> tuple[JobOutcome, Exception, JobReport]:
+        """
+        Performs a task which has passed through the limiters.
+        Tasks run on the event loop are cancelled on timeout,
+        while those run on a pool are only abandoned.
+        """
+        job_code = job_order.job_code
+        timeout = self.__timeout_of(job_order)
+        self.__handle_job_start(job_code, reporter, attempt_note)
+        task = asyncio.ensure_future(
+            self.__execute(
                 job_description=job_order.job_description
                 if job_order.job_description
                 else self.worker.default_job_description()
             )
-            self.__handle_job_report(job_order.job_code, report, reporter)
-            return True
+        )
+        self.running_jobs[job_code] = task
+        try:
+            report = await asyncio.wait_for(task, timeout=timeout)
+            self.__handle_job_report(job_code, report, reporter, attempt_note)
+            return JobOutcome.SUCCESS, None, report
+        except asyncio.TimeoutError:
+            self.__handle_timeout(job_code, timeout, reporter, attempt_note)
+            return JobOutcome.TIMEOUT, None, None
+        except asyncio.CancelledError:
+            if job_code not in self.__cancel_requests:
+                raise
+            self.__handle_cancellation(job_code, reporter)
+            return JobOutcome.CANCELLED, None, None
         except TaskException as exception:
-            self.__handle_task_exception(job_order.job_code, exception, reporter)
+            self.__handle_task_exception(job_code, exception, reporter, attempt_note)
+            return JobOutcome.TASK_EXCEPTION, exception, None
         # pylint: disable=broad-except
         # Preventing an exception on a line from bringing down the whole operation
         except Exception as exception:
-            self.__handle_unfamiliar_exception(job_order.job_code, exception, reporter)
-        return False
+            self.__handle_unfamiliar_exception(
+                job_code, exception, reporter, attempt_note
+            )
+            return JobOutcome.UNFAMILIAR_EXCEPTION, exception, None
+        finally:
+            self.running_jobs.pop(job_code, None)
+            self.__cancel_requests.discard(job_code)
 
     def __handle_job_start(
-        self, job_code: uuid.UUID, reporter: Callable[[str], None] = None
+        self,
+        job_code: uuid.UUID,
+        reporter: Callable[[str], None] = None,
+        attempt_note: str = "",
     ) -> None:
         """Handle the initiation of a job/task"""
         self._LOGGER.info("Starting to manage the job [%s]", {job_code})
-        if reporter:
+        if self.digest_reporter:
+            self.digest_reporter.job_started(line=self, job_code=job_code)
+        elif reporter:
             reporter(
                 text=f"""
-⛏ <b>{self}</b> starting job <b>{job_code}</b> at <b>{datetime.now(): %Y/%m/%d %H: %M: %S}</b>.
+⛏ <b>{self}</b> starting job <b>{job_code}</b>{attempt_note} at <b>{self.clock.now(): %Y/%m/%d %H: %M: %S}</b>.
 """
             )
 
+    def __handle_rejection(
+        self,
+        job_code: uuid.UUID,
+        exception: telegram_task.admission.AdmissionRejected,
+        reporter: Callable[[str], None] = None,
+    ) -> None:
+        """Handle a job/task that was not admitted to run"""
+        self._LOGGER.error("Job [%s] is rejected: %s", job_code, exception)
+        text = f"""\
+🚫 <b>{self}</b> rejected job <b>{job_code}</b>. {exception}
+"""
+        if self.digest_reporter:
+            self.digest_reporter.job_failed(
+                line=self, job_code=job_code, text=text, started=False
+            )
+        elif reporter:
+            reporter(text=text)
+
     def __handle_job_report(
         self,
         job_code: uuid.UUID,
         report: JobReport,
         reporter: Callable[[str], None] = None,
+        attempt_note: str = "",
     ) -> None:
         """Handle report from a completed job/task"""
         self.__handle_job_warnings(job_code=job_code, warnings=report.warnings)
         information = "\n" + "\n".join(report.information) if report.information else ""
         self._LOGGER.info("Job [%s] is complete:%s", job_code, information)
-        if reporter:
+        if self.digest_reporter:
+            self.digest_reporter.job_succeeded(
+                line=self, job_code=job_code, warned=bool(report.warnings)
+            )
+        elif reporter:
             if report.warnings:
                 text = f"""\
-✅⚠️ <b>{self}</b> on job <b>{job_code}</b> is done, despite some warnings were raised.{information}
+✅⚠️ <b>{self}</b> on job <b>{job_code}</b>{attempt_note} is done, despite some warnings were raised.{information}
 """
             else:
                 text = f"""\
-✅ <b>{self}</b> on job <b>{job_code}</b> is done.{information}
+✅ <b>{self}</b> on job <b>{job_code}</b>{attempt_note} is done.{information}
 """
             reporter(text=text)
 
@@ -186,39 +889,93 @@ class LineManager:
                 "Job [%s] raised some warnings:\n%s", job_code, warnings_agg
             )
 
+    def __handle_timeout(
+        self,
+        job_code: uuid.UUID,
+        timeout: float,
+        reporter: Callable[[str], None] = None,
+        attempt_note: str = "",
+    ) -> None:
+        """Handle a job/task which did not finish in time"""
+        self._LOGGER.error("Job [%s] timed out after %.1f seconds", job_code, timeout)
+        text = f"""\
+⏰ <b>{self}</b> on job <b>{job_code}</b>{attempt_note} timed out after <b>{max(timeout, 0):.1f}</b> seconds.
+"""
+        if self.digest_reporter:
+            self.digest_reporter.job_failed(line=self, job_code=job_code, text=text)
+        elif reporter:
+            reporter(text=text)
+
+    def __handle_cancellation(
+        self,
+        job_code: uuid.UUID,
+        reporter: Callable[[str], None] = None,
+    ) -> None:
+        """Handle a job/task cancelled on request"""
+        self._LOGGER.warning("Job [%s] is cancelled", job_code)
+        text = f"""\
+🛑 <b>{self}</b> on job <b>{job_code}</b> is cancelled.
+"""
+        if self.digest_reporter:
+            self.digest_reporter.job_failed(line=self, job_code=job_code, text=text)
+        elif reporter:
+            reporter(text=text)
+
+    def __handle_retry(
+        self,
+        job_code: uuid.UUID,
+        attempt_note: str,
+        delay: float,
+        reporter: Callable[[str], None] = None,
+    ) -> None:
+        """Handle scheduling another attempt on a failed job/task"""
+        self._LOGGER.info(
+            "Job [%s] is retried%s in %.1f seconds", job_code, attempt_note, delay
+        )
+        if reporter and not self.digest_reporter:
+            reporter(
+                text=f"""\
+🔁 <b>{self}</b> retries job <b>{job_code}</b>{attempt_note} in <b>{delay:.1f}</b> seconds.
+"""
+            )
+
     def __handle_task_exception(
         self,
         job_code: uuid.UUID,
         exception: TaskException,
         reporter: Callable[[str], None] = None,
+        attempt_note: str = "",
     ) -> None:
         """Handle familiar task exception"""
         self._LOGGER.error(
             "Job [%s] hit exception: %s", job_code, exception.__traceback__
         )
-        if reporter:
-            reporter(
-                text=f"""
-❌ <b>{self}</b> on job <b>{job_code}</b> hit TaskException.
+        text = f"""
+❌ <b>{self}</b> on job <b>{job_code}</b>{attempt_note} hit TaskException.
 {exception.html_message}
 Check the logs for more details.\
 """
-            )
+        if self.digest_reporter:
+            self.digest_reporter.job_failed(line=self, job_code=job_code, text=text)
+        elif reporter:
+            reporter(text=text)
 
     def __handle_unfamiliar_exception(
         self,
         job_code: uuid.UUID,
         exception: Exception,
         reporter: Callable[[str], None] = None,
+        attempt_note: str = "",
     ) -> None:
         """Handle unfamiliar exception raised while performing a task"""
         self._LOGGER.fatal(
             "Job [%s] hit exception: %s", job_code, exception, exc_info=True
         )
-        if reporter:
-            reporter(
-                text=f"""\
-☠️ <b>{self}</b> on job <b>{job_code}</b> hit an unfamiliar exception. \
+        text = f"""\
+☠️ <b>{self}</b> on job <b>{job_code}</b>{attempt_note} hit an unfamiliar exception. \
 Check the logs for more details.
 """
-            )
+        if self.digest_reporter:
+            self.digest_reporter.job_failed(line=self, job_code=job_code, text=text)
+        elif reporter:
+            reporter(text=text)
@@ -0,0 +1,371 @@
+"""
+Metrics module holds counters, gauges and histograms kept in a registry,
+and a small HTTP server exposing them in the Prometheus text format.
+The metrics are recorded on the event loop, so they take no locks,
+and recording one costs a couple of dictionary lookups.
+"""
+from __future__ import annotations
+from typing import Callable, Hashable, Iterator
+import logging
+import asyncio
+import bisect
+import math
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    300,
+    900,
+    3600,
+)
+
+
+def format_value(value: float) -> str:
+    """Formats a sample value the way Prometheus parses it"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Formats the labels of a sample, escaping their values"""
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(
+            f'{x}="'
+            + str(y).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            + '"'
+            for x, y in labels.items()
+        )
+        + "}"
+    )
+
+
+class CounterValue:
+    """Value of a counter for a single set of labels, only ever increasing"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        """Increases the counter by the given non-negative amount"""
+        self.value += amount
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yields the suffix, extra labels and value of each sample"""
+        yield "", {}, self.value
+
+
+class GaugeValue:
+    """Value of a gauge for a single set of labels, set or read on scrape"""
+
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value: float = 0
+        self.function: Callable[[], float] = None
+
+    def set(self, value: float) -> None:
+        """Sets the gauge to the given value"""
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Increases the gauge by the given amount"""
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """Decreases the gauge by the given amount"""
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Reads the gauge from the function on every scrape instead"""
+        self.function = function
+
+    def get(self) -> float:
+        """Returns the current value of the gauge"""
+        return self.function() if self.function else self.value
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yields the suffix, extra labels and value of each sample"""
+        yield "", {}, self.get()
+
+
+class HistogramValue:
+    """Observations of a histogram for a single set of labels"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets: tuple[float, ...] = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """Records the value in the first bucket it fits in"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yields the suffix, extra labels and value of each sample"""
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), self.counts):
+            cumulative += count
+            yield "_bucket", {"le": format_value(float(bound))}, cumulative
+        yield "_sum", {}, self.sum
+        yield "_count", {}, self.count
+
+
+class Metric:
+    """
+    Metric is a named family of values, one for each set of label values.
+    Without label names, the family has a single value.
+    """
+
+    TYPE: str = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        value_factory: Callable[[], object],
+    ):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self.__value_factory: Callable[[], object] = value_factory
+        self.__values: dict[tuple[Hashable, ...], object] = {}
+
+    def labels(self, *values: Hashable) -> object:
+        """Returns the value for the given label values, creating it at first"""
+        value = self.__values.get(values)
+        if value is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"Metric [{self.name}] takes the labels {self.labelnames}."
+                )
+            value = self.__values[values] = self.__value_factory()
+        return value
+
+    def remove(self, *values: Hashable) -> None:
+        """Stops exposing the value for the given label values"""
+        self.__values.pop(values, None)
+
+    def render(self) -> list[str]:
+        """Returns the lines of the metric in the Prometheus text format"""
+        lines = [
+            f"# HELP {self.name} "
+            + self.documentation.replace("\\", "\\\\").replace("\n", "\\n"),
+            f"# TYPE {self.name} {self.TYPE}",
+        ]
+        for label_values, value in list(self.__values.items()):
+            labels = dict(zip(self.labelnames, label_values))
+            for suffix, extra_labels, sample in value.samples():
+                lines.append(
+                    self.name
+                    + suffix
+                    + format_labels({**labels, **extra_labels})
+                    + " "
+                    + format_value(sample)
+                )
+        return lines
+
+
+class Counter(Metric):
+    """Family of counters, named with a _total suffix by convention"""
+
+    TYPE: str = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        super().__init__(name, documentation, labelnames, CounterValue)
+
+    def inc(self, amount: float = 1) -> None:
+        """Increases the counter of a family without labels"""
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    """Family of gauges"""
+
+    TYPE: str = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        super().__init__(name, documentation, labelnames, GaugeValue)
+
+    def set(self, value: float) -> None:
+        """Sets the gauge of a family without labels"""
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    """Family of histograms sharing the same bucket upper bounds"""
+
+    TYPE: str = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        super().__init__(
+            name, documentation, labelnames, lambda: HistogramValue(self.buckets)
+        )
+
+    def observe(self, value: float) -> None:
+        """Records the value in the histogram of a family without labels"""
+        self.labels().observe(value)
+
+
+class MetricsRegistry:
+    """
+    MetricsRegistry keeps the metrics by name. Asking for a metric
+    returns the one already registered, so components can share it.
+    """
+
+    def __init__(self):
+        self.__metrics: dict[str, Metric] = {}
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        """Returns the counter of the given name, registering it at first"""
+        return self.__get_or_register(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Gauge:
+        """Returns the gauge of the given name, registering it at first"""
+        return self.__get_or_register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Returns the histogram of the given name, registering it at first"""
+        return self.__get_or_register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Metric | None:
+        """Returns the metric registered with the given name, if any"""
+        return self.__metrics.get(name)
+
+    def render(self) -> str:
+        """Returns all the metrics in the Prometheus text format"""
+        return "".join(
+            x + "\n" for y in list(self.__metrics.values()) for x in y.render()
+        )
+
+    def __get_or_register(
+        self,
+        kind: type[Metric],
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        **kwargs,
+    ) -> Metric:
+        """Returns the metric of the given name, checking it is of the kind"""
+        metric = self.__metrics.get(name)
+        if metric is None:
+            metric = self.__metrics[name] = kind(
+                name, documentation, labelnames, **kwargs
+            )
+        elif not isinstance(metric, kind) or metric.labelnames != tuple(labelnames):
+            raise ValueError(
+                f"Metric [{name}] is already registered as a {metric.TYPE} "
+                + f"with the labels {metric.labelnames}."
+            )
+        return metric
+
+
+REGISTRY: MetricsRegistry = MetricsRegistry()
+
+
+class MetricsServer:
+    """
+    MetricsServer answers GET /metrics with the registry's metrics,
+    in the Prometheus text format, and 404 on any other path.
+    It binds to the local host unless told otherwise.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+    READ_TIMEOUT: float = 5
+
+    def __init__(
+        self, registry: MetricsRegistry, port: int = 0, host: str = "127.0.0.1"
+    ):
+        self.registry: MetricsRegistry = registry
+        self.host: str = host
+        self.port: int = port
+        self.__server: asyncio.Server = None
+
+    async def start(self) -> None:
+        """Starts listening, on an ephemeral port if the port is 0"""
+        self.__server = await asyncio.start_server(
+            self.__handle, host=self.host, port=self.port
+        )
+        self.port = self.__server.sockets[0].getsockname()[1]
+        self._LOGGER.info(
+            "Metrics are served on http://%s:%d/metrics", self.host, self.port
+        )
+
+    async def stop(self) -> None:
+        """Stops listening and closes the server"""
+        if self.__server:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+    async def __handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers a single request, then closes the connection"""
+        try:
+            request_line = await asyncio.wait_for(
+                reader.readline(), timeout=self.READ_TIMEOUT
+            )
+            while (
+                await asyncio.wait_for(reader.readline(), timeout=self.READ_TIMEOUT)
+            ).strip():
+                pass
+            method, path, *_ = request_line.decode("latin-1").split(" ") + ["", ""]
+            if method == "GET" and path.split("?")[0] == "/metrics":
+                status, body = "200 OK", self.registry.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {self.CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as ex:
+            self._LOGGER.warning("Metrics request has failed: %s", ex)
+        finally:
+            writer.close()
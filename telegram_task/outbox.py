@@ -0,0 +1,234 @@
+"""
+Outbox module holds the pipeline all the outbound telegram messages go through.
+Messages are rate limited to respect telegram's flood limits,
+retried on RetryAfter and coalesced into as few messages as possible.
+"""
+from __future__ import annotations
+from typing import Callable, Awaitable, TypeVar
+from collections import deque
+from dataclasses import dataclass
+import logging
+import asyncio
+import time
+import telegram
+import telegram.error
+
+_T = TypeVar("_T")
+
+
+class TokenBucket:
+    """Token bucket rate limiter, refilled continuously with the given rate"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self.__tokens: float = capacity
+        self.__updated_at: float = time.monotonic()
+
+    def __refill(self) -> None:
+        """Adds the tokens earned since the last update"""
+        now = time.monotonic()
+        self.__tokens = min(
+            self.capacity, self.__tokens + (now - self.__updated_at) * self.rate
+        )
+        self.__updated_at = now
+
+    def delay(self) -> float:
+        """Returns the seconds to wait until a token is available"""
+        self.__refill()
+        return max(0.0, (1 - self.__tokens) / self.rate)
+
+    def consume(self) -> None:
+        """Takes a token, which may leave the bucket in debt"""
+        self.__refill()
+        self.__tokens -= 1
+
+
+@dataclass
+class OutboundMessage:
+    """A message waiting in the pipeline to be sent"""
+
+    chat_id: int
+    text: str
+    parse_mode: str = None
+    reply_markup: telegram.InlineKeyboardMarkup = None
+
+    def can_merge(self, other: OutboundMessage, max_length: int) -> bool:
+        """Checks if the other message can be appended to this one"""
+        return (
+            self.reply_markup is None
+            and other.reply_markup is None
+            and self.chat_id == other.chat_id
+            and self.parse_mode == other.parse_mode
+            and len(self.text) + len(other.text) + 1 <= max_length
+        )
+
+    def merge(self, other: OutboundMessage) -> None:
+        """Appends the other message's text to this one"""
+        self.text = f"{self.text}\n{other.text}"
+
+
+# pylint: disable=too-many-instance-attributes
+class ReportPipeline:
+    """
+    ReportPipeline is a bounded queue of outbound messages with a single sender.
+    Sending is throttled by a global and a per chat token bucket.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    MAX_TEXT_LENGTH: int = telegram.constants.MessageLimit.MAX_TEXT_LENGTH
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        bot: telegram.Bot = None,
+        max_queue_size: int = 1000,
+        global_rate: float = 30,
+        per_chat_rate: float = 1,
+        per_chat_burst: int = 3,
+        max_retries: int = 5,
+    ):
+        self.bot: telegram.Bot = bot
+        self.max_queue_size: int = max_queue_size
+        self.per_chat_rate: float = per_chat_rate
+        self.per_chat_burst: int = per_chat_burst
+        self.max_retries: int = max_retries
+        self.dropped_count: int = 0
+        self.sent_count: int = 0
+        self.__global_bucket: TokenBucket = TokenBucket(
+            rate=global_rate, capacity=global_rate
+        )
+        self.__chat_buckets: dict[int, TokenBucket] = {}
+        self.__queue: deque[OutboundMessage] = deque()
+        self.__has_messages: asyncio.Event = asyncio.Event()
+        self.__is_idle: asyncio.Event = asyncio.Event()
+        self.__is_idle.set()
+        self.__is_running: bool = False
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of messages waiting to be sent"""
+        return len(self.__queue)
+
+    def submit(self, message: OutboundMessage) -> bool:
+        """Puts the message on the queue, returns False if it is dropped"""
+        chunks = self.__split(message)
+        for chunk in chunks:
+            if len(self.__queue) < self.max_queue_size:
+                self.__queue.append(chunk)
+            elif self.__queue[-1].can_merge(chunk, self.MAX_TEXT_LENGTH):
+                self.__queue[-1].merge(chunk)
+            else:
+                self.dropped_count += 1
+                self._LOGGER.error(
+                    "Outbound queue is full, message is dropped: %s", chunk.text
+                )
+                return False
+        self.__is_idle.clear()
+        self.__has_messages.set()
+        return True
+
+    async def run(self) -> None:
+        """Sender coroutine, sends queued messages one batch at a time"""
+        self._LOGGER.info("Report pipeline has started.")
+        self.__is_running = True
+        while self.__is_running:
+            if not self.__queue:
+                self.__is_idle.set()
+                self.__has_messages.clear()
+                await self.__has_messages.wait()
+                continue
+            message = self.__next_batch()
+            try:
+                await self.call(
+                    chat_id=message.chat_id,
+                    request=lambda message=message: self.bot.send_message(
+                        chat_id=message.chat_id,
+                        text=message.text,
+                        parse_mode=message.parse_mode,
+                        reply_markup=message.reply_markup,
+                    ),
+                )
+                self.sent_count += 1
+            except telegram.error.TelegramError as ex:
+                self.dropped_count += 1
+                self._LOGGER.error("Message could not be sent: %s", ex)
+        self._LOGGER.info("Report pipeline has been stopped.")
+
+    async def flush(self, timeout: float = None) -> bool:
+        """Waits for the queue to be sent, returns False on timeout"""
+        try:
+            await asyncio.wait_for(self.__is_idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def stop(self) -> None:
+        """Stops the sender coroutine, queued messages are kept"""
+        self.__is_running = False
+        self.__has_messages.set()
+
+    async def call(self, chat_id: int, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Makes a rate limited bot request, retrying on flood control"""
+        attempt = 0
+        while True:
+            await self.__throttle(chat_id)
+            try:
+                return await request()
+            except telegram.error.RetryAfter as ex:
+                self._LOGGER.warning(
+                    "Flood control exceeded, retrying in %s seconds.", ex.retry_after
+                )
+                await asyncio.sleep(ex.retry_after)
+            except telegram.error.BadRequest:
+                raise
+            except telegram.error.NetworkError as ex:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                self._LOGGER.warning("Network error on attempt [%d]: %s", attempt, ex)
+                await asyncio.sleep(min(2**attempt, 60))
+
+    async def __throttle(self, chat_id: int) -> None:
+        """Waits for both the global and the chat's token buckets"""
+        chat_bucket = self.__chat_buckets.get(chat_id)
+        if not chat_bucket:
+            chat_bucket = self.__chat_buckets[chat_id] = TokenBucket(
+                rate=self.per_chat_rate, capacity=self.per_chat_burst
+            )
+        delay = max(chat_bucket.delay(), self.__global_bucket.delay())
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = max(chat_bucket.delay(), self.__global_bucket.delay())
+        chat_bucket.consume()
+        self.__global_bucket.consume()
+
+    def __next_batch(self) -> OutboundMessage:
+        """Pops the head of the queue, merged with the following messages"""
+        message = self.__queue.popleft()
+        while self.__queue and message.can_merge(self.__queue[0], self.MAX_TEXT_LENGTH):
+            message.merge(self.__queue.popleft())
+        return message
+
+    def __split(self, message: OutboundMessage) -> list[OutboundMessage]:
+        """Splits a message longer than the telegram limit, on line breaks if possible"""
+        if len(message.text) <= self.MAX_TEXT_LENGTH:
+            return [message]
+        chunks = []
+        text = message.text
+        while len(text) > self.MAX_TEXT_LENGTH:
+            cut = text.rfind("\n", 0, self.MAX_TEXT_LENGTH)
+            if cut <= 0:
+                cut = self.MAX_TEXT_LENGTH
+            chunks.append(text[:cut])
+            text = text[cut:].lstrip("\n")
+        chunks.append(text)
+        return [
+            OutboundMessage(
+                chat_id=message.chat_id,
+                text=chunk,
+                parse_mode=message.parse_mode,
+                reply_markup=message.reply_markup if i == len(chunks) - 1 else None,
+            )
+            for i, chunk in enumerate(chunks)
+        ]
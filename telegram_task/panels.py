@@ -0,0 +1,73 @@
+"""
+Panels module holds the store of the new job panels sent to the telegram admin,
+indexed by their job codes and expired when abandoned.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+import time
+import uuid
+import telegram
+import telegram_task.line
+
+
+@dataclass
+class JobPanel:
+    """A panel on which the admin is preparing a new job"""
+
+    line: telegram_task.line.LineManager
+    job_order: telegram_task.line.JobOrder
+    message: telegram.Message
+    touched_at: float = None
+
+
+class PanelStore:
+    """
+    PanelStore keeps the panels in least recently used order,
+    dropping those idle for longer than the TTL or beyond the size limit.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(self, max_panels: int = 100, ttl: float = 24 * 60 * 60):
+        self.max_panels: int = max_panels
+        self.ttl: float = ttl
+        self.__panels: OrderedDict[uuid.UUID, JobPanel] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__panels)
+
+    def put(self, panel: JobPanel) -> None:
+        """Adds or refreshes a panel, evicting the least recently used ones"""
+        panel.touched_at = time.monotonic()
+        self.__panels[panel.job_order.job_code] = panel
+        self.__panels.move_to_end(panel.job_order.job_code)
+        self.expire()
+        while len(self.__panels) > self.max_panels:
+            job_code, _ = self.__panels.popitem(last=False)
+            self._LOGGER.info("Panel of job [%s] is evicted.", job_code)
+
+    def get(self, job_code: uuid.UUID) -> JobPanel | None:
+        """Returns the panel of the job, if it is not expired"""
+        self.expire()
+        panel = self.__panels.get(job_code)
+        if panel:
+            panel.touched_at = time.monotonic()
+            self.__panels.move_to_end(job_code)
+        return panel
+
+    def pop(self, job_code: uuid.UUID) -> JobPanel | None:
+        """Removes the panel of the job and returns it"""
+        self.expire()
+        return self.__panels.pop(job_code, None)
+
+    def expire(self) -> None:
+        """Drops the panels idle for longer than the TTL"""
+        expiry = time.monotonic() - self.ttl
+        while self.__panels:
+            job_code, panel = next(iter(self.__panels.items()))
+            if panel.touched_at > expiry:
+                break
+            del self.__panels[job_code]
+            self._LOGGER.info("Panel of job [%s] is expired.", job_code)
@@ -0,0 +1,200 @@
+"""
+Pipeline module holds the DAG of jobs run on several lines,
+each job starting as soon as its upstream jobs have succeeded.
+"""
+from __future__ import annotations
+from typing import Callable, Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+import logging
+import asyncio
+import telegram_task.line
+
+
+class StepStatus(Enum):
+    """Status of a step in a pipeline run, valued by its emoji"""
+
+    PENDING = "⏳"
+    RUNNING = "⛏"
+    SUCCEEDED = "✅"
+    FAILED = "❌"
+    SKIPPED = "⏭"
+
+
+@dataclass
+class PipelineStep:
+    """A job of the pipeline, run on a line once its upstream steps succeed"""
+
+    name: str
+    line: telegram_task.line.LineManager
+    job_order: telegram_task.line.JobOrder
+    upstream: list[str] = field(default_factory=list)
+    status: StepStatus = StepStatus.PENDING
+
+
+class Pipeline:
+    """
+    Pipeline runs its steps as a DAG, independent branches in parallel.
+    A failed step skips its downstream steps only, the other branches go on.
+    The progress is published as a single message edited in place.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        name: str,
+        publisher: Callable[[str, int], Awaitable[int]] = None,
+    ):
+        self.name: str = name
+        self.publisher: Callable[[str, int], Awaitable[int]] = publisher
+        self.steps: dict[str, PipelineStep] = {}
+        self.started_at: datetime = None
+        self.is_running: bool = False
+        self.__message_id: int = None
+
+    def __str__(self) -> str:
+        return self.name
+
+    def add_step(
+        self,
+        name: str,
+        line: telegram_task.line.LineManager,
+        job_order: telegram_task.line.JobOrder = None,
+        upstream: list[str] = None,
+    ) -> PipelineStep:
+        """
+        Adds a step depending on the given upstream steps,
+        which should have been added before, so that no cycle can be made
+        """
+        if name in self.steps:
+            raise ValueError(f"Step {name} is already in pipeline {self}.")
+        upstream = upstream if upstream else []
+        for upstream_name in upstream:
+            if upstream_name not in self.steps:
+                raise ValueError(f"Upstream step {upstream_name} is not added yet.")
+        step = PipelineStep(
+            name=name,
+            line=line,
+            job_order=job_order if job_order else telegram_task.line.JobOrder(),
+            upstream=upstream,
+        )
+        self.steps[name] = step
+        return step
+
+    def downstream_of(self, name: str) -> list[str]:
+        """Returns all the steps depending on the given one, directly or not"""
+        downstream, names = [], {name}
+        for step in self.steps.values():
+            if names.intersection(step.upstream):
+                names.add(step.name)
+                downstream.append(step.name)
+        return downstream
+
+    def render(self) -> str:
+        """Returns the progress of the current run"""
+        counts = {
+            x: sum(y.status == x for y in self.steps.values()) for x in StepStatus
+        }
+        return (
+            f"🔀 Pipeline <b>{self}</b> started at "
+            + f"<b>{self.started_at:%Y/%m/%d %H:%M:%S}</b>\n"
+            + "\n".join(
+                [
+                    f"{x.status.value} <b>{x.name}</b> on {x.line}"
+                    + (f" ⬅️ {', '.join(x.upstream)}" if x.upstream else "")
+                    for x in self.steps.values()
+                ]
+            )
+            + "\n\n"
+            + ", ".join([f"{x.value} {counts[x]}" for x in StepStatus if counts[x]])
+        )
+
+    async def run(
+        self,
+        perform: Callable[
+            [telegram_task.line.LineManager, telegram_task.line.JobOrder],
+            Awaitable[bool],
+        ] = None,
+    ) -> bool:
+        """
+        Runs the steps, each through the given performer or its line directly,
+        returns True if all of them succeed
+        """
+        if self.is_running:
+            self._LOGGER.warning("Pipeline [%s] is already running.", self)
+            return False
+        if not perform:
+            perform = self.__perform_on_line
+        self.is_running = True
+        self.started_at = datetime.now()
+        self.__message_id = None
+        for step in self.steps.values():
+            step.status = StepStatus.PENDING
+        running: dict[asyncio.Task, PipelineStep] = {}
+        try:
+            self.__start_ready_steps(perform, running)
+            await self.__publish()
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    self.__finish_step(running.pop(task), task)
+                self.__start_ready_steps(perform, running)
+                await self.__publish()
+        finally:
+            for task in running:
+                task.cancel()
+            self.is_running = False
+        return all(x.status == StepStatus.SUCCEEDED for x in self.steps.values())
+
+    @staticmethod
+    async def __perform_on_line(
+        line: telegram_task.line.LineManager, job_order: telegram_task.line.JobOrder
+    ) -> bool:
+        """Performs the step's job directly on its line"""
+        return await line.perform_task(job_order=job_order)
+
+    def __start_ready_steps(
+        self,
+        perform: Callable[
+            [telegram_task.line.LineManager, telegram_task.line.JobOrder],
+            Awaitable[bool],
+        ],
+        running: dict[asyncio.Task, PipelineStep],
+    ) -> None:
+        """Starts the pending steps whose upstream steps have all succeeded"""
+        for step in self.steps.values():
+            if step.status == StepStatus.PENDING and all(
+                self.steps[x].status == StepStatus.SUCCEEDED for x in step.upstream
+            ):
+                step.status = StepStatus.RUNNING
+                self._LOGGER.info("Pipeline [%s] starts step [%s]", self, step.name)
+                task = asyncio.ensure_future(perform(step.line, step.job_order))
+                running[task] = step
+
+    def __finish_step(self, step: PipelineStep, task: asyncio.Task) -> None:
+        """Records the outcome of a step, skipping its downstream on failure"""
+        if not task.cancelled() and not task.exception() and task.result():
+            step.status = StepStatus.SUCCEEDED
+            return
+        step.status = StepStatus.FAILED
+        downstream = self.downstream_of(step.name)
+        self._LOGGER.error(
+            "Pipeline [%s] step [%s] failed, skipping %s", self, step.name, downstream
+        )
+        for name in downstream:
+            self.steps[name].status = StepStatus.SKIPPED
+
+    async def __publish(self) -> None:
+        """Publishes the progress, editing the message of the run"""
+        if not self.publisher:
+            return
+        try:
+            self.__message_id = await self.publisher(self.render(), self.__message_id)
+        # pylint: disable=broad-except
+        # Preventing a failed report from stopping the pipeline
+        except Exception as ex:
+            self._LOGGER.error("Pipeline [%s] progress is not published: %s", self, ex)
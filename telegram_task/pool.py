@@ -0,0 +1,227 @@
+"""
+Pool module holds the pool of worker instances of a line,
+grown on demand while jobs are queued and shrunk once they sit idle.
+"""
+from __future__ import annotations
+from typing import Callable, Awaitable
+from collections import deque
+import logging
+import asyncio
+import time
+
+
+# pylint: disable=too-many-instance-attributes
+class WorkerPool:
+    """
+    WorkerPool hands each job a worker instance of its own.
+    Idle workers are reused most recently released first,
+    so that the surplus ones stay idle and are dropped after idle_time.
+    Instances are set up when they join the pool and torn down when they leave.
+    Once started, the pool drops the expired surplus instances in the background,
+    even when no job comes to acquire or release one.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        min_size: int = 1,
+        max_size: int = 1,
+        idle_time: float = 60,
+        name: str = None,
+        workers: list[object] = None,
+        setup: Callable[[object], Awaitable[None]] = None,
+        teardown: Callable[[object], Awaitable[None]] = None,
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Pool sizes should satisfy 0 <= min_size <= max_size.")
+        self.factory: Callable[[], object] = factory
+        self.min_size: int = min_size
+        self.max_size: int = max_size
+        self.idle_time: float = idle_time
+        self.name: str = name
+        self.setup: Callable[[object], Awaitable[None]] = setup
+        self.teardown: Callable[[object], Awaitable[None]] = teardown
+        self.busy_count: int = 0
+        self.peak_size: int = 0
+        self.is_closed: bool = False
+        self.__idle: deque[tuple[object, float]] = deque(
+            [(x, time.monotonic()) for x in workers] if workers else []
+        )
+        self.__waiters: deque[asyncio.Future] = deque()
+        self.__teardowns: set[asyncio.Task] = set()
+        self.__reaper: asyncio.Task = None
+
+    def __str__(self) -> str:
+        return self.name if self.name else self.__class__.__name__
+
+    @property
+    def size(self) -> int:
+        """Number of worker instances, busy or idle"""
+        return self.busy_count + len(self.__idle)
+
+    @property
+    def idle_count(self) -> int:
+        """Number of worker instances waiting for a job"""
+        return len(self.__idle)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a worker instance"""
+        return len(self.__waiters)
+
+    @property
+    def workers(self) -> list[object]:
+        """The idle worker instances"""
+        return [x for x, _ in self.__idle]
+
+    async def start(self) -> None:
+        """
+        Sets up the instances already in the pool, fills it to min_size
+        and starts reaping the idle ones
+        """
+        await asyncio.gather(
+            *[self.setup(x) for x in self.workers if self.setup], self.__fill()
+        )
+        if not self.__reaper:
+            self.__reaper = asyncio.create_task(self.__reap_periodically())
+
+    async def close(self) -> None:
+        """Tears down the idle instances, busy ones are torn down on release"""
+        self.is_closed = True
+        if self.__reaper:
+            self.__reaper.cancel()
+            self.__reaper = None
+        while self.__idle:
+            self.__drop(self.__idle.popleft()[0])
+        if self.__teardowns:
+            await asyncio.gather(*self.__teardowns)
+
+    async def acquire(self) -> object:
+        """Returns a free worker, creating one or waiting if there is none"""
+        self.reap()
+        if self.__idle:
+            worker, _ = self.__idle.pop()
+            self.busy_count += 1
+        elif self.size < self.max_size:
+            # Holding the place of the new instance while it is set up
+            self.busy_count += 1
+            try:
+                worker = await self.__create()
+            except BaseException:
+                self.busy_count -= 1
+                raise
+            self._LOGGER.info("Pool [%s] has grown to [%d] workers", self, self.size)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.__waiters.append(future)
+            try:
+                worker = await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release(future.result())
+                elif future in self.__waiters:
+                    self.__waiters.remove(future)
+                raise
+        self.peak_size = max(self.peak_size, self.size)
+        return worker
+
+    def release(self, worker: object) -> None:
+        """Gives the worker back, to the first waiting job if there is any"""
+        self.busy_count -= 1
+        if self.is_closed:
+            self.__drop(worker)
+            return
+        self.__hand_over(worker)
+        self.reap()
+
+    def reap(self) -> list[object]:
+        """Drops the workers idle for longer than idle_time, down to min_size"""
+        expiry = time.monotonic() - self.idle_time
+        reaped = []
+        while self.__idle and self.size > self.min_size and self.__idle[0][1] <= expiry:
+            worker, _ = self.__idle.popleft()
+            self.__drop(worker)
+            reaped.append(worker)
+        if reaped:
+            self._LOGGER.info("Pool [%s] has shrunk to [%d] workers", self, self.size)
+        return reaped
+
+    async def __reap_periodically(self) -> None:
+        """Reaps as soon as the oldest idle surplus instance may have expired"""
+        while not self.is_closed:
+            delay = self.idle_time
+            if self.__idle and self.size > self.min_size:
+                delay = max(self.__idle[0][1] + self.idle_time - time.monotonic(), 0)
+            await asyncio.sleep(delay)
+            self.reap()
+
+    async def check_health(self, check: Callable[[object], Awaitable[bool]]) -> int:
+        """
+        Checks the idle instances concurrently and replaces the unhealthy ones
+        still idle, returns the number of unhealthy instances
+        """
+        self.reap()
+        workers = self.workers
+        results = await asyncio.gather(
+            *[check(x) for x in workers], return_exceptions=True
+        )
+        unhealthy = [x for x, y in zip(workers, results) if y is not True]
+        for worker in unhealthy:
+            for entry in self.__idle:
+                if entry[0] is worker:
+                    self.__idle.remove(entry)
+                    self.__drop(worker)
+                    break
+        if unhealthy:
+            self._LOGGER.warning(
+                "Pool [%s] has dropped [%d] unhealthy workers", self, len(unhealthy)
+            )
+            await self.__fill()
+        return len(unhealthy)
+
+    async def __fill(self) -> None:
+        """Creates instances until the pool has min_size of them"""
+        missing = self.min_size - self.size
+        if missing <= 0 or self.is_closed:
+            return
+        created = await asyncio.gather(*[self.__create() for _ in range(missing)])
+        for worker in created:
+            self.__hand_over(worker)
+        self.peak_size = max(self.peak_size, self.size)
+
+    def __hand_over(self, worker: object) -> None:
+        """Passes the worker to the first waiting job, or makes it idle"""
+        while self.__waiters:
+            future = self.__waiters.popleft()
+            if not future.done():
+                self.busy_count += 1
+                future.set_result(worker)
+                return
+        self.__idle.append((worker, time.monotonic()))
+
+    async def __create(self) -> object:
+        """Creates a new worker instance and sets it up"""
+        worker = self.factory()
+        if self.setup:
+            await self.setup(worker)
+        return worker
+
+    def __drop(self, worker: object) -> None:
+        """Tears down a worker instance leaving the pool, in the background"""
+        if not self.teardown:
+            return
+        task = asyncio.ensure_future(self.__teardown(worker))
+        self.__teardowns.add(task)
+        task.add_done_callback(self.__teardowns.discard)
+
+    async def __teardown(self, worker: object) -> None:
+        """Tears down a worker instance, logging instead of raising failures"""
+        try:
+            await self.teardown(worker)
+        # pylint: disable=broad-except
+        # Preventing a failed teardown from stopping the pool
+        except Exception as ex:
+            self._LOGGER.error("Pool [%s] failed to tear down a worker: %s", self, ex)
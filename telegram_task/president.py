@@ -2,554 +2,853 @@
 President module is used for managing the whole construction.
 Each president looks over several line managers, each of which
 manage workers and their tasks.
-Telegram bot is managed by the president too.
+Telegram bot is managed by the president's deputy, if there is one;
+without it the president runs headless.
 """
 from __future__ import annotations
-from typing import Callable, Awaitable, get_type_hints
-from enum import Enum
 import logging
 import uuid
 import asyncio
-import threading
-from time import sleep
-from datetime import datetime, date, time
-import pytz
-import telegram
-import telegram.ext
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+import bisect
+import copy
+import importlib
+import itertools
+from time import perf_counter
+from datetime import datetime, date, time, timedelta
 import telegram_task.line
+import telegram_task.scheduler
+import telegram_task.admission
+import telegram_task.clock
+import telegram_task.digest
+import telegram_task.history
+import telegram_task.journal
+import telegram_task.metrics
+import telegram_task.pipeline
+import telegram_task.recurrence
+import telegram_task.schema
+import telegram_task.watchdog
 
 
-class TelegramDeputy:
+def __getattr__(name: str) -> object:
+    """Imports the telegram deputy lazily, kept here for compatibility"""
+    if name == "TelegramDeputy":
+        return importlib.import_module("telegram_task.deputy").TelegramDeputy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Namespace of the codes cron jobs are journaled under
+_CRON_JOURNAL_NAMESPACE: uuid.UUID = uuid.UUID("7c0e5a1e-3b9f-4d2a-9c47-2f6b8d1e4a53")
+
+
+# pylint: disable=too-many-instance-attributes
+class President:
     """
-    Takes over all the president's tasks
-    that are related to telegram
+    President class handles the scheduled run of workers,
+    as well as unscheduled runs commanded by the user.
     """
 
     _LOGGER: logging.Logger = logging.getLogger(__name__)
-    _INITIATOR_MESSAGE: str = "."
 
+    # pylint: disable=too-many-arguments,too-many-locals
     def __init__(
         self,
-        telegram_app: telegram.ext.Application = None,
-        telegram_admin_id: int = None,
+        telegram_deputy: telegram_task.deputy.TelegramDeputy = None,
+        max_concurrency: int = None,
+        max_queue_size: int = None,
+        resource_budget: int = None,
+        digest_interval: float = None,
+        job_history: telegram_task.history.JobHistory = None,
+        job_journal: telegram_task.journal.JobJournal = None,
+        catch_up: telegram_task.scheduler.CatchUpPolicy = (
+            telegram_task.scheduler.CatchUpPolicy.SKIP
+        ),
+        misfire_grace_time: float = 60,
+        health_check_interval: float = None,
+        shutdown_timeout: float = 30,
+        clock: telegram_task.clock.Clock = None,
+        metrics: telegram_task.metrics.MetricsRegistry = None,
+        metrics_port: int = None,
+        stall_threshold: float = None,
     ):
-        self.president: President = None
-        self.__telegram_app: telegram.ext.Application = telegram_app
-        self.__telegram_admin_id: int = (
-            int(telegram_admin_id) if telegram_admin_id else None
+        self.__telegram_deputy: telegram_task.deputy.TelegramDeputy = telegram_deputy
+        if self.__telegram_deputy:
+            self.__telegram_deputy.president = self
+        self.is_running: bool = False
+        self.lines: list[telegram_task.line.LineManager] = []
+        self.__lines_by_name: dict[str, telegram_task.line.LineManager] = {}
+        self.__operation_loop: asyncio.AbstractEventLoop = None
+        self.daily_cron_jobs: list[
+            tuple[telegram_task.line.LineManager, telegram_task.line.CronJobOrder, bool]
+        ] = []
+        self.clock: telegram_task.clock.Clock = (
+            clock if clock else telegram_task.clock.SYSTEM_CLOCK
         )
-        self.__telegram_que: asyncio.Queue[telegram.Update] = None
-        self.__telegram_bot_username: str = None
-        self.__new_job_panels: list[
-            tuple[
-                telegram_task.line.LineManager,
-                telegram_task.line.JobOrder,
-                telegram.Message,
-            ]
+        self.scheduler: telegram_task.scheduler.Scheduler = (
+            telegram_task.scheduler.Scheduler(clock=self.clock)
+        )
+        self.metrics: telegram_task.metrics.MetricsRegistry = (
+            metrics if metrics else telegram_task.metrics.REGISTRY
+        )
+        self.metrics_server: telegram_task.metrics.MetricsServer = (
+            telegram_task.metrics.MetricsServer(
+                registry=self.metrics, port=metrics_port
+            )
+            if metrics_port is not None
+            else None
+        )
+        self.__cron_calls: dict[uuid.UUID, telegram_task.scheduler.ScheduledCall] = {}
+        self.limiters: list[telegram_task.admission.ConcurrencyLimiter] = []
+        if max_concurrency:
+            self.limiters.append(
+                telegram_task.admission.ConcurrencyLimiter(
+                    capacity=max_concurrency,
+                    max_queue_size=max_queue_size,
+                    name="President",
+                )
+            )
+        if resource_budget:
+            self.limiters.append(
+                telegram_task.admission.ConcurrencyLimiter(
+                    capacity=resource_budget,
+                    max_queue_size=max_queue_size,
+                    weighted=True,
+                    name="ResourceBudget",
+                )
+            )
+        self.digest_reporter: telegram_task.digest.DigestReporter = (
+            telegram_task.digest.DigestReporter(
+                interval=digest_interval, publisher=self.__publish_in_place
+            )
+            if digest_interval
+            else None
+        )
+        self.job_history: telegram_task.history.JobHistory = job_history
+        self.job_journal: telegram_task.journal.JobJournal = job_journal
+        self.__replayed_jobs: set[asyncio.Task] = set()
+        self.__journal_codes: dict[uuid.UUID, uuid.UUID] = {}
+        self.__used_journal_codes: set[uuid.UUID] = set()
+        self.__are_lines_started: bool = False
+        self.__line_starts: set[asyncio.Task] = set()
+        self.catch_up: telegram_task.scheduler.CatchUpPolicy = catch_up
+        self.misfire_grace_time: float = misfire_grace_time
+        self.__last_fired: dict[uuid.UUID, datetime] = {}
+        self.__recurring_calls: dict[
+            uuid.UUID, telegram_task.scheduler.ScheduledCall
+        ] = {}
+        self.pipelines: list[
+            tuple[telegram_task.pipeline.Pipeline, telegram_task.recurrence.Recurrence]
         ] = []
-
-    async def init_updater(self) -> None:
-        """Initiates the telegram updater and starts polling"""
-        if self.__telegram_app:
-            self._LOGGER.info("Initiating telegram bot.")
-            self.__telegram_que = asyncio.Queue()
-            __updater = telegram.ext.Updater(
-                self.__telegram_app.bot, update_queue=self.__telegram_que
+        self.__pipeline_calls: dict[str, telegram_task.scheduler.ScheduledCall] = {}
+        self.health_check_interval: float = health_check_interval
+        self.shutdown_timeout: float = shutdown_timeout
+        self.__stop_requested: asyncio.Event = None
+        self.__started: asyncio.Event = asyncio.Event()
+        self.__operation_task: asyncio.Task = None
+        self.startup_duration: float = None
+        self.loop_monitor: telegram_task.watchdog.LoopMonitor = (
+            telegram_task.watchdog.LoopMonitor(
+                stall_threshold=stall_threshold,
+                alert=self.telegram_report,
+                jobs=self.__running_jobs,
+                metrics=self.metrics,
             )
-            await __updater.initialize()
-            await __updater.start_polling()
-            await self.__telegram_app.job_queue.start()
-            self._LOGGER.info("Telegram bot is initiated.")
-
-    async def telegram_listener(self) -> None:
-        """Waiting for updates from telegram"""
-        if self.__telegram_app:
-            self._LOGGER.info("telegram_listener loop has started.")
-            start_time_utc = datetime.now(tz=pytz.utc)
-            while self.president.is_running:
-                update = await self.__telegram_que.get()
-                self._LOGGER.info("Update from telegram %s", update)
-                if self.__is_update_valid(update):
-                    try:
-                        if update.callback_query:
-                            await self.__handle_telegram_callback_query(update)
-                        elif update.message and update.message.date > start_time_utc:
-                            await self.__handle_telegram_message(update)
-                    except ValueError:
-                        self._LOGGER.error("ValueError: exception on converting input.")
-                    except KeyError:
-                        self._LOGGER.error("KeyError: exception on converting input.")
-                    # pylint: disable=broad-except
-                    # Preventing an exception on handling a message \
-                    # from bringing down the whole operation
-                    except Exception as ex:
-                        self._LOGGER.fatal(
-                            "Exception on handling [%s]: %s",
-                            str(update),
-                            ex,
-                            exc_info=True,
-                        )
-                elif update.message.chat.type == telegram.constants.ChatType.PRIVATE:
-                    self.__handle_message_from_unknown(update)
-            self._LOGGER.info("telegram_listener is done.")
+            if stall_threshold
+            else None
+        )
 
-    def telegram_report(self, text: str) -> None:
-        """Telegram simple report making"""
-        if self.__telegram_app:
-            self.__telegram_app.job_queue.run_once(
-                lambda context: context.bot.send_message(
-                    chat_id=self.__telegram_admin_id,
-                    text=text,
-                    parse_mode=telegram.constants.ParseMode.HTML,
-                ),
-                when=0,
+    def __start_operations(self) -> list[asyncio.Task]:
+        """Starts the tasks run on operation"""
+        operations = [self.__handle_crons()]
+        if self.__telegram_deputy:
+            operations.append(self.__telegram_deputy.telegram_listener())
+        if self.digest_reporter:
+            operations.append(self.digest_reporter.run())
+        if self.job_history:
+            operations.append(self.job_history.run())
+        if self.health_check_interval:
+            operations.append(self.__check_health())
+        if self.loop_monitor:
+            operations.append(self.loop_monitor.run())
+        return [asyncio.ensure_future(x) for x in operations]
+
+    def __running_jobs(
+        self,
+    ) -> list[tuple[str, uuid.UUID, asyncio.Task]]:
+        """Returns the line, code and task of every job running on the lines"""
+        return [
+            (x.display_name, y, z)
+            for x in self.lines
+            for y, z in list(x.running_jobs.items())
+        ]
+
+    async def __publish_in_place(self, text: str, message_id: int = None) -> int:
+        """Publishes a message edited in place on telegram, if there is a deputy"""
+        if self.__telegram_deputy:
+            return await self.__telegram_deputy.publish_digest(
+                text=text, message_id=message_id
             )
+        self._LOGGER.info(text)
+        return message_id
 
-    def __handle_message_from_unknown(self, update: telegram.Update) -> None:
-        """Handles a message received from an unknown user"""
-        self.telegram_report(
-            text=f"""
-⚠️ Alert ⚠️
-Message from unknown user [{update.effective_user.id}, \
-{update.effective_user.full_name}, @{update.effective_user.username}]
-"""
-        )
-        self.__telegram_app.job_queue.run_once(
-            lambda context: context.bot.forward_message(
-                chat_id=self.__telegram_admin_id,
-                from_chat_id=update.effective_chat.id,
-                message_id=update.effective_message.message_id,
-            ),
-            when=0,
+    def start_operation(self, lifespan: int = 0) -> None:
+        """Start the operation of the enterprise after full initiation"""
+        self._LOGGER.info("President is starting the operation.")
+        self.__operation_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.__operation_loop)
+        self.__operation_loop.run_until_complete(
+            self.__operate(lifespan=lifespan if lifespan > 0 else None)
         )
 
-    async def __handle_telegram_message(self, update: telegram.Update) -> None:
-        """Handle message from telegram admin"""
-        message_splitted = update.message.text.split(" ")
-        match message_splitted[0]:
-            case self._INITIATOR_MESSAGE:
-                self.__telegram_introduction_message(update)
-            case _:
-                if (
-                    message_splitted[0]
-                    == "@" + await self.__get_telegram_bot_username()
-                ):
-                    await self.__handle_telegram_inline_query(message_splitted)
-
-    async def __handle_telegram_inline_query(self, message_splitted: list[str]) -> None:
-        """Handle inline query from telegram admin"""
-        if len(message_splitted) > 1:
-            match message_splitted[1]:
-                case "SpecificNewJobPanelUpdate":
-                    await self.__telegram_specific_new_job_panel_update(
-                        message_splitted=message_splitted
-                    )
+    async def start_operation_async(self, lifespan: int = None) -> None:
+        """Start the operation of the enterprise after full initiation"""
+        self._LOGGER.info("President is starting the operation asynchronously.")
+        self.__operation_loop = asyncio.get_running_loop()
+        await self.__operate(lifespan=lifespan)
+
+    async def __aenter__(self) -> President:
+        """Starts the operation in the background, once the lines are ready"""
+        self.__operation_task = asyncio.create_task(self.start_operation_async())
+        started = asyncio.create_task(self.__started.wait())
+        await asyncio.wait(
+            [self.__operation_task, started], return_when=asyncio.FIRST_COMPLETED
+        )
+        if self.__operation_task.done():
+            started.cancel()
+            self.__operation_task.result()
+        return self
 
-    async def __handle_telegram_callback_query(self, update: telegram.Update) -> None:
-        """Handle callback query from telegram admin"""
-        callback_data_splitted = update.callback_query.data.split(",")
-        match callback_data_splitted[0]:
-            case "HighFive":
-                self.__telegram_high_five(update=update)
-            case "DailyTaskReport":
-                self.report_daily_tasks(do_log=False)
-            case "NewJobPanel":
-                self.__telegram_new_job_panel()
-            case "SpecificNewJobPanel":
-                await self.__telegram_specific_new_job_panel(
-                    callback_data=callback_data_splitted
-                )
-            case "ExecuteSpecificNewJob":
-                await self.__telegram_execute_specific_new_job(
-                    callback_data=callback_data_splitted
-                )
+    async def __aexit__(self, *_) -> None:
+        """Stops the operation gracefully and waits for the shutdown"""
+        self.stop_operation()
+        await self.__operation_task
 
-    async def __telegram_execute_specific_new_job(
-        self, callback_data: list[str]
-    ) -> None:
-        """Executes the new job from its specifications"""
-        if len(callback_data) > 1:
-            job_code = uuid.UUID(callback_data[1])
-            print(job_code)
-            job_panel = next(
-                x for x in self.__new_job_panels if x[1].job_code == job_code
-            )
-            text, _ = self.__telegram_specific_new_job_panel_message(
-                line_manager=job_panel[0], job_order=job_panel[1]
+    async def __operate(self, lifespan: float = None) -> None:
+        """Runs the operation until the lifespan ends or a stop is requested"""
+        started_at = perf_counter()
+        self.is_running = True
+        self.__stop_requested = asyncio.Event()
+        operations = []
+        stop_requested = asyncio.ensure_future(self.__stop_requested.wait())
+        try:
+            if self.metrics_server:
+                await self.metrics_server.start()
+            if self.__telegram_deputy:
+                await self.__telegram_deputy.init_updater()
+            await self.__start_lines()
+            await self.__replay_journal()
+            self.startup_duration = perf_counter() - started_at
+            self._LOGGER.info(
+                "Operation has started in [%.3f] seconds.", self.startup_duration
             )
-            await self.__telegram_app.bot.edit_message_text(
-                chat_id=self.__telegram_admin_id,
-                message_id=job_panel[2].id,
-                text=f"{text}\n\nRoger that 🦾✅",
-                parse_mode=telegram.constants.ParseMode.HTML,
+            self.__started.set()
+            operations = self.__start_operations()
+            group = asyncio.gather(*operations)
+            await asyncio.wait(
+                [group, stop_requested],
+                timeout=lifespan,
+                return_when=asyncio.FIRST_COMPLETED,
             )
-            self.__new_job_panels.remove(job_panel)
-            asyncio.create_task(
-                job_panel[0].perform_task(
-                    job_order=job_panel[1], reporter=self.telegram_report
-                )
+            if group.done():
+                group.result()
+            else:
+                # The group only catches the first failure, the operations
+                # still running are awaited one by one on shutdown
+                group.add_done_callback(lambda x: x.cancelled() or x.exception())
+            self._LOGGER.info("Telegram bot listener is terminated.")
+        except Exception as ex:
+            self._LOGGER.error(ex, exc_info=True)
+            self._LOGGER.info(
+                "Telegram bot listener is terminated in an improper manner."
             )
+            raise ex
+        finally:
+            stop_requested.cancel()
+            await self.__shutdown(operations)
 
-    async def __telegram_specific_new_job_panel_update(
-        self, message_splitted: list[str]
-    ) -> None:
-        """Updates some parameter in the new job panel"""
-        if len(message_splitted) > 7:
-            property_name = message_splitted[2]
-            job_code = uuid.UUID(hex=message_splitted[5])
-            new_value_str = message_splitted[7]
-            job_panel = next(
-                x for x in self.__new_job_panels if x[1].job_code == job_code
-            )
-            property_type = get_type_hints(job_panel[1].job_description)[property_name]
-            job_panel[1].job_description.__dict__[
-                property_name
-            ] = self.__convert_str_to_type(raw_val=new_value_str, to_type=property_type)
-            text, inline_keyboard = self.__telegram_specific_new_job_panel_message(
-                line_manager=job_panel[0], job_order=job_panel[1]
+    async def __shutdown(self, operations: list[asyncio.Task] = None) -> None:
+        """
+        Stops admitting new jobs, drains the jobs in flight up to the deadline,
+        sends the queued reports, then stops telegram and the lines
+        """
+        self._LOGGER.info("President is shutting down the operation.")
+        self.is_running = False
+        self.__started.clear()
+        self.scheduler.stop()
+        if self.loop_monitor:
+            self.loop_monitor.stop()
+        for limiter in self.limiters:
+            limiter.close()
+        for line in self.lines:
+            line.stop_admission()
+        await self.__drain_jobs()
+        if self.digest_reporter:
+            self.digest_reporter.stop()
+            try:
+                await self.digest_reporter.flush()
+            # pylint: disable=broad-except
+            # Preventing a failed digest from stopping the shutdown
+            except Exception as ex:
+                self._LOGGER.error("Last digest could not be published: %s", ex)
+        if self.__telegram_deputy:
+            await self.__telegram_deputy.shutdown(timeout=self.shutdown_timeout)
+        pending = [x for x in operations if not x.done()] if operations else []
+        for operation in pending:
+            operation.cancel()
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                self._LOGGER.error("Operation has failed on shutdown: %s", result)
+        await self.__stop_lines()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        self._LOGGER.info("President has shut down the operation.")
+
+    async def __drain_jobs(self) -> None:
+        """Waits for the jobs in flight, cancelling those left at the deadline"""
+        in_flight = sum(x.jobs_in_flight for x in self.lines)
+        if not in_flight:
+            return
+        self._LOGGER.info("Draining [%d] jobs in flight.", in_flight)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*[x.drain() for x in self.lines]),
+                timeout=self.shutdown_timeout,
             )
-            message = await self.__telegram_app.bot.edit_message_text(
-                chat_id=self.__telegram_admin_id,
-                message_id=job_panel[2].id,
-                text=text,
-                parse_mode=telegram.constants.ParseMode.HTML,
-                reply_markup=inline_keyboard,
+        except asyncio.TimeoutError:
+            self._LOGGER.warning(
+                "Cancelling [%d] jobs still running at the shutdown deadline.",
+                sum(x.jobs_in_flight for x in self.lines),
             )
-            self.__new_job_panels.remove(job_panel)
-            self.__new_job_panels.append((job_panel[0], job_panel[1], message))
-
-    def __convert_str_to_type(self, raw_val: str, to_type: type) -> type.__name__:
-        """Converts string to the given type"""
-        if to_type in [int, float, str]:
-            return to_type(raw_val)
-        if to_type == bool:
-            return raw_val.lower() in ["true", "1", "y"]
-        if to_type is date:
-            return datetime.strptime(raw_val, "%Y-%m-%d").date()
-        if to_type is datetime:
-            return datetime.strptime(raw_val, "%Y-%m-%d %H:%M:%S")
-        if issubclass(to_type, Enum):
-            return to_type[raw_val]
-        raise ValueError
-
-    async def __telegram_specific_new_job_panel(self, callback_data: list[str]) -> None:
+            for line in self.lines:
+                for task in list(line.running_jobs.values()):
+                    task.cancel()
+            await asyncio.sleep(0)
+
+    async def __start_lines(self) -> None:
+        """Prepares all the lines concurrently, setting up their workers"""
+        self.__are_lines_started = True
+        await asyncio.gather(*[x.start() for x in self.lines])
+
+    async def __start_added_line(self, line: telegram_task.line.LineManager) -> None:
+        """Prepares a line added once the lines are started"""
+        try:
+            await line.start()
+        # pylint: disable=broad-except
+        # Preventing a line failing to start from bringing down the operation
+        except Exception as ex:
+            self._LOGGER.error("Line [%s] has failed to start: %s", line, ex)
+
+    async def __stop_lines(self) -> None:
         """
-        Sends the panel for a specific job
-        so that the user proceeds with the new job request
+        Tears down the workers of all the lines concurrently,
+        then releases their resources and saves their history
         """
-        job_name = callback_data[1]
-        line = next(x for x in self.president.lines if x.display_name == job_name)
-        job_order = telegram_task.line.JobOrder(
-            job_description=line.worker.default_job_description()
-        )
-        text, inline_keyboard = self.__telegram_specific_new_job_panel_message(
-            line_manager=line, job_order=job_order
-        )
-        message = await self.__telegram_app.bot.send_message(
-            chat_id=self.__telegram_admin_id,
-            text=text,
-            parse_mode=telegram.constants.ParseMode.HTML,
-            reply_markup=inline_keyboard,
-        )
-        self.__new_job_panels.append((line, job_order, message))
-
-    def __telegram_specific_new_job_panel_message(
-        self,
-        line_manager: telegram_task.line.LineManager,
-        job_order: telegram_task.line.JobOrder,
-    ) -> tuple[str, InlineKeyboardMarkup]:
-        """Returns the message text and keyboard for a specific job request"""
-        type_hints = (
-            get_type_hints(job_order.job_description, include_extras=False)
-            if job_order.job_description.__dict__
-            else {}
-        )
-        text = f"""
-Please validate the job description for <b>{line_manager}</b> \
-📝 with code <b>{job_order.job_code}</b> 🔑
+        if self.__line_starts:
+            await asyncio.wait(set(self.__line_starts))
+        self.__are_lines_started = False
+        await asyncio.gather(*[x.stop() for x in self.lines])
+        if self.job_history:
+            self.job_history.stop()
+            await self.job_history.drain()
+            self.job_history.flush()
+        if self.job_journal:
+            self.job_journal.flush()
+
+    async def __check_health(self) -> None:
+        """Checks the health of the lines' workers periodically"""
+        while self.is_running:
+            await asyncio.sleep(self.health_check_interval)
+            results = await asyncio.gather(*[x.check_health() for x in self.lines])
+            unhealthy = [str(x) for x, y in zip(self.lines, results) if not y]
+            if unhealthy:
+                self._LOGGER.warning("Unhealthy workers on lines %s", unhealthy)
+                self.telegram_report(
+                    text="🩺 Unhealthy workers are replaced on: " + ", ".join(unhealthy)
+                )
 
-""" + "\n".join(
-            [
-                f"<b>{key}</b> ({type_hints[key].__name__}) ➡️  {val}"
-                for key, val in job_order.job_description.__dict__.items()
-            ]
-        )
-        keybord_rows = [
-            [
-                InlineKeyboardButton(
-                    text=f"{key} ✏️",
-                    switch_inline_query_current_chat=f"SpecificNewJobPanelUpdate {key} "
-                    + f"on job {job_order.job_code} : ",
+    async def __replay_journal(self) -> None:
+        """Performs the jobs left unfinished by the previous operation"""
+        if not self.job_journal:
+            return
+        for entry in self.job_journal.unfinished():
+            line = self.get_line(entry.line)
+            if not line:
+                self._LOGGER.warning(
+                    "Job [%s] is dropped as there is no line named [%s]",
+                    entry.job_code,
+                    entry.line,
                 )
-            ]
-            for key, val in job_order.job_description.__dict__.items()
-        ]
-        keybord_rows.append(
-            [
-                InlineKeyboardButton(
-                    text="Execute ✅",
-                    callback_data=f"ExecuteSpecificNewJob,{job_order.job_code}",
+                self.job_journal.acknowledge(job_code=entry.job_code, slot=entry.slot)
+                continue
+            self._LOGGER.info(
+                "Replaying job [%s] enqueued at [%s]", entry.job_code, entry.enqueued_at
+            )
+            task = asyncio.create_task(
+                self.perform_job(
+                    line=line,
+                    job_order=entry.job_order,
+                    slot=entry.slot,
+                    journal_code=entry.job_code,
                 )
-            ]
-        )
-        return text, InlineKeyboardMarkup(keybord_rows)
+            )
+            self.__replayed_jobs.add(task)
+            task.add_done_callback(self.__replayed_jobs.discard)
 
-    def __telegram_new_job_panel(self) -> None:
-        """Sends the panel so that the user chooses a new job"""
-        text = "Please choose a job 🦾\n" + "\n".join(
-            [f"{i+1}. <b>{x}</b>" for i, x in enumerate(self.president.lines)]
-        )
-        reply_markup_buttons = [
-            [
-                InlineKeyboardButton(
-                    text=str(i * 5 + j + 1),
-                    callback_data=f"SpecificNewJobPanel,{x.display_name}",
+    async def perform_job(
+        self,
+        line: telegram_task.line.LineManager,
+        job_order: telegram_task.line.JobOrder,
+        slot: str = "",
+        journal_code: uuid.UUID = None,
+    ) -> bool:
+        """Performs the job on the line, keeping it in the journal until it is done"""
+        if not journal_code:
+            journal_code = self.__journal_codes.get(
+                job_order.job_code, job_order.job_code
+            )
+        if self.job_journal:
+            try:
+                await self.job_journal.enqueue(
+                    line=line.display_name,
+                    job_order=job_order,
+                    slot=slot,
+                    job_code=journal_code,
                 )
-                for j, x in enumerate(self.president.lines[i : i + 5])
-            ]
-            for i in range(0, len(self.president.lines), 5)
-        ]
-        self.__telegram_app.job_queue.run_once(
-            lambda context: context.bot.send_message(
-                chat_id=self.__telegram_admin_id,
-                text=text,
-                parse_mode=telegram.constants.ParseMode.HTML,
-                reply_markup=InlineKeyboardMarkup(reply_markup_buttons),
-            ),
-            when=0,
+            # pylint: disable=broad-except
+            # A job which can not be journaled is still performed
+            except Exception as ex:
+                self._LOGGER.error(
+                    "Job [%s] could not be journaled: %s", job_order.job_code, ex
+                )
+        result = await line.perform_task(
+            job_order=job_order, reporter=self.telegram_report
         )
+        # Jobs failed or rejected on shutdown are left to be replayed on start
+        if self.job_journal and (result or line.is_admitting):
+            self.job_journal.acknowledge(job_code=journal_code, slot=slot)
+        return result
 
-    def __telegram_high_five(self, update: telegram.Update) -> None:
-        """Test method, high five on request"""
-        self.__telegram_app.job_queue.run_once(
-            lambda context: context.bot.answer_callback_query(
-                callback_query_id=update.callback_query.id,
-                text="One is glad to be of service 🙂 🙏",
-                show_alert=True,
-            ),
-            when=0,
-        )
+    def stop_operation(self) -> None:
+        """
+        Requests a graceful stop of the enterprise operation,
+        safe to call from any thread
+        """
+        self._LOGGER.info("President is stopping the operation.")
+        if self.__operation_loop and self.__stop_requested:
+            self.__operation_loop.call_soon_threadsafe(self.__stop_requested.set)
 
-    def __telegram_introduction_message(self, update: telegram.Update) -> None:
-        self.__telegram_app.job_queue.run_once(
-            lambda context: context.bot.send_message(
-                chat_id=self.__telegram_admin_id,
-                text=f"""
-Hello <b>{update.effective_user.first_name}</b> 🙂
-How may I help you today?
-""",
-                parse_mode=telegram.constants.ParseMode.HTML,
-                reply_markup=InlineKeyboardMarkup(
-                    [
-                        [
-                            InlineKeyboardButton(
-                                text="High Five 🙏", callback_data="HighFive"
-                            )
-                        ],
-                        [
-                            InlineKeyboardButton(
-                                text="Daily Task Report 📑",
-                                callback_data="DailyTaskReport",
-                            )
-                        ],
-                        [
-                            InlineKeyboardButton(
-                                text="Got a Job? 🦾", callback_data="NewJobPanel"
-                            )
-                        ],
-                    ]
-                ),
-            ),
-            when=0,
+    async def __handle_crons(self) -> None:
+        """Handling cron jobs associated with lines"""
+        self._LOGGER.info("Handling cron jobs has started.")
+        scheduled_calls = self.metrics.gauge(
+            "telegram_task_scheduled_calls", "Calls pending on the scheduler"
         )
+        scheduled_calls.labels().set_function(lambda: len(self.scheduler))
+        self.__schedule_recurring_jobs()
+        self.__plan_day()
+        try:
+            await self.scheduler.run()
+        finally:
+            scheduled_calls.remove()
+        self._LOGGER.info("Handling cron jobs has been stopped.")
 
-    async def __get_telegram_bot_username(self) -> str:
-        """Returns the telegram bot username, either from memory or by fetching"""
-        if self.__telegram_bot_username:
-            return self.__telegram_bot_username
-        self.__telegram_bot_username = (await self.__telegram_app.bot.get_me()).username
-        return self.__telegram_bot_username
-
-    def __is_update_valid(self, update: telegram.Update) -> bool:
-        """Checks if update is from the admin chat"""
-        return (
-            update.effective_chat
-            and int(update.effective_chat.id) == self.__telegram_admin_id
+    def __plan_day(self) -> None:
+        """Schedules the rest of today's cron jobs and the next day's planning"""
+        today = self.clock.today()
+        for call in self.__cron_calls.values():
+            self.scheduler.cancel(call)
+        self.__cron_calls.clear()
+        self.daily_cron_jobs = self.get_daily_cron_jobs(include_missed=True)
+        self.metrics.gauge(
+            "telegram_task_daily_cron_jobs", "Cron jobs planned for the day"
+        ).set(len(self.daily_cron_jobs))
+        self._LOGGER.info(
+            "Handling [%d] cron jobs for [%s]", len(self.daily_cron_jobs), today
         )
-
-    def report_daily_tasks(self, do_log: bool) -> None:
-        """Report daily tasks on telegram"""
-
-        def job_status_to_emoji(status: bool) -> str:
-            match status:
-                case True:
-                    return "✅"
-                case False:
-                    return "❌"
-                case _:
-                    return "⚙️"
-
-        report = (
-            f"📑 Cron jobs for {datetime.now():%Y/%m/%d}:\n"
-            + "\n".join(
-                [
-                    f"{job_status_to_emoji(x[2])} {x[0]} 🕔 {x[1].daily_run_time:%H:%M:%S}"
-                    for x in self.president.daily_cron_jobs
-                ]
+        if self.__telegram_deputy:
+            self.__telegram_deputy.report_daily_tasks(do_log=True)
+        for job in self.daily_cron_jobs:
+            status = (
+                self.job_journal.slot_status(
+                    job_code=self.__journal_codes.get(job[1].job_code, job[1].job_code),
+                    slot=today.isoformat(),
+                )
+                if self.job_journal
+                else None
             )
-            if self.president.daily_cron_jobs
-            else f"📑 No cron jobs for {datetime.now():%Y/%m/%d}."
+            if status is None:
+                self.__schedule_cron_job(job=job, day=today)
+            else:
+                job[2] = status or None
+        self.scheduler.schedule(
+            when=datetime.combine(today + timedelta(days=1), time.min),
+            callback=self.__start_new_day,
         )
-        if do_log:
-            self._LOGGER.info(report)
-        self.telegram_report(report)
 
+    async def __start_new_day(self) -> None:
+        """Scheduled on midnight to plan the new day"""
+        self._LOGGER.info("Cron jobs for [%s] are all fired", self.clock.today())
+        if self.job_journal:
+            self.job_journal.prune()
+        self.__plan_day()
 
-class President:
-    """
-    President class handles the scheduled run of workers,
-    as well as unscheduled runs commanded by the user.
-    """
-
-    _LOGGER: logging.Logger = logging.getLogger(__name__)
-
-    def __init__(self, telegram_deputy: TelegramDeputy = None):
-        self.__telegram_deputy: TelegramDeputy = telegram_deputy
-        if self.__telegram_deputy:
-            self.__telegram_deputy.president = self
-        self.is_running: bool = False
-        self.lines: list[telegram_task.line.LineManager] = []
-        self.__operation_loop: asyncio.AbstractEventLoop = None
-        self.daily_cron_jobs: list[
-            tuple[telegram_task.line.LineManager, telegram_task.line.CronJobOrder, bool]
-        ] = []
+    def __schedule_cron_job(
+        self,
+        job: list[
+            telegram_task.line.LineManager, telegram_task.line.CronJobOrder, bool
+        ],
+        day: date,
+    ) -> None:
+        """Puts a cron job for the given day on the scheduler"""
+        when = datetime.combine(day, job[1].daily_run_time)
+
+        async def fire() -> None:
+            self.__cron_calls.pop(job[1].job_code, None)
+            is_missed = self.__is_missed(job_order=job[1], when=when)
+            self.metrics.counter(
+                "telegram_task_cron_fires_total",
+                "Cron jobs whose time has come, by whether they are run or missed",
+                ("line", "result"),
+            ).labels(job[0].display_name, "missed" if is_missed else "run").inc()
+            if is_missed:
+                return
+            self.metrics.histogram(
+                "telegram_task_cron_lateness_seconds",
+                "Seconds a cron job is run after its daily run time",
+                ("line",),
+            ).labels(job[0].display_name).observe(
+                max((self.clock.now() - when).total_seconds(), 0)
+            )
+            self.__last_fired[job[1].job_code] = self.clock.now()
+            job[2] = await self.perform_job(
+                line=job[0], job_order=job[1], slot=day.isoformat()
+            )
 
-    def __operation_group(self) -> Callable[[], Awaitable[bool]]:
-        """Returns the group of tasks run on operation"""
-        return asyncio.gather(
-            self.__telegram_deputy.telegram_listener(), self.__handle_crons()
+        self.__cron_calls[job[1].job_code] = self.scheduler.schedule(
+            when=when, callback=fire
         )
 
-    def start_operation(self, lifespan: int = 0) -> None:
-        """Start the operation of the enterprise after full initiation"""
-        self._LOGGER.info("President is starting the operation.")
-        self.is_running = True
-        self.__operation_loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.__operation_loop)
-        if lifespan > 0:
-            __killer_thread = threading.Thread(
-                target=self.__automatic_killer, args=(lifespan,)
+    def __schedule_recurring_job(
+        self,
+        line: telegram_task.line.LineManager,
+        job_order: telegram_task.line.RecurringJobOrder,
+        when: datetime | None,
+    ) -> None:
+        """Puts the next run of a recurring job on the scheduler"""
+        if when is None:
+            self._LOGGER.info(
+                "Job [%s] has no more runs to schedule", job_order.job_code
             )
-            __killer_thread.start()
-        try:
-            self.__operation_loop.run_until_complete(
-                self.__telegram_deputy.init_updater()
+            return
+
+        async def fire() -> None:
+            self.__recurring_calls.pop(job_order.job_code, None)
+            is_late = (
+                self.clock.now() - when
+            ).total_seconds() > self.misfire_grace_time
+            self.__schedule_recurring_job(
+                line=line,
+                job_order=job_order,
+                when=job_order.recurrence.next_after(
+                    self.clock.now()
+                    if is_late
+                    and self.__catch_up_of(job_order)
+                    != telegram_task.scheduler.CatchUpPolicy.RUN_ALL
+                    else when
+                ),
             )
-            group = self.__operation_group()
-            _ = self.__operation_loop.run_until_complete(group)
-        except RuntimeError:
-            self._LOGGER.info("Telegram bot listener is terminated.")
-        except Exception as ex:
-            self._LOGGER.error(ex, exc_info=True)
-            self._LOGGER.info(
-                "Telegram bot listener is terminated in an improper manner."
+            if self.__is_missed(job_order=job_order, when=when):
+                return
+            self.__last_fired[job_order.job_code] = self.clock.now()
+            # Runs may overlap, so each is given a job code of its own
+            run_order = copy.copy(job_order)
+            run_order.job_code = uuid.uuid4()
+            await self.perform_job(
+                line=line, job_order=run_order, slot=when.isoformat()
             )
-            raise ex
 
-    async def start_operation_async(self, lifespan: int = None) -> None:
-        """Start the operation of the enterprise after full initiation"""
-        self._LOGGER.info("President is starting the operation asynchronously.")
-        self.is_running = True
-        try:
-            await self.__telegram_deputy.init_updater()
-            group = self.__operation_group()
-            await asyncio.wait_for(group, timeout=lifespan)
-        except asyncio.exceptions.TimeoutError:
-            self.is_running = False
-            self._LOGGER.info("Telegram bot listener is terminated.")
-        except Exception as ex:
-            self._LOGGER.error(ex, exc_info=True)
-            self._LOGGER.info(
-                "Telegram bot listener is terminated in an improper manner."
+        self.__recurring_calls[job_order.job_code] = self.scheduler.schedule(
+            when=when, callback=fire
+        )
+
+    def __schedule_recurring_jobs(self) -> None:
+        """Schedules the next run of every recurring job and pipeline"""
+        for call in list(self.__recurring_calls.values()) + list(
+            self.__pipeline_calls.values()
+        ):
+            self.scheduler.cancel(call)
+        self.__recurring_calls.clear()
+        self.__pipeline_calls.clear()
+        now_datetime = self.clock.now()
+        for line in self.lines:
+            for job_order in line.recurring_job_orders:
+                self.__schedule_recurring_job(
+                    line=line,
+                    job_order=job_order,
+                    when=job_order.recurrence.next_after(now_datetime),
+                )
+        for pipeline, recurrence in self.pipelines:
+            self.__schedule_pipeline(
+                pipeline=pipeline,
+                recurrence=recurrence,
+                when=recurrence.next_after(now_datetime),
             )
-            raise ex
 
-    def __automatic_killer(self, lifespan) -> None:
-        """Method used for setting an automatic lifespan for operation"""
-        self._LOGGER.info(
-            "Automatic killer is set to stop operation after %d seconds.", lifespan
+    def __schedule_pipeline(
+        self,
+        pipeline: telegram_task.pipeline.Pipeline,
+        recurrence: telegram_task.recurrence.Recurrence,
+        when: datetime | None,
+    ) -> None:
+        """Puts the next run of a pipeline on the scheduler"""
+        if when is None:
+            self._LOGGER.info("Pipeline [%s] has no more runs to schedule", pipeline)
+            return
+
+        async def fire() -> None:
+            self.__pipeline_calls.pop(pipeline.name, None)
+            self.__schedule_pipeline(
+                pipeline=pipeline,
+                recurrence=recurrence,
+                when=recurrence.next_after(max(when, self.clock.now())),
+            )
+            await self.run_pipeline(pipeline)
+
+        self.__pipeline_calls[pipeline.name] = self.scheduler.schedule(
+            when=when, callback=fire
         )
-        sleep(lifespan)
-        self._LOGGER.info("Automatic killer is killing the operation.")
-        self.stop_operation()
 
-    def stop_operation(self) -> None:
-        """Stop the enterprise operation"""
-        self._LOGGER.info("President is stopping the operation.")
-        self.is_running = False
-        self.__operation_loop.stop()
+    def add_pipeline(
+        self,
+        pipeline: telegram_task.pipeline.Pipeline,
+        recurrence: telegram_task.recurrence.Recurrence,
+    ) -> None:
+        """Adds a pipeline run on every fire time of the recurrence"""
+        self.pipelines.append((pipeline, recurrence))
+        if self.is_running:
+            self.__schedule_pipeline(
+                pipeline=pipeline,
+                recurrence=recurrence,
+                when=recurrence.next_after(self.clock.now()),
+            )
 
-    async def __handle_crons(self) -> None:
-        """Handling cron jobs associated with lines"""
-        self._LOGGER.info("Handling cron jobs has started.")
-        while self.is_running:
-            today = date.today()
-            self.daily_cron_jobs = self.get_daily_cron_jobs()
+    async def run_pipeline(self, pipeline: telegram_task.pipeline.Pipeline) -> bool:
+        """Runs the pipeline, its progress published on telegram"""
+        if not pipeline.publisher:
+            pipeline.publisher = self.__publish_in_place
+        return await pipeline.run(perform=self.perform_job)
+
+    def __catch_up_of(
+        self,
+        job_order: telegram_task.line.CronJobOrder
+        | telegram_task.line.RecurringJobOrder,
+    ) -> telegram_task.scheduler.CatchUpPolicy:
+        """Returns the catch-up policy of the order, falling back on the president's"""
+        return job_order.catch_up if job_order.catch_up else self.catch_up
+
+    def __is_missed(
+        self,
+        job_order: telegram_task.line.CronJobOrder
+        | telegram_task.line.RecurringJobOrder,
+        when: datetime,
+    ) -> bool:
+        """
+        Checks if a run fired later than the grace time is to be skipped,
+        either by policy or because the order has already caught up since then
+        """
+        lateness = (self.clock.now() - when).total_seconds()
+        if lateness <= self.misfire_grace_time:
+            return False
+        match self.__catch_up_of(job_order):
+            case telegram_task.scheduler.CatchUpPolicy.SKIP:
+                missed = True
+            case telegram_task.scheduler.CatchUpPolicy.RUN_ONCE:
+                last_fired = self.__last_fired.get(job_order.job_code)
+                missed = last_fired is not None and last_fired >= when
+            case _:
+                missed = False
+        if missed:
+            self._LOGGER.warning(
+                "Run of job [%s] at [%s] is skipped, %.1f seconds late",
+                job_order.job_code,
+                when,
+                lateness,
+            )
+        else:
             self._LOGGER.info(
-                "Handling [%d] cron jobs for [%s]", len(self.daily_cron_jobs), today
+                "Run of job [%s] at [%s] is caught up, %.1f seconds late",
+                job_order.job_code,
+                when,
+                lateness,
             )
-            self.__telegram_deputy.report_daily_tasks(do_log=True)
-            daily_tasks = [
-                self.__convert_cron_job_to_task(job=x) for x in self.daily_cron_jobs
+        return missed
+
+    def add_cron_job_order(
+        self,
+        line: telegram_task.line.LineManager,
+        cron_job_order: telegram_task.line.CronJobOrder,
+    ) -> None:
+        """Adds a cron job order to a line, scheduling it for today if due"""
+        line.cron_job_orders.append(cron_job_order)
+        if line in self.lines:
+            self.__register_journal_codes(line=line, cron_job_orders=[cron_job_order])
+        now_datetime = self.clock.now()
+        if (
+            self.is_running
+            and now_datetime.weekday() not in cron_job_order.off_days
+            and cron_job_order.daily_run_time > now_datetime.time()
+        ):
+            job = [line, cron_job_order, None]
+            bisect.insort(self.daily_cron_jobs, job, key=lambda x: x[1].daily_run_time)
+            self.__schedule_cron_job(job=job, day=now_datetime.date())
+
+    def remove_cron_job_order(
+        self,
+        line: telegram_task.line.LineManager,
+        cron_job_order: telegram_task.line.CronJobOrder,
+    ) -> None:
+        """Removes a cron job order from a line, cancelling its pending run"""
+        line.cron_job_orders.remove(cron_job_order)
+        self.__used_journal_codes.discard(
+            self.__journal_codes.pop(cron_job_order.job_code, None)
+        )
+        call = self.__cron_calls.pop(cron_job_order.job_code, None)
+        if call:
+            self.scheduler.cancel(call)
+            self.daily_cron_jobs = [
+                x for x in self.daily_cron_jobs if x[1] is not cron_job_order
             ]
-            await asyncio.gather(*daily_tasks)
-            self._LOGGER.info("Cron jobs for [%s] are complete", today)
-            await asyncio.sleep(
-                (
-                    datetime.combine(datetime.now(), time.max) - datetime.now()
-                ).total_seconds()
+
+    def add_recurring_job_order(
+        self,
+        line: telegram_task.line.LineManager,
+        recurring_job_order: telegram_task.line.RecurringJobOrder,
+    ) -> None:
+        """Adds a recurring job order to a line, scheduling its next run"""
+        line.recurring_job_orders.append(recurring_job_order)
+        if self.is_running:
+            self.__schedule_recurring_job(
+                line=line,
+                job_order=recurring_job_order,
+                when=recurring_job_order.recurrence.next_after(self.clock.now()),
             )
-        self._LOGGER.info("Handling cron jobs has been stopped.")
 
-    async def __convert_cron_job_to_task(
+    def remove_recurring_job_order(
         self,
-        job: tuple[
-            telegram_task.line.LineManager, telegram_task.line.CronJobOrder, bool
-        ],
+        line: telegram_task.line.LineManager,
+        recurring_job_order: telegram_task.line.RecurringJobOrder,
     ) -> None:
-        """Convert cron jobs to awaitable tasks"""
-        time_to_sleep = (
-            datetime.combine(datetime.today(), job[1].daily_run_time) - datetime.now()
-        ).total_seconds()
-        if time_to_sleep > 0:
-            await asyncio.sleep(time_to_sleep)
-        job[2] = await job[0].perform_task(
-            job_order=job[1], reporter=self.telegram_report
+        """Removes a recurring job order from a line, cancelling its next run"""
+        line.recurring_job_orders.remove(recurring_job_order)
+        call = self.__recurring_calls.pop(recurring_job_order.job_code, None)
+        if call:
+            self.scheduler.cancel(call)
+
+    def get_recurring_jobs(
+        self,
+    ) -> list[
+        tuple[
+            telegram_task.line.LineManager,
+            telegram_task.line.RecurringJobOrder,
+            datetime,
+        ]
+    ]:
+        """Get recurring jobs with their next fire times"""
+        return sorted(
+            [
+                (x, y, self.__recurring_calls[y.job_code].when)
+                for x in self.lines
+                for y in x.recurring_job_orders
+                if y.job_code in self.__recurring_calls
+            ],
+            key=lambda x: x[2],
         )
 
     def get_daily_cron_jobs(
-        self,
+        self, include_missed: bool = False
     ) -> list[
         tuple[telegram_task.line.LineManager, telegram_task.line.CronJobOrder, bool]
     ]:
-        """Get cron tasks for the rest of the day"""
-        now_datetime = datetime.now()
+        """
+        Get cron tasks for the rest of the day, and if asked to,
+        those missed earlier today which are to be caught up
+        """
+        now_datetime = self.clock.now()
         now_time = now_datetime.time()
+        grace_time = max(
+            now_datetime - timedelta(seconds=self.misfire_grace_time),
+            datetime.combine(now_datetime.date(), time.min),
+        ).time()
         weekday = now_datetime.weekday()
         return sorted(
             [
                 [x, y, None]
                 for x in self.lines
                 for y in x.cron_job_orders
-                if weekday not in y.off_days and y.daily_run_time > now_time
+                if weekday not in y.off_days
+                and (
+                    y.daily_run_time > now_time
+                    or include_missed
+                    and (
+                        y.daily_run_time >= grace_time
+                        or self.__catch_up_of(y)
+                        != telegram_task.scheduler.CatchUpPolicy.SKIP
+                    )
+                )
             ],
             key=lambda x: x[1].daily_run_time,
         )
 
     def add_line(self, *args: telegram_task.line.LineManager) -> None:
-        """Add new line managers to the enterprise"""
-        self.lines.extend(args)
+        """Add new line managers to the enterprise, starting them if it is running"""
+        for line in args:
+            line.shared_limiters.extend(self.limiters)
+            line.scheduler = self.scheduler
+            line.clock = self.clock
+            line.metrics = self.metrics
+            self.__lines_by_name.setdefault(line.display_name, line)
+            telegram_task.schema.schema_of(type(line.worker.default_job_description()))
+            if self.digest_reporter and not line.digest_reporter:
+                line.digest_reporter = self.digest_reporter
+            if self.job_history and not line.job_history:
+                line.job_history = self.job_history
+            self.lines.append(line)
+            self.__register_journal_codes(
+                line=line, cron_job_orders=line.cron_job_orders
+            )
+            if self.__are_lines_started:
+                task = asyncio.ensure_future(
+                    self.__start_added_line(line), loop=self.__operation_loop
+                )
+                self.__line_starts.add(task)
+                task.add_done_callback(self.__line_starts.discard)
+
+    def __register_journal_codes(
+        self,
+        line: telegram_task.line.LineManager,
+        cron_job_orders: list[telegram_task.line.CronJobOrder],
+    ) -> None:
+        """
+        Derives the codes the cron jobs are journaled under from their line
+        and run time, as their own job codes are new on every start
+        """
+        line_index = [
+            x for x in self.lines if x.display_name == line.display_name
+        ].index(line)
+        for cron_job_order in cron_job_orders:
+            for occurrence in itertools.count():
+                journal_code = uuid.uuid5(
+                    _CRON_JOURNAL_NAMESPACE,
+                    f"{line.display_name}/{line_index}/"
+                    + f"{cron_job_order.daily_run_time.isoformat()}/{occurrence}",
+                )
+                if journal_code not in self.__used_journal_codes:
+                    break
+            self.__used_journal_codes.add(journal_code)
+            self.__journal_codes[cron_job_order.job_code] = journal_code
+
+    def get_line(self, display_name: str) -> telegram_task.line.LineManager | None:
+        """Returns the first line added with the given display name"""
+        return self.__lines_by_name.get(display_name)
 
     def telegram_report(self, text: str) -> None:
         """Telegram simple report making"""
@@ -0,0 +1,221 @@
+"""
+Recurrence module holds the rules of recurring jobs,
+each computing its next fire time from the previous one,
+so that a job firing every few minutes costs a single timer.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, tzinfo
+import bisect
+import math
+import zoneinfo
+
+
+# pylint: disable=too-few-public-methods
+class Recurrence(ABC):
+    """Abstract rule of the times a recurring job fires at"""
+
+    @abstractmethod
+    def next_after(self, after: datetime) -> datetime | None:
+        """
+        Returns the first fire time strictly after the given one, or None.
+        Times are naive and in the local time of the host, like the scheduler's.
+        """
+
+
+class IntervalRecurrence(Recurrence):
+    """
+    Fires every fixed interval, counted from the start time.
+    Without a start time, it is counted from the first time it is asked
+    for a fire time, the scheduling time on the president's clock.
+    """
+
+    def __init__(self, interval: timedelta | float, start: datetime = None):
+        self.interval: timedelta = (
+            interval if isinstance(interval, timedelta) else timedelta(seconds=interval)
+        )
+        if self.interval <= timedelta(0):
+            raise ValueError("Interval should be positive.")
+        self.start: datetime = start
+
+    def __str__(self) -> str:
+        return f"every {self.interval}"
+
+    def next_after(self, after: datetime) -> datetime | None:
+        if self.start is None:
+            self.start = after
+        if after < self.start:
+            return self.start
+        return self.start + self.interval * (
+            math.floor((after - self.start) / self.interval) + 1
+        )
+
+
+# pylint: disable=too-many-instance-attributes
+class CronRecurrence(Recurrence):
+    """
+    Fires on the times matching a cron expression, in the given timezone.
+    Both the standard 5 fields (minute hour day month weekday)
+    and 6 fields with seconds first are supported.
+    As in cron, if both days of month and weekdays are restricted,
+    a day matching either of them fires.
+    """
+
+    _MONTHS: list[str] = [
+        "jan",
+        "feb",
+        "mar",
+        "apr",
+        "may",
+        "jun",
+        "jul",
+        "aug",
+        "sep",
+        "oct",
+        "nov",
+        "dec",
+    ]
+    _WEEKDAYS: list[str] = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+    _SEARCH_YEARS: int = 5
+
+    def __init__(self, expression: str, timezone: tzinfo | str = None):
+        self.expression: str = expression
+        self.timezone: tzinfo = (
+            zoneinfo.ZoneInfo(timezone) if isinstance(timezone, str) else timezone
+        )
+        fields = expression.split()
+        if len(fields) == 5:
+            fields = ["0"] + fields
+        if len(fields) != 6:
+            raise ValueError(f"Cron expression should have 5 or 6 fields: {expression}")
+        self.seconds: list[int] = self.__parse_field(fields[0], 0, 59)
+        self.minutes: list[int] = self.__parse_field(fields[1], 0, 59)
+        self.hours: list[int] = self.__parse_field(fields[2], 0, 23)
+        self.days: list[int] = self.__parse_field(fields[3], 1, 31)
+        self.months: list[int] = self.__parse_field(fields[4], 1, 12, self._MONTHS, 1)
+        self.weekdays: list[int] = sorted(
+            {x % 7 for x in self.__parse_field(fields[5], 0, 7, self._WEEKDAYS, 0)}
+        )
+        self.days_restricted: bool = not fields[3].startswith(("*", "?"))
+        self.weekdays_restricted: bool = not fields[5].startswith(("*", "?"))
+
+    def __str__(self) -> str:
+        return f"cron '{self.expression}'" + (
+            f" ({self.timezone})" if self.timezone else ""
+        )
+
+    def next_after(self, after: datetime) -> datetime | None:
+        wall_time = self.__to_zone(after)
+        candidate = self.__next_wall_time(
+            wall_time.replace(microsecond=0) + timedelta(seconds=1)
+        )
+        while candidate:
+            fire_time = self.__from_zone(candidate)
+            if fire_time > after:
+                return fire_time
+            # Wall times repeated when the clocks go back are fired once
+            candidate = self.__next_wall_time(candidate + timedelta(seconds=1))
+        return None
+
+    def __next_wall_time(self, candidate: datetime) -> datetime | None:
+        """Returns the first matching wall time at or after the candidate"""
+        last_year = candidate.year + self._SEARCH_YEARS
+        while candidate.year <= last_year:
+            if candidate.month not in self.months:
+                month = self.__first_at_least(self.months, candidate.month)
+                candidate = (
+                    datetime(candidate.year, month, 1)
+                    if month is not None
+                    else datetime(candidate.year + 1, self.months[0], 1)
+                )
+                continue
+            if not self.__matches_day(candidate):
+                candidate = datetime.combine(
+                    candidate.date() + timedelta(days=1), datetime.min.time()
+                )
+                continue
+            hour = self.__first_at_least(self.hours, candidate.hour)
+            if hour is None:
+                candidate = datetime.combine(
+                    candidate.date() + timedelta(days=1), datetime.min.time()
+                )
+                continue
+            if hour != candidate.hour:
+                candidate = candidate.replace(hour=hour, minute=0, second=0)
+            minute = self.__first_at_least(self.minutes, candidate.minute)
+            if minute is None:
+                candidate = candidate.replace(minute=0, second=0) + timedelta(hours=1)
+                continue
+            if minute != candidate.minute:
+                candidate = candidate.replace(minute=minute, second=0)
+            second = self.__first_at_least(self.seconds, candidate.second)
+            if second is None:
+                candidate = candidate.replace(second=0) + timedelta(minutes=1)
+                continue
+            return candidate.replace(second=second)
+        return None
+
+    def __matches_day(self, candidate: datetime) -> bool:
+        """Checks the day of month and the weekday, the cron way"""
+        day_matches = candidate.day in self.days
+        weekday_matches = (candidate.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_matches or weekday_matches
+        return day_matches and weekday_matches
+
+    def __to_zone(self, local_time: datetime) -> datetime:
+        """Converts the host's local time to the wall time of the timezone"""
+        if not self.timezone:
+            return local_time
+        return local_time.astimezone(self.timezone).replace(tzinfo=None)
+
+    def __from_zone(self, wall_time: datetime) -> datetime:
+        """Converts the wall time of the timezone to the host's local time"""
+        if not self.timezone:
+            return wall_time
+        zoned_time = (
+            self.timezone.localize(wall_time)
+            if hasattr(self.timezone, "localize")
+            else wall_time.replace(tzinfo=self.timezone)
+        )
+        return zoned_time.astimezone().replace(tzinfo=None)
+
+    @staticmethod
+    def __first_at_least(values: list[int], value: int) -> int | None:
+        """Returns the smallest of the sorted values not less than the given one"""
+        index = bisect.bisect_left(values, value)
+        return values[index] if index < len(values) else None
+
+    @staticmethod
+    def __parse_field(
+        text: str, low: int, high: int, names: list[str] = None, offset: int = 0
+    ) -> list[int]:
+        """Parses a cron field made of values, ranges, steps and names"""
+        values = set()
+        for part in text.lower().split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+                if step < 1:
+                    raise ValueError(f"Invalid step in cron field: {text}")
+            if part in ["*", "?"]:
+                start, end = low, high
+            elif "-" in part:
+                start_text, end_text = part.split("-", 1)
+                start = CronRecurrence.__parse_value(start_text, names, offset)
+                end = CronRecurrence.__parse_value(end_text, names, offset)
+            else:
+                start = CronRecurrence.__parse_value(part, names, offset)
+                end = high if step > 1 else start
+            if not low <= start <= end <= high:
+                raise ValueError(f"Cron field out of range: {text}")
+            values.update(range(start, end + 1, step))
+        return sorted(values)
+
+    @staticmethod
+    def __parse_value(text: str, names: list[str] = None, offset: int = 0) -> int:
+        """Parses a single value of a cron field, by number or by name"""
+        if names and text in names:
+            return names.index(text) + offset
+        return int(text)
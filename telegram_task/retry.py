@@ -0,0 +1,57 @@
+"""
+Retry module holds the policies deciding
+whether and when a failed job should be run again.
+"""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+import random
+import time
+
+
+@dataclass
+class RetryBudget:
+    """Caps the number of retries spent in a sliding period of time"""
+
+    max_retries: int
+    period: float = 3600
+    __spent: deque[float] = field(default_factory=deque, init=False, repr=False)
+
+    def try_spend(self) -> bool:
+        """Spends a retry if the budget allows it"""
+        now = time.monotonic()
+        while self.__spent and self.__spent[0] <= now - self.period:
+            self.__spent.popleft()
+        if len(self.__spent) >= self.max_retries:
+            return False
+        self.__spent.append(now)
+        return True
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class RetryPolicy:
+    """
+    RetryPolicy retries failed jobs with exponential backoff and jitter.
+    Only the listed exception types, and timeouts if asked to, are retried.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 1
+    max_delay: float = 300
+    multiplier: float = 2
+    jitter: float = 0.5
+    retry_on: tuple[type[Exception], ...] = (Exception,)
+    retry_on_timeout: bool = True
+    budget: RetryBudget = None
+
+    def is_retryable(self, exception: Exception = None, timed_out: bool = False):
+        """Checks if the failure is of a retryable kind"""
+        if timed_out:
+            return self.retry_on_timeout
+        return exception is not None and isinstance(exception, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """Returns the seconds to wait before the attempt following the given one"""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
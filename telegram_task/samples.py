@@ -4,9 +4,16 @@ are provided in this module
 """
 import asyncio
 import random
+import time
 from dataclasses import dataclass
 from enum import Enum
-from telegram_task.line import JobReport, Worker, JobDescription, TaskException
+from telegram_task.line import (
+    JobReport,
+    Worker,
+    BlockingWorker,
+    JobDescription,
+    TaskException
+)
 
 
 class SleepyWorker(Worker):
@@ -24,6 +31,20 @@ class SleepyWorker(Worker):
         return JobDescription()
 
 
+class BlockingSleepyWorker(BlockingWorker):
+    """Sample blocking worker that sleeps some random seconds"""
+    def perform_blocking_task(self, job_description: JobDescription) -> JobReport:
+        nap_length = random.randint(1, 3)
+        time.sleep(nap_length)
+        return JobReport(
+            information=[f"Nap Length ➡️ {nap_length}"]
+        )
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
 class MathematicalOperation(Enum):
     """
     Enum for 4 basic mathematical operations,
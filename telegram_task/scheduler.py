@@ -0,0 +1,201 @@
+"""
+Scheduler module holds the timer engine used by the president.
+All the timed calls are kept in a single min-heap keyed on their fire time,
+and one driver coroutine sleeps only until the earliest deadline,
+in short chunks checked against the wall clock.
+"""
+
+from __future__ import annotations
+from typing import Callable, Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+import logging
+import heapq
+import itertools
+import asyncio
+import telegram_task.clock
+
+
+class CatchUpPolicy(Enum):
+    """What to do with the runs missed while the scheduler was not firing"""
+
+    SKIP = "skip"
+    RUN_ONCE = "run once"
+    RUN_ALL = "run all"
+
+
+@dataclass
+class SchedulerStats:
+    """Metrics of how late the calls were fired versus their fire time"""
+
+    fired: int = 0
+    last_lateness: float = 0
+    max_lateness: float = 0
+    total_lateness: float = 0
+
+    @property
+    def mean_lateness(self) -> float:
+        """Average seconds a call was fired after its fire time"""
+        return self.total_lateness / self.fired if self.fired else 0
+
+    def record_lateness(self, lateness: float) -> None:
+        """Records the lateness of a call which is being fired"""
+        self.fired += 1
+        self.last_lateness = lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        self.total_lateness += lateness
+
+
+@dataclass(order=True)
+class ScheduledCall:
+    """Handle of a call scheduled to be run by the scheduler at a specific time"""
+
+    when: datetime
+    sequence: int
+    callback: Callable[[], Awaitable[None]] = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+    fired: bool = field(default=False, compare=False)
+    lateness: float = field(default=None, compare=False)
+
+
+# pylint: disable=too-many-instance-attributes
+class Scheduler:
+    """
+    Scheduler keeps the timed calls in a min-heap,
+    inserting and cancelling calls take O(log n) and O(1) respectively.
+    The driver never sleeps longer than max_sleep, so that a suspended host
+    or a stalled loop delays the calls by at most one chunk.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    _LATENESS_WARNING: float = 1
+
+    def __init__(self, max_sleep: float = 1, clock: telegram_task.clock.Clock = None):
+        self.max_sleep: float = max_sleep
+        self.clock: telegram_task.clock.Clock = (
+            clock if clock else telegram_task.clock.SYSTEM_CLOCK
+        )
+        self.stats: SchedulerStats = SchedulerStats()
+        self.__heap: list[ScheduledCall] = []
+        self.__sequence = itertools.count()
+        self.__wake_up: asyncio.Event = None
+        self.__is_running: bool = False
+        self.__cancelled_count: int = 0
+        self.__running_calls: set[asyncio.Task] = set()
+        self.__sleepers: set[asyncio.Future] = set()
+
+    def __len__(self) -> int:
+        return len(self.__heap) - self.__cancelled_count
+
+    @property
+    def is_running(self) -> bool:
+        """Checks if the driver coroutine is firing the calls"""
+        return self.__is_running
+
+    def schedule(
+        self, when: datetime, callback: Callable[[], Awaitable[None]]
+    ) -> ScheduledCall:
+        """Schedules the callback to be awaited at the given time"""
+        call = ScheduledCall(
+            when=when, sequence=next(self.__sequence), callback=callback
+        )
+        heapq.heappush(self.__heap, call)
+        if self.__wake_up and self.__heap[0] is call:
+            self.__wake_up.set()
+        return call
+
+    def cancel(self, call: ScheduledCall) -> None:
+        """Cancels a scheduled call if it has not been fired yet, lazily"""
+        if call.cancelled or call.fired:
+            return
+        call.cancelled = True
+        self.__cancelled_count += 1
+        if self.__cancelled_count > len(self.__heap) // 2:
+            self.__compact()
+
+    def next_fire_time(self) -> datetime | None:
+        """Returns the fire time of the earliest pending call"""
+        self.__discard_cancelled_head()
+        return self.__heap[0].when if self.__heap else None
+
+    async def sleep_until(self, when: datetime) -> None:
+        """Waits until the scheduler fires at the given time, or is stopped"""
+        future = asyncio.get_running_loop().create_future()
+
+        async def wake_up() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        call = self.schedule(when=when, callback=wake_up)
+        self.__sleepers.add(future)
+        try:
+            await future
+        finally:
+            self.__sleepers.discard(future)
+            self.cancel(call)
+
+    async def run(self) -> None:
+        """Driver coroutine, fires the calls as their deadlines arrive"""
+        self._LOGGER.info("Scheduler driver has started.")
+        self.__is_running = True
+        self.__wake_up = asyncio.Event()
+        try:
+            while self.__is_running:
+                self.__wake_up.clear()
+                next_fire_time = self.next_fire_time()
+                if next_fire_time is None:
+                    await self.__wake_up.wait()
+                    continue
+                delay = (next_fire_time - self.clock.now()).total_seconds()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(
+                            self.__wake_up.wait(), timeout=min(delay, self.max_sleep)
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                self.__fire(heapq.heappop(self.__heap))
+        finally:
+            self.__is_running = False
+        self._LOGGER.info("Scheduler driver has been stopped.")
+
+    def stop(self) -> None:
+        """
+        Stops the driver coroutine, pending calls are kept
+        while those sleeping on the scheduler are woken up early
+        """
+        self.__is_running = False
+        if self.__wake_up:
+            self.__wake_up.set()
+        for future in self.__sleepers:
+            if not future.done():
+                future.set_result(None)
+
+    def __fire(self, call: ScheduledCall) -> None:
+        """Starts the call as a separate task, recording how late it is"""
+        call.fired = True
+        call.lateness = max((self.clock.now() - call.when).total_seconds(), 0)
+        self.stats.record_lateness(call.lateness)
+        if call.lateness > self._LATENESS_WARNING:
+            self._LOGGER.warning(
+                "Call scheduled for [%s] is fired %.1f seconds late",
+                call.when,
+                call.lateness,
+            )
+        task = asyncio.create_task(call.callback())
+        self.__running_calls.add(task)
+        task.add_done_callback(self.__running_calls.discard)
+
+    def __discard_cancelled_head(self) -> None:
+        """Pops the cancelled calls sitting on top of the heap"""
+        while self.__heap and self.__heap[0].cancelled:
+            heapq.heappop(self.__heap)
+            self.__cancelled_count -= 1
+
+    def __compact(self) -> None:
+        """Rebuilds the heap when cancelled calls make up most of it"""
+        self.__heap = [x for x in self.__heap if not x.cancelled]
+        heapq.heapify(self.__heap)
+        self.__cancelled_count = 0
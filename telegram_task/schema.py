@@ -0,0 +1,174 @@
+"""
+Schema module holds the precompiled schemas of job descriptions,
+used for rendering the new job panels and parsing the admin's input
+without any reflection on each update.
+"""
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Union,
+    get_type_hints,
+    get_origin,
+    get_args,
+)
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import datetime, date
+from enum import Enum
+import functools
+import json
+import types
+import uuid
+import telegram_task.line
+
+if TYPE_CHECKING:
+    import telegram
+
+_NONE_VALUES = ["none", "null"]
+
+
+@dataclass(frozen=True)
+class FieldSchema:
+    """Name, type and converter of a single job description field"""
+
+    name: str
+    type: Any
+    type_name: str
+    converter: Callable[[str], Any]
+    button_text: str
+    query_template: str
+
+
+@dataclass(frozen=True)
+class JobDescriptionSchema:
+    """Precompiled fields of a job description class"""
+
+    description_type: type
+    fields: dict[str, FieldSchema]
+
+    def convert(self, field_name: str, raw_val: str) -> Any:
+        """Converts the admin's input for the given field, KeyError if unknown"""
+        return self.fields[field_name].converter(raw_val)
+
+    def render(self, job_description: telegram_task.line.JobDescription) -> str:
+        """Returns the fields of the job description, one per line"""
+        return "\n".join(
+            [
+                f"<b>{x.name}</b> ({x.type_name}) ➡️  {getattr(job_description, x.name)}"
+                for x in self.fields.values()
+            ]
+        )
+
+    def keyboard_rows(
+        self, job_code: uuid.UUID
+    ) -> list[list[telegram.InlineKeyboardButton]]:
+        """Returns a row with an edit button for each field"""
+        # pylint: disable=import-outside-toplevel,redefined-outer-name
+        # Importing telegram only once a panel is rendered
+        import telegram
+
+        return [
+            [
+                telegram.InlineKeyboardButton(
+                    text=x.button_text,
+                    switch_inline_query_current_chat=x.query_template.format(
+                        job_code=job_code
+                    ),
+                )
+            ]
+            for x in self.fields.values()
+        ]
+
+
+@functools.cache
+def schema_of(description_type: type) -> JobDescriptionSchema:
+    """Returns the schema of the job description class, built once"""
+    type_hints = get_type_hints(description_type)
+    names = (
+        [x.name for x in fields(description_type)]
+        if is_dataclass(description_type)
+        else list(type_hints)
+    )
+    return JobDescriptionSchema(
+        description_type=description_type,
+        fields={
+            name: FieldSchema(
+                name=name,
+                type=type_hints[name],
+                type_name=_type_name(type_hints[name]),
+                converter=_converter_of(type_hints[name]),
+                button_text=f"{name} ✏️",
+                query_template=f"SpecificNewJobPanelUpdate {name} "
+                + "on job {job_code} : ",
+            )
+            for name in names
+        },
+    )
+
+
+def _type_name(to_type: Any) -> str:
+    """Returns a readable name of the type"""
+    inner_type = _optional_inner_type(to_type)
+    if inner_type is not None:
+        return f"{_type_name(inner_type)}?"
+    return getattr(to_type, "__name__", str(to_type))
+
+
+def _optional_inner_type(to_type: Any) -> Any:
+    """Returns X if the type is Optional[X], otherwise None"""
+    if get_origin(to_type) in [Union, types.UnionType]:
+        args = [x for x in get_args(to_type) if x is not types.NoneType]
+        if len(args) == 1 and len(get_args(to_type)) == 2:
+            return args[0]
+    return None
+
+
+# pylint: disable=too-many-return-statements
+def _converter_of(to_type: Any) -> Callable[[str], Any]:
+    """Builds the converter from string to the given type"""
+    inner_type = _optional_inner_type(to_type)
+    if inner_type is not None:
+        inner_converter = _converter_of(inner_type)
+        return lambda raw_val: (
+            None if raw_val.lower() in _NONE_VALUES else inner_converter(raw_val)
+        )
+    if to_type in [int, float, str]:
+        return to_type
+    if to_type is bool:
+        return lambda raw_val: raw_val.lower() in ["true", "1", "y"]
+    if to_type is date:
+        return lambda raw_val: datetime.strptime(raw_val, "%Y-%m-%d").date()
+    if to_type is datetime:
+        return lambda raw_val: datetime.strptime(raw_val, "%Y-%m-%d %H:%M:%S")
+    if isinstance(to_type, type) and issubclass(to_type, Enum):
+        return lambda raw_val: to_type[raw_val]
+    if isinstance(to_type, type) and is_dataclass(to_type):
+        return lambda raw_val: _convert_dataclass(to_type, raw_val)
+    return _unsupported
+
+
+def _convert_dataclass(to_type: type, raw_val: str) -> Any:
+    """Converts a JSON object to the nested dataclass, field by field"""
+    values = json.loads(raw_val)
+    if not isinstance(values, dict):
+        raise ValueError
+    schema = schema_of(to_type)
+    return to_type(
+        **{
+            key: schema.convert(
+                key,
+                val
+                if isinstance(val, str)
+                else json.dumps(val)
+                if isinstance(val, (dict, list))
+                else str(val),
+            )
+            for key, val in values.items()
+        }
+    )
+
+
+def _unsupported(_: str) -> Any:
+    """Converter of the types which can not be parsed from the admin's input"""
+    raise ValueError
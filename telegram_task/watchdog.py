@@ -0,0 +1,214 @@
+"""
+Watchdog module holds the monitor of the event loop, which samples
+how late the loop wakes up and catches the code blocking it.
+A thread watches the loop's heartbeat, and once the loop is stuck
+it takes the loop's stack, finding the job which is running on it.
+"""
+from __future__ import annotations
+from typing import Callable, Iterable
+from collections import Counter, deque
+from dataclasses import dataclass
+from types import FrameType
+import logging
+import asyncio
+import html
+import sys
+import threading
+import time
+import traceback
+import uuid
+import telegram_task.metrics
+
+
+@dataclass
+class Stall:
+    """A period the event loop was blocked for, and who blocked it"""
+
+    blocked_for: float
+    stack: str
+    line: str = None
+    job_code: uuid.UUID = None
+
+    @property
+    def culprit(self) -> str:
+        """The job which was running when the loop got stuck, if any"""
+        if self.line:
+            return f"job [{self.job_code}] of line [{self.line}]"
+        return "code outside the jobs"
+
+
+@dataclass
+class LoopStats:
+    """Metrics of how late the event loop has woken up"""
+
+    samples: int = 0
+    last_lag: float = 0
+    max_lag: float = 0
+    stalls: int = 0
+
+    def record_lag(self, lag: float) -> None:
+        """Records the lag of a single wake up"""
+        self.samples += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+
+# pylint: disable=too-many-instance-attributes
+class LoopMonitor:
+    """
+    LoopMonitor wakes up every interval to measure the loop's lag.
+    Its watchdog thread flags the loop as stalled once a wake up is late
+    by more than the stall threshold, attributing the stall to the job
+    whose task is on the loop's stack. Alerts on the same line are sent
+    at most once per alert interval, counting the ones held back.
+    """
+
+    _LOGGER: logging.Logger = logging.getLogger(__name__)
+    MAX_STACK_LENGTH: int = 3000
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        stall_threshold: float = 1,
+        interval: float = 0.25,
+        alert_interval: float = 300,
+        alert: Callable[[str], None] = None,
+        jobs: Callable[[], Iterable[tuple[str, uuid.UUID, asyncio.Task]]] = None,
+        metrics: telegram_task.metrics.MetricsRegistry = None,
+    ):
+        self.stall_threshold: float = stall_threshold
+        self.interval: float = interval
+        self.alert_interval: float = alert_interval
+        self.alert: Callable[[str], None] = alert
+        self.jobs: Callable[[], Iterable[tuple[str, uuid.UUID, asyncio.Task]]] = jobs
+        self.metrics: telegram_task.metrics.MetricsRegistry = (
+            metrics if metrics else telegram_task.metrics.REGISTRY
+        )
+        self.stats: LoopStats = LoopStats()
+        self.stalls: deque[Stall] = deque(maxlen=100)
+        self.__heartbeat: float = None
+        self.__flagged_heartbeat: float = None
+        self.__loop: asyncio.AbstractEventLoop = None
+        self.__loop_thread_id: int = None
+        self.__stopping: threading.Event = threading.Event()
+        self.__last_alerts: dict[str, float] = {}
+        self.__held_alerts: Counter[str] = Counter()
+        self.__is_running: bool = False
+
+    async def run(self) -> None:
+        """Sampler coroutine, beating the heartbeat the watchdog checks"""
+        self._LOGGER.info("Event loop monitor has started.")
+        self.__loop = asyncio.get_running_loop()
+        self.__loop_thread_id = threading.get_ident()
+        self.__heartbeat = time.monotonic()
+        self.__stopping.clear()
+        self.__is_running = True
+        watchdog = threading.Thread(
+            target=self.__watch, name="LoopWatchdog", daemon=True
+        )
+        watchdog.start()
+        lag = self.metrics.histogram(
+            "telegram_task_event_loop_lag_seconds",
+            "Seconds the event loop wakes up later than asked to",
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60),
+        ).labels()
+        try:
+            while self.__is_running:
+                expected_at = self.__loop.time() + self.interval
+                await asyncio.sleep(self.interval)
+                self.__heartbeat = time.monotonic()
+                self.stats.record_lag(max(self.__loop.time() - expected_at, 0))
+                lag.observe(self.stats.last_lag)
+        finally:
+            self.__is_running = False
+            self.__stopping.set()
+            watchdog.join()
+        self._LOGGER.info("Event loop monitor has been stopped.")
+
+    def stop(self) -> None:
+        """Stops the sampler coroutine and its watchdog"""
+        self.__is_running = False
+
+    def __watch(self) -> None:
+        """Watchdog thread, takes the loop's stack once its heartbeat is late"""
+        check_interval = min(self.interval, self.stall_threshold) / 2
+        while not self.__stopping.wait(check_interval):
+            heartbeat = self.__heartbeat
+            if (
+                heartbeat == self.__flagged_heartbeat
+                or time.monotonic() - heartbeat < self.interval + self.stall_threshold
+            ):
+                continue
+            self.__flagged_heartbeat = heartbeat
+            # pylint: disable=protected-access
+            frame = sys._current_frames().get(self.__loop_thread_id)
+            if frame is None:
+                continue
+            line, job_code = self.__running_job(frame)
+            stall = Stall(
+                blocked_for=time.monotonic() - heartbeat - self.interval,
+                stack="".join(traceback.format_stack(frame)),
+                line=line,
+                job_code=job_code,
+            )
+            del frame
+            self.__loop.call_soon_threadsafe(self.__handle_stall, stall, heartbeat)
+
+    def __running_job(self, frame: FrameType) -> tuple[str, uuid.UUID]:
+        """Finds the job whose task is on the stack of the blocked loop"""
+        if not self.jobs:
+            return None, None
+        frames = set()
+        while frame:
+            frames.add(id(frame))
+            frame = frame.f_back
+        try:
+            for line, job_code, task in list(self.jobs()):
+                coroutine = task.get_coro()
+                if coroutine.cr_frame and id(coroutine.cr_frame) in frames:
+                    return line, job_code
+        # The loop may have moved on, changing the jobs while they are read
+        except RuntimeError:
+            pass
+        return None, None
+
+    def __handle_stall(self, stall: Stall, heartbeat: float) -> None:
+        """Logs and alerts on the stall, once the loop has got going again"""
+        stall.blocked_for = max(
+            stall.blocked_for, time.monotonic() - heartbeat - self.interval
+        )
+        self.stats.stalls += 1
+        self.stalls.append(stall)
+        self.metrics.counter(
+            "telegram_task_event_loop_stalls_total",
+            "Times the event loop got blocked, by the line running then",
+            ("line",),
+        ).labels(stall.line if stall.line else "").inc()
+        self._LOGGER.warning(
+            "Event loop was blocked for %.1f seconds by %s at:\n%s",
+            stall.blocked_for,
+            stall.culprit,
+            stall.stack,
+        )
+        if not self.alert:
+            return
+        key = stall.line if stall.line else ""
+        now = time.monotonic()
+        if (
+            now - self.__last_alerts.get(key, -self.alert_interval)
+            < self.alert_interval
+        ):
+            self.__held_alerts[key] += 1
+            return
+        self.__last_alerts[key] = now
+        held_count = self.__held_alerts.pop(key, 0)
+        self.alert(
+            f"🐢 Event loop was blocked for {stall.blocked_for:.1f} seconds "
+            + f"by {html.escape(stall.culprit)}"
+            + (
+                f"\n{held_count} more stalls were not alerted since the last one."
+                if held_count
+                else ""
+            )
+            + f"\n<pre>{html.escape(stall.stack[-self.MAX_STACK_LENGTH:])}</pre>"
+        )
@@ -0,0 +1,24 @@
+"""Fixtures shared by the tests of running operations"""
+from telegram_task.line import LineManager, RecurringJobOrder
+from telegram_task.recurrence import IntervalRecurrence
+from telegram_task.samples import (
+    CalculatorWorker,
+    CalculatorJobDescription,
+    MathematicalOperation,
+)
+
+
+def recurring_calculator_line(interval: float = 0.1, **kwargs) -> LineManager:
+    """Returns a calculator line multiplying 2 by 3 every interval"""
+    return LineManager(
+        worker=CalculatorWorker(),
+        recurring_job_orders=[
+            RecurringJobOrder(
+                recurrence=IntervalRecurrence(interval=interval),
+                job_description=CalculatorJobDescription(
+                    input1=2, input2=3, operation=MathematicalOperation.MUL
+                ),
+            )
+        ],
+        **kwargs,
+    )
@@ -0,0 +1,97 @@
+"""Testing concurrency limits on lines and the enterprise"""
+import unittest
+import asyncio
+from telegram_task.admission import ConcurrencyLimiter, AdmissionRejected
+from telegram_task.line import (
+    LineManager,
+    JobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+)
+from telegram_task.president import President
+
+
+class CountingWorker(Worker):
+    """Worker that keeps track of its peak concurrency"""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def perform_task(self, job_description: JobDescription) -> JobReport:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
+class TestAdmission(unittest.IsolatedAsyncioTestCase):
+    """Test limiters, on their own and on lines"""
+
+    async def test_limiter_queue_full(self):
+        """Jobs beyond the queue size are rejected"""
+        limiter = ConcurrencyLimiter(capacity=1, max_queue_size=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.queue_depth, 1)
+        with self.assertRaises(AdmissionRejected):
+            await limiter.acquire()
+        limiter.release()
+        await waiter
+        self.assertEqual(limiter.queue_depth, 0)
+        self.assertEqual(limiter.in_use, 1)
+
+    async def test_limiter_weighted(self):
+        """Weighted limiters admit jobs by their weight, in FIFO order"""
+        limiter = ConcurrencyLimiter(capacity=3, weighted=True)
+        await limiter.acquire(2)
+        heavy = asyncio.create_task(limiter.acquire(3))
+        light = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.queue_depth, 2)
+        limiter.release(2)
+        await heavy
+        self.assertFalse(light.done())
+        limiter.release(3)
+        await light
+        self.assertEqual(limiter.in_use, 1)
+        with self.assertRaises(AdmissionRejected):
+            await limiter.acquire(4)
+
+    async def test_line_max_concurrency(self):
+        """Jobs on a limited line wait for each other"""
+        worker = CountingWorker()
+        line_manager = LineManager(worker=worker, max_concurrency=2)
+        results = await asyncio.gather(
+            *[line_manager.perform_task(job_order=JobOrder()) for _ in range(6)]
+        )
+        self.assertTrue(all(results))
+        self.assertEqual(worker.peak, 2)
+        self.assertEqual(line_manager.limiter.in_use, 0)
+
+    async def test_president_max_concurrency(self):
+        """President's limit is shared between its lines"""
+        worker1, worker2 = CountingWorker(), CountingWorker()
+        president = President(max_concurrency=1, max_queue_size=2)
+        line_manager1 = LineManager(worker=worker1)
+        line_manager2 = LineManager(worker=worker2)
+        president.add_line(line_manager1, line_manager2)
+        results = await asyncio.gather(
+            line_manager1.perform_task(job_order=JobOrder()),
+            line_manager2.perform_task(job_order=JobOrder()),
+            line_manager1.perform_task(job_order=JobOrder()),
+            line_manager2.perform_task(job_order=JobOrder()),
+        )
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(worker1.peak + worker2.peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
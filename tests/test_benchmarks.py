@@ -0,0 +1,73 @@
+"""Testing the benchmark runner"""
+import unittest
+import json
+import pathlib
+import tempfile
+from benchmarks.cases import Metric
+from benchmarks.run import compare, main
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test the benchmarks run, and their regressions are caught"""
+
+    def test_compare(self):
+        """Changes are speed-ups, whichever way a metric is better"""
+        baseline = {
+            "metrics": {
+                "duration": {"value": 2.0},
+                "throughput": {"value": 100.0},
+            }
+        }
+        changes = compare(
+            {
+                "duration": Metric(value=4.0, unit="s"),
+                "throughput": Metric(
+                    value=150.0, unit="updates/s", higher_is_better=True
+                ),
+                "new": Metric(value=1.0, unit="s"),
+            },
+            baseline,
+        )
+        self.assertEqual(changes, {"duration": -0.5, "throughput": 0.5})
+
+    def test_quick_run_against_baseline(self):
+        """Every case runs, results are written and regressions fail the run"""
+        with tempfile.TemporaryDirectory() as directory:
+            output = pathlib.Path(directory) / "results.json"
+            baseline = pathlib.Path(directory) / "baseline.json"
+            self.assertEqual(
+                main(["--quick", "--output", str(output), "--baseline", str(baseline)]),
+                0,
+            )
+            results = json.loads(output.read_text())
+            self.assertTrue(results["quick"])
+            self.assertEqual(
+                set(results["metrics"]),
+                {
+                    "import[telegram_task.president]",
+                    "import[telegram_task.deputy]",
+                    "get_daily_cron_jobs[1000]",
+                    "plan_day[1000]",
+                    "perform_task.overhead",
+                    "telegram_listener.throughput",
+                    "telegram_report.throughput",
+                },
+            )
+            results["metrics"]["perform_task.overhead"]["value"] /= 10
+            baseline.write_text(json.dumps(results))
+            self.assertEqual(
+                main(
+                    [
+                        "--quick",
+                        "--case",
+                        "perform_task",
+                        "--baseline",
+                        str(baseline),
+                    ]
+                ),
+                1,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Testing the virtual time replay of schedules"""
+import unittest
+import asyncio
+import time
+from datetime import datetime, time as daytime, timedelta
+from telegram_task.clock import VirtualTimeEventLoop
+from telegram_task.line import (
+    LineManager,
+    CronJobOrder,
+    RecurringJobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+)
+from telegram_task.president import President
+from telegram_task.recurrence import IntervalRecurrence
+
+
+class StampingWorker(Worker):
+    """Worker which records the time each of its jobs starts at"""
+
+    def __init__(self, clock=None, duration: float = 60):
+        self.clock = clock
+        self.duration: float = duration
+        self.started_at: list[datetime] = []
+
+    async def perform_task(self, job_description) -> JobReport:
+        self.started_at.append(self.clock.now())
+        await asyncio.sleep(self.duration)
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+class TestVirtualTime(unittest.TestCase):
+    """Test replaying days of schedules in virtual time"""
+
+    def setUp(self):
+        self.loop = VirtualTimeEventLoop(start=datetime(2023, 1, 2, 0, 0, 30))
+        self.addCleanup(self.loop.close)
+
+    def test_sleeps_take_no_real_time(self):
+        """Timers jump the virtual clock, the work done in between does not"""
+
+        async def sleep_for_a_week() -> None:
+            for _ in range(7 * 24):
+                await asyncio.sleep(3600)
+            await asyncio.to_thread(time.sleep, 0.01)
+
+        start = time.monotonic()
+        self.loop.run_until_complete(sleep_for_a_week())
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(
+            self.loop.clock.now().replace(microsecond=0), datetime(2023, 1, 9, 0, 0, 30)
+        )
+
+    def test_replay_days_of_crons(self):
+        """Crons and recurring jobs of two days fire on time, in seconds"""
+        clock = self.loop.clock
+        worker = StampingWorker(clock=clock)
+        line_manager = LineManager(
+            worker=worker,
+            cron_job_orders=[
+                CronJobOrder(daily_run_time=daytime(hour=x)) for x in range(1, 24)
+            ],
+            recurring_job_orders=[
+                RecurringJobOrder(
+                    recurrence=IntervalRecurrence(
+                        interval=timedelta(hours=6), start=datetime(2023, 1, 2, 3)
+                    )
+                )
+            ],
+        )
+        president = President(clock=clock)
+        president.scheduler.max_sleep = 3600
+        president.add_line(line_manager)
+        start = time.monotonic()
+        self.loop.run_until_complete(
+            president.start_operation_async(lifespan=2 * 24 * 3600)
+        )
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(len(worker.started_at), 2 * 23 + 8)
+        self.assertEqual(worker.started_at[0], datetime(2023, 1, 2, 1))
+        self.assertEqual(worker.started_at[-1], datetime(2023, 1, 3, 23))
+        self.assertLess(president.scheduler.stats.max_lateness, 0.001)
+        self.assertEqual(line_manager.peak_running_jobs_count, 2)
+
+    def test_replay_interval_jobs_without_start(self):
+        """Interval jobs count from the virtual time they are scheduled at"""
+        worker = StampingWorker(clock=self.loop.clock, duration=1)
+        line_manager = LineManager(
+            worker=worker,
+            recurring_job_orders=[
+                RecurringJobOrder(
+                    recurrence=IntervalRecurrence(interval=timedelta(hours=1))
+                )
+            ],
+        )
+        president = President(clock=self.loop.clock)
+        president.scheduler.max_sleep = 3600
+        president.add_line(line_manager)
+        self.loop.run_until_complete(
+            president.start_operation_async(lifespan=24 * 3600 - 60)
+        )
+        self.assertEqual(len(worker.started_at), 23)
+        self.assertEqual(
+            worker.started_at[0].replace(microsecond=0), datetime(2023, 1, 2, 1, 0, 30)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Testing the digest reporter"""
+import unittest
+from telegram_task.digest import DigestReporter
+from telegram_task.line import LineManager, JobOrder
+from telegram_task.samples import (
+    MathematicalOperation,
+    CalculatorJobDescription,
+    CalculatorWorker,
+)
+
+
+class TestDigest(unittest.IsolatedAsyncioTestCase):
+    """Test aggregation of job notifications into a digest"""
+
+    async def test_digest_edits_single_message(self):
+        """Successes are collapsed, failures are listed and the message is edited"""
+        published: list[tuple[str, int]] = []
+
+        async def publisher(text: str, message_id: int) -> int:
+            published.append((text, message_id))
+            return 1000
+
+        digest_reporter = DigestReporter(interval=1, publisher=publisher)
+        line_manager = LineManager(
+            worker=CalculatorWorker(), digest_reporter=digest_reporter
+        )
+        reports = []
+
+        def reporter(text: str) -> None:
+            reports.append(text)
+
+        for operation in [MathematicalOperation.SUM, MathematicalOperation.POW]:
+            await line_manager.perform_task(
+                job_order=JobOrder(
+                    job_description=CalculatorJobDescription(
+                        input1=1, input2=2, operation=operation
+                    )
+                ),
+                reporter=reporter,
+            )
+        self.assertFalse(reports)
+        await digest_reporter.flush()
+        await line_manager.perform_task(
+            job_order=JobOrder(
+                job_description=CalculatorJobDescription(
+                    input1=1, input2=2, operation=MathematicalOperation.MUL
+                )
+            ),
+            reporter=reporter,
+        )
+        await digest_reporter.flush()
+        await digest_reporter.flush()
+        self.assertEqual(len(published), 2)
+        self.assertIsNone(published[0][1])
+        self.assertEqual(published[1][1], 1000)
+        self.assertIn("✅ 2 done", published[1][0])
+        self.assertIn("❌ 1 failed", published[1][0])
+        self.assertIn("TaskException", published[1][0])
+
+    async def test_digest_overflow(self):
+        """Failures that do not fit move on to a new message"""
+        published: list[tuple[str, int]] = []
+
+        async def publisher(text: str, message_id: int) -> int:
+            published.append((text, message_id))
+            return len(published)
+
+        digest_reporter = DigestReporter(interval=1, publisher=publisher)
+        for i in range(20):
+            digest_reporter.job_failed(
+                line="Line", job_code=i, text="❌" * 500, started=False
+            )
+        await digest_reporter.flush()
+        await digest_reporter.flush()
+        self.assertEqual(len(published), 2)
+        self.assertIsNone(published[1][1])
+        self.assertTrue(
+            all(len(x[0]) <= DigestReporter.MAX_TEXT_LENGTH for x in published)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Testing concurrent dispatch of telegram updates"""
+import unittest
+import asyncio
+import uuid
+from types import SimpleNamespace
+from telegram_task.dispatch import UpdateDispatcher, TimestampedQueue
+from telegram_task.fakebot import FakeBotApi
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
+
+
+def make_update(chat_id: int, text: str) -> SimpleNamespace:
+    """Builds a stand-in for a telegram update"""
+    return SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id), text=text)
+
+
+class TestDispatch(unittest.IsolatedAsyncioTestCase):
+    """Test the update dispatcher"""
+
+    async def test_chats_are_concurrent_and_ordered(self):
+        """Updates of different chats overlap, those of a chat keep their order"""
+        handled: list[str] = []
+
+        async def handler(update: SimpleNamespace) -> None:
+            await asyncio.sleep(0.1 if update.text.endswith("1") else 0.01)
+            handled.append(update.text)
+
+        dispatcher = UpdateDispatcher(handler=handler, max_in_flight=10)
+        for text in ["a1", "a2", "a3"]:
+            await dispatcher.dispatch(make_update(chat_id=1, text=text))
+        await dispatcher.dispatch(make_update(chat_id=2, text="b1"))
+        await dispatcher.dispatch(make_update(chat_id=3, text="c2"))
+        self.assertTrue(await dispatcher.drain(timeout=1))
+        self.assertEqual([x for x in handled if x[0] == "a"], ["a1", "a2", "a3"])
+        self.assertEqual(handled[0], "c2")
+        self.assertEqual(dispatcher.stats.handled, 5)
+        self.assertEqual(dispatcher.stats.peak_in_flight, 5)
+        self.assertGreater(dispatcher.stats.max_lag, 0.1)
+
+    async def test_in_flight_is_bounded(self):
+        """Dispatching waits while too many handlers are in flight"""
+        release = asyncio.Event()
+
+        async def handler(_: SimpleNamespace) -> None:
+            await release.wait()
+
+        dispatcher = UpdateDispatcher(handler=handler, max_in_flight=2)
+        await dispatcher.dispatch(make_update(chat_id=1, text="a"))
+        await dispatcher.dispatch(make_update(chat_id=2, text="b"))
+        third = asyncio.create_task(
+            dispatcher.dispatch(make_update(chat_id=3, text="c"))
+        )
+        await asyncio.sleep(0.05)
+        self.assertFalse(third.done())
+        release.set()
+        await third
+        self.assertTrue(await dispatcher.drain(timeout=1))
+        self.assertEqual(dispatcher.stats.in_flight, 0)
+
+    async def test_panels_of_admin_chat_are_concurrent(self):
+        """Updates all from the admin chat are ordered per panel, not per chat"""
+        fake_api = FakeBotApi()
+        deputy = TelegramDeputy(
+            telegram_app=fake_api.build_application(), telegram_admin_id=42
+        )
+        handled: list[str] = []
+        slow_code, fast_code = uuid.uuid4(), uuid.uuid4()
+
+        async def handler(update) -> None:
+            text = (
+                update.callback_query.data
+                if update.callback_query
+                else update.message.text
+            )
+            await asyncio.sleep(0.3 if text.startswith("@") else 0.01)
+            handled.append(text)
+
+        deputy.update_dispatcher.handler = handler
+        panel_update = (
+            "@fake_bot SpecificNewJobPanelUpdate a " + f"on job {slow_code} : 1"
+        )
+        async with President(telegram_deputy=deputy):
+            fake_api.push_message(panel_update, chat_id=42)
+            fake_api.push_callback_query(
+                f"ExecuteSpecificNewJob,{slow_code}", chat_id=42
+            )
+            fake_api.push_callback_query(
+                f"ExecuteSpecificNewJob,{fast_code}", chat_id=42
+            )
+            fake_api.push_callback_query("RunningJobsPanel", chat_id=42)
+            while deputy.update_dispatcher.stats.handled < 4:
+                await asyncio.sleep(0.01)
+            self.assertTrue(await deputy.update_dispatcher.drain(timeout=1))
+        self.assertEqual(
+            handled,
+            [
+                f"ExecuteSpecificNewJob,{fast_code}",
+                "RunningJobsPanel",
+                panel_update,
+                f"ExecuteSpecificNewJob,{slow_code}",
+            ],
+        )
+
+    async def test_timestamped_queue(self):
+        """Queue hands out items along with the time they were put"""
+        queue = TimestampedQueue()
+        await queue.put("update")
+        received_at, item = await queue.get()
+        self.assertEqual(item, "update")
+        self.assertGreater(received_at, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
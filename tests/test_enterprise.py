@@ -11,10 +11,8 @@ from telegram_task.line import (
     JobOrder,
     CronJobOrder
 )
-from telegram_task.president import (
-    President,
-    TelegramDeputy
-)
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
 from telegram_task.samples import (
     SleepyWorker,
     MathematicalOperation,
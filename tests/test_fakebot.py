@@ -0,0 +1,95 @@
+"""Testing the deputy against the fake Bot API"""
+import unittest
+import asyncio
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.fakebot import FakeBotApi
+from telegram_task.line import LineManager
+from telegram_task.outbox import ReportPipeline
+from telegram_task.president import President
+from telegram_task.samples import CalculatorWorker
+
+ADMIN_ID = 42
+
+
+class TestFakeBotApi(unittest.IsolatedAsyncioTestCase):
+    """Test the deputy talking to telegram with no network"""
+
+    async def asyncSetUp(self):
+        self.fake_api = FakeBotApi(latency=0.01)
+        self.deputy = TelegramDeputy(
+            telegram_app=self.fake_api.build_application(),
+            telegram_admin_id=ADMIN_ID,
+            report_pipeline=ReportPipeline(per_chat_rate=100, per_chat_burst=100),
+        )
+        self.president = President(telegram_deputy=self.deputy)
+        self.president.add_line(LineManager(worker=CalculatorWorker()))
+
+    async def wait_for_messages(self, count: int) -> None:
+        """Waits until the bot has sent the given number of messages"""
+        for _ in range(100):
+            if len(self.fake_api.sent_messages) >= count:
+                return
+            await asyncio.sleep(0.02)
+
+    async def test_conversation(self):
+        """Messages and button presses are polled, answers are sent"""
+        async with self.president:
+            await self.wait_for_messages(1)
+            sent_count = len(self.fake_api.sent_messages)
+            self.fake_api.push_message(".", chat_id=ADMIN_ID)
+            await self.wait_for_messages(sent_count + 1)
+            self.assertIn("How may I help", self.fake_api.sent_messages[-1].text)
+            self.assertIsNotNone(self.fake_api.sent_messages[-1].reply_markup)
+            self.fake_api.push_callback_query("HighFive", chat_id=ADMIN_ID)
+            self.fake_api.push_message(".", chat_id=7)
+            await self.wait_for_messages(sent_count + 3)
+        self.assertEqual(len(self.fake_api.answered_callback_queries), 1)
+        texts = [x.text for x in self.fake_api.sent_messages]
+        self.assertTrue(any("unknown user [7" in x for x in texts))
+        self.assertEqual(self.fake_api.calls["forwardMessage"], 1)
+        self.assertGreater(self.fake_api.calls["getUpdates"], 1)
+
+    async def test_flood_control_and_edits(self):
+        """Flooded requests are retried, digests are edited in place"""
+        deputy = self.deputy
+        async with self.president:
+            await self.wait_for_messages(1)
+            sent_count = len(self.fake_api.sent_messages)
+            self.fake_api.inject_flood(retry_after=0.1, methods=["sendMessage"])
+            deputy.telegram_report(text="Report")
+            await self.wait_for_messages(sent_count + 1)
+            self.assertEqual(self.fake_api.sent_messages[-1].text, "Report")
+            message_id = await deputy.publish_digest(text="Digest 1")
+            self.assertEqual(
+                await deputy.publish_digest(text="Digest 2", message_id=message_id),
+                message_id,
+            )
+            self.assertEqual(
+                await deputy.publish_digest(text="Digest 2", message_id=message_id),
+                message_id,
+            )
+        self.assertEqual(self.fake_api.messages[message_id].text, "Digest 2")
+        self.assertEqual(self.fake_api.messages[message_id].edits_count, 1)
+        self.assertEqual(self.fake_api.calls["sendMessage"], sent_count + 3)
+
+    async def test_answers_and_forwards_are_throttled(self):
+        """Callback answers and forwards go through the pipeline's retries"""
+        async with self.president:
+            await self.wait_for_messages(1)
+            sent_count = len(self.fake_api.sent_messages)
+            self.fake_api.inject_flood(
+                retry_after=0.1,
+                count=2,
+                methods=["answerCallbackQuery", "forwardMessage"],
+            )
+            self.fake_api.push_callback_query("HighFive", chat_id=ADMIN_ID)
+            self.fake_api.push_message(".", chat_id=7)
+            await self.wait_for_messages(sent_count + 2)
+            self.assertTrue(await self.deputy.update_dispatcher.drain(timeout=1))
+        self.assertEqual(len(self.fake_api.answered_callback_queries), 1)
+        self.assertEqual(self.fake_api.calls["forwardMessage"], 2)
+        self.assertEqual(self.fake_api.calls["answerCallbackQuery"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Testing the president running without a telegram deputy"""
+import unittest
+import asyncio
+import subprocess
+import sys
+from telegram_task.history import JobHistory
+from telegram_task.president import President
+from tests.fixtures import recurring_calculator_line
+
+
+class TestHeadless(unittest.IsolatedAsyncioTestCase):
+    """Test the lines and timers running with no telegram at all"""
+
+    def test_telegram_is_imported_lazily(self):
+        """Importing the president leaves the telegram stack unloaded"""
+        code = (
+            "import sys, telegram_task.president as president; "
+            + "print(sorted(x for x in ['telegram', 'pytz'] if x in sys.modules)); "
+            + "president.TelegramDeputy; "
+            + "print('telegram' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.split("\n")
+        self.assertEqual(output[:2], ["[]", "True"])
+
+    async def test_headless_operation(self):
+        """Recurring jobs run and the startup time is measured"""
+        job_history = JobHistory()
+        line_manager = recurring_calculator_line(job_history=job_history)
+        president = President(job_history=job_history)
+        president.scheduler.max_sleep = 0.05
+        president.add_line(line_manager)
+        async with president:
+            self.assertLess(president.startup_duration, 0.5)
+            await asyncio.sleep(0.5)
+        self.assertGreaterEqual(
+            (await job_history.stats(line_manager.display_name)).runs, 3
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Testing the durable job history"""
+import unittest
+import asyncio
+import contextlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from telegram_task.history import JobHistory, JobRun, percentile
+from telegram_task.line import LineManager, JobOrder
+from telegram_task.samples import (
+    CalculatorWorker,
+    CalculatorJobDescription,
+    MathematicalOperation,
+)
+
+
+def sample_run(line: str, seconds: float, outcome: str = "SUCCESS") -> JobRun:
+    """Returns a run of the given duration which has just finished"""
+    finished_at = datetime.now()
+    return JobRun(
+        job_code=uuid.uuid4(),
+        line=line,
+        started_at=finished_at - timedelta(seconds=seconds),
+        finished_at=finished_at,
+        outcome=outcome,
+    )
+
+
+class TestHistory(unittest.TestCase):
+    """Test storing, querying and summarizing job runs"""
+
+    def test_percentile(self):
+        """Nearest rank percentiles"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([3], 0.95), 3)
+        self.assertEqual(percentile([], 0.5), 0)
+
+    def test_batched_inserts_and_query(self):
+        """Runs are inserted in batches and queried by line"""
+        job_history = JobHistory(batch_size=3)
+        for i in range(4):
+            job_history.record(sample_run(line=f"L{i % 2}", seconds=i))
+        self.assertEqual(job_history.flush(), 1)
+        self.assertEqual(len(job_history.query()), 4)
+        runs = job_history.query(line="L1")
+        self.assertEqual(len(runs), 2)
+        self.assertTrue(all(x.line == "L1" for x in runs))
+        self.assertEqual(
+            len(job_history.query(since=datetime.now() + timedelta(hours=1))), 0
+        )
+        job_history.close()
+
+    def test_stats(self):
+        """Stats come from the rolling window of the line"""
+        job_history = JobHistory(window=10)
+        for i in range(20):
+            job_history.record(
+                sample_run(
+                    line="L", seconds=i, outcome="TIMEOUT" if i < 15 else "SUCCESS"
+                )
+            )
+        stats = asyncio.run(job_history.stats("L"))
+        self.assertEqual(stats.runs, 10)
+        self.assertAlmostEqual(stats.failure_rate, 0.5)
+        self.assertAlmostEqual(stats.p50, 14, places=1)
+        self.assertAlmostEqual(stats.p99, 19, places=1)
+        self.assertEqual(asyncio.run(job_history.stats("M")).runs, 0)
+        job_history.close()
+
+    def test_full_batch_is_flushed_off_the_loop(self):
+        """A full batch recorded on the loop is inserted later, on a thread"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "history.db")
+        job_history = JobHistory(path=path, batch_size=3)
+
+        def stored_count() -> int:
+            with contextlib.closing(sqlite3.connect(path)) as connection:
+                return connection.execute("SELECT COUNT(*) FROM job_runs").fetchone()[0]
+
+        async def record_all():
+            for i in range(3):
+                job_history.record(sample_run(line="L", seconds=i))
+            self.assertEqual(stored_count(), 0)
+            await job_history.drain()
+            self.assertEqual(stored_count(), 3)
+
+        asyncio.run(record_all())
+        job_history.close()
+
+    def test_durable(self):
+        """Runs survive reopening the database"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.db")
+            job_history = JobHistory(path=path)
+            job_history.record(sample_run(line="L", seconds=2, outcome="SUCCESS"))
+            job_history.close()
+            job_history = JobHistory(path=path, batch_size=1)
+            job_history.record(sample_run(line="L", seconds=1, outcome="SUCCESS"))
+            self.assertEqual(asyncio.run(job_history.stats("L")).runs, 2)
+            self.assertEqual(len(job_history.query(line="L")), 2)
+            job_history.close()
+
+    def test_line_records_runs(self):
+        """Lines record the outcome of each job they perform"""
+        job_history = JobHistory()
+        line_manager = LineManager(worker=CalculatorWorker(), job_history=job_history)
+        for operation in ["MUL", "DIV"]:
+            asyncio.run(
+                line_manager.perform_task(
+                    JobOrder(
+                        job_description=CalculatorJobDescription(
+                            input1=1,
+                            input2=0,
+                            operation=MathematicalOperation[operation],
+                        )
+                    )
+                )
+            )
+        runs = job_history.query(line=line_manager.display_name)
+        self.assertEqual(len(runs), 2)
+        self.assertEqual(
+            asyncio.run(job_history.stats(line_manager.display_name)).failure_rate, 0.5
+        )
+        job_history.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
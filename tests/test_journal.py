@@ -0,0 +1,215 @@
+"""Testing the durable job journal"""
+import unittest
+import asyncio
+import contextlib
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, time, timedelta
+from telegram_task.journal import JobJournal
+from telegram_task.line import (
+    LineManager,
+    JobOrder,
+    CronJobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+)
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
+from telegram_task.samples import (
+    CalculatorWorker,
+    CalculatorJobDescription,
+    MathematicalOperation,
+)
+
+
+def sample_job_order() -> JobOrder:
+    """Returns a calculator job order"""
+    return JobOrder(
+        job_description=CalculatorJobDescription(
+            input1=2, input2=3, operation=MathematicalOperation.SUM
+        )
+    )
+
+
+class CountingWorker(Worker):
+    """Worker counting the jobs it has started, taking the delay on each"""
+
+    started: int = 0
+
+    def __init__(self, delay: float = 0):
+        self.delay: float = delay
+
+    async def perform_task(self, job_description: JobDescription) -> JobReport:
+        CountingWorker.started += 1
+        await asyncio.sleep(self.delay)
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
+class TestJournal(unittest.TestCase):
+    """Test enqueueing, acknowledging and replaying jobs"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "journal.db")
+
+    def test_group_commit(self):
+        """Concurrent enqueues share commits"""
+        job_journal = JobJournal(path=self.path)
+
+        async def enqueue_all():
+            await asyncio.gather(
+                *[
+                    job_journal.enqueue(line="L", job_order=sample_job_order())
+                    for _ in range(50)
+                ]
+            )
+
+        asyncio.run(enqueue_all())
+        self.assertEqual(len(job_journal.unfinished()), 50)
+        self.assertLess(job_journal.commit_count, 50)
+        job_journal.close()
+
+    def test_acknowledge_and_reopen(self):
+        """Only unacknowledged jobs are found after reopening"""
+        job_journal = JobJournal(path=self.path)
+        job_orders = [sample_job_order() for _ in range(3)]
+
+        async def enqueue_all():
+            for job_order in job_orders:
+                await job_journal.enqueue(line="L", job_order=job_order, slot="S")
+            job_journal.acknowledge(job_code=job_orders[0].job_code, slot="S")
+
+        asyncio.run(enqueue_all())
+        job_journal.close()
+        job_journal = JobJournal(path=self.path)
+        entries = job_journal.unfinished()
+        self.assertEqual(
+            [x.job_code for x in entries], [x.job_code for x in job_orders[1:]]
+        )
+        self.assertEqual(entries[0].job_order.job_description.input2, 3)
+        self.assertTrue(job_journal.slot_status(job_orders[0].job_code, "S"))
+        self.assertFalse(job_journal.slot_status(job_orders[1].job_code, "S"))
+        self.assertIsNone(job_journal.slot_status(job_orders[1].job_code, "T"))
+        job_journal.close()
+
+    def test_finished_entries_are_pruned(self):
+        """Entries finished before today are deleted, the others are kept"""
+        job_journal = JobJournal(path=self.path)
+        job_orders = [sample_job_order() for _ in range(4)]
+
+        async def enqueue_all():
+            for job_order in job_orders:
+                await job_journal.enqueue(line="L", job_order=job_order)
+            for job_order in job_orders[:3]:
+                job_journal.acknowledge(job_code=job_order.job_code)
+            await job_journal.drain()
+            job_journal.prune(before=datetime.now() + timedelta(seconds=1))
+            await job_journal.drain()
+
+        asyncio.run(enqueue_all())
+        self.assertIsNone(job_journal.slot_status(job_orders[0].job_code, ""))
+        self.assertFalse(job_journal.slot_status(job_orders[3].job_code, ""))
+        job_journal.close()
+        job_journal = JobJournal(path=self.path)
+        job_orders = job_orders[3:] + [sample_job_order() for _ in range(2)]
+
+        async def finish_all():
+            for job_order in job_orders[1:]:
+                await job_journal.enqueue(line="L", job_order=job_order)
+            for job_order in job_orders:
+                job_journal.acknowledge(job_code=job_order.job_code)
+            await job_journal.drain()
+
+        asyncio.run(finish_all())
+        job_journal.close()
+        yesterday = (datetime.now() - timedelta(days=1)).timestamp()
+        with contextlib.closing(sqlite3.connect(self.path)) as connection:
+            with connection:
+                connection.execute(
+                    "UPDATE journal_entries SET finished_at = ? WHERE job_code = ?",
+                    (yesterday, str(job_orders[1].job_code)),
+                )
+        job_journal = JobJournal(path=self.path)
+        self.assertTrue(job_journal.slot_status(job_orders[0].job_code, ""))
+        self.assertIsNone(job_journal.slot_status(job_orders[1].job_code, ""))
+        self.assertTrue(job_journal.slot_status(job_orders[2].job_code, ""))
+        job_journal.close()
+
+    def test_president_replays_unfinished_jobs(self):
+        """Unfinished jobs are performed again on startup and acknowledged"""
+        job_journal = JobJournal(path=self.path)
+        job_order = sample_job_order()
+
+        async def enqueue():
+            await job_journal.enqueue(
+                line=CalculatorWorker.__name__, job_order=job_order
+            )
+            await job_journal.enqueue(line="Unknown", job_order=sample_job_order())
+
+        asyncio.run(enqueue())
+        president = President(telegram_deputy=TelegramDeputy(), job_journal=job_journal)
+        president.add_line(LineManager(worker=CalculatorWorker()))
+        asyncio.run(president.start_operation_async(lifespan=1))
+        self.assertEqual(job_journal.unfinished(), [])
+        self.assertTrue(job_journal.slot_status(job_order.job_code, ""))
+        job_journal.close()
+
+    def test_finished_cron_slot_is_skipped(self):
+        """Cron slots finished today are not run again after a restart"""
+        run_time = self.cron_run_time()
+        self.operate(run_time=run_time, lifespan=1)
+        self.assertEqual(CountingWorker.started, 1)
+        president = self.operate(run_time=run_time, lifespan=0.5)
+        self.assertEqual(CountingWorker.started, 1)
+        self.assertEqual(len(president.daily_cron_jobs), 1)
+        self.assertTrue(president.daily_cron_jobs[0][2])
+        self.assertEqual(len(president.scheduler), 1)
+
+    def test_unfinished_cron_slot_is_replayed_once(self):
+        """An unfinished cron slot is replayed instead of being planned again"""
+        run_time = self.cron_run_time()
+        self.operate(run_time=run_time, lifespan=0.6, delay=5)
+        self.assertEqual(CountingWorker.started, 1)
+        president = self.operate(run_time=run_time, lifespan=0.5)
+        self.assertEqual(CountingWorker.started, 2)
+        self.assertEqual(len(president.scheduler), 1)
+        job_journal = JobJournal(path=self.path)
+        self.assertEqual(job_journal.unfinished(), [])
+        job_journal.close()
+
+    def cron_run_time(self) -> time:
+        """Returns a run time shortly from now, resetting the started jobs"""
+        if datetime.now().time() > time(23, 59, 50):
+            self.skipTest("The cron slot would fall on the next day.")
+        CountingWorker.started = 0
+        return (datetime.now() + timedelta(seconds=0.3)).time()
+
+    def operate(self, run_time: time, lifespan: float, delay: float = 0) -> President:
+        """Operates a line built from scratch, as after a restart"""
+        job_journal = JobJournal(path=self.path)
+        president = President(
+            telegram_deputy=TelegramDeputy(),
+            job_journal=job_journal,
+            shutdown_timeout=0.1,
+        )
+        president.add_line(
+            LineManager(
+                worker=CountingWorker(delay=delay),
+                cron_job_orders=[CronJobOrder(daily_run_time=run_time)],
+            )
+        )
+        asyncio.run(president.start_operation_async(lifespan=lifespan))
+        job_journal.close()
+        return president
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,20 @@
 """Testing line managers outside the enterprise"""
 import unittest
-from telegram_task.line import LineManager, TaskException, JobOrder
+import os
+import pickle
+import time
+import asyncio
+from datetime import datetime, timedelta
+from telegram_task.line import (
+    LineManager,
+    TaskException,
+    JobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+    BlockingWorker,
+    ExecutionMode
+)
 from telegram_task.samples import (
     SleepyWorker,
     MathematicalOperation,
@@ -9,6 +23,27 @@ from telegram_task.samples import (
 )
 
 
+class PidWorker(Worker):
+    """Worker reporting the id of the process it is run on"""
+    async def perform_task(self, job_description: JobDescription) -> JobReport:
+        return JobReport(information=[str(os.getpid())])
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
+class BlockingFailingWorker(BlockingWorker):
+    """Blocking worker that raises a task exception after blocking a while"""
+    def perform_blocking_task(self, job_description: JobDescription) -> JobReport:
+        time.sleep(0.2)
+        raise TaskException("Blocking task failed.")
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
 class TestLine(unittest.IsolatedAsyncioTestCase):
     """Test line operations without any president"""
 
@@ -75,6 +110,119 @@ class TestLine(unittest.IsolatedAsyncioTestCase):
                 )))
         self.assertFalse(was_success)
 
+    async def test_line_manager_process_pool(self):
+        """Test a line running its tasks on a warmed up process pool"""
+        lm = LineManager(
+            worker=CalculatorWorker(),
+            execution_mode=ExecutionMode.PROCESS_POOL,
+            process_pool_size=2,
+            warm_up=True
+        )
+        await lm.start()
+        try:
+            was_success = await lm.perform_task(
+                job_order=JobOrder(
+                    job_description=CalculatorJobDescription(
+                        input1=1.6,
+                        input2=2.6,
+                        operation=MathematicalOperation.SUM
+                    )))
+            self.assertTrue(was_success)
+            was_success = await lm.perform_task(
+                job_order=JobOrder(
+                    job_description=CalculatorJobDescription(
+                        input1=1.6,
+                        input2=2.6,
+                        operation=MathematicalOperation.POW
+                    )))
+            self.assertFalse(was_success)
+        finally:
+            lm.shutdown()
+
+    async def test_line_manager_process_pool_pid(self):
+        """Test a line running its tasks outside the main process"""
+        lm = LineManager(
+            worker=PidWorker(),
+            execution_mode=ExecutionMode.PROCESS_POOL,
+            process_pool_size=1
+        )
+        reports = []
+
+        def reporter(text: str) -> None:
+            reports.append(text)
+
+        try:
+            was_success = await lm.perform_task(
+                job_order=JobOrder(),
+                reporter=reporter
+            )
+        finally:
+            lm.shutdown()
+        self.assertTrue(was_success)
+        self.assertFalse(str(os.getpid()) in reports[-1])
+
+    async def test_line_manager_thread_pool(self):
+        """Test a blocking worker not blocking the event loop"""
+        lm = LineManager(worker=BlockingFailingWorker(), thread_pool_size=2)
+        self.assertEqual(lm.execution_mode, ExecutionMode.THREAD_POOL)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            was_success = await lm.perform_task(job_order=JobOrder())
+        finally:
+            ticker_task.cancel()
+            lm.shutdown()
+        self.assertFalse(was_success)
+        self.assertGreater(ticks, 5)
+
+    async def test_line_manager_timeout(self):
+        """Test a job running longer than its timeout"""
+        lm = LineManager(worker=SleepyWorker(), default_timeout=0.1)
+        reports = []
+
+        def reporter(text: str) -> None:
+            reports.append(text)
+
+        was_success = await lm.perform_task(job_order=JobOrder(), reporter=reporter)
+        self.assertFalse(was_success)
+        self.assertTrue("timed out" in reports[-1])
+        self.assertFalse(lm.running_jobs)
+
+    async def test_line_manager_deadline(self):
+        """Test a job whose deadline arrives before its timeout"""
+        lm = LineManager(worker=SleepyWorker(), default_timeout=10)
+        start = datetime.now()
+        was_success = await lm.perform_task(
+            job_order=JobOrder(deadline=datetime.now() + timedelta(seconds=0.1))
+        )
+        self.assertFalse(was_success)
+        self.assertLess((datetime.now() - start).total_seconds(), 1)
+
+    async def test_line_manager_cancel_job(self):
+        """Test cancelling a running job by its job code"""
+        lm = LineManager(worker=SleepyWorker())
+        job_order = JobOrder()
+        job = asyncio.create_task(lm.perform_task(job_order=job_order))
+        await asyncio.sleep(0.1)
+        self.assertTrue(lm.cancel_job(job_order.job_code))
+        self.assertFalse(await job)
+        self.assertFalse(lm.cancel_job(job_order.job_code))
+
+    def test_task_exception_pickling(self):
+        """TaskException keeps its html message when passed between processes"""
+        exception = pickle.loads(pickle.dumps(
+            TaskException("message", html_message="<b>message</b>")
+        ))
+        self.assertEqual(str(exception), "message")
+        self.assertEqual(exception.html_message, "<b>message</b>")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,115 @@
+"""Testing the metrics registry and its Prometheus endpoint"""
+import unittest
+import asyncio
+from telegram_task.line import JobOrder
+from telegram_task.metrics import MetricsRegistry, MetricsServer
+from telegram_task.president import President
+from telegram_task.samples import CalculatorJobDescription, MathematicalOperation
+from tests.fixtures import recurring_calculator_line
+
+
+async def scrape(port: int, path: str = "/metrics") -> tuple[str, str]:
+    """Requests the path from the local server, returns the status and body"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = (await reader.read()).decode()
+    writer.close()
+    head, body = response.split("\r\n\r\n", 1)
+    return head.split("\r\n")[0], body
+
+
+class TestMetrics(unittest.IsolatedAsyncioTestCase):
+    """Test recording the metrics and exposing them"""
+
+    def test_render(self):
+        """Counters, gauges and histograms render in the text format"""
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs", ("line",)).labels('a "b"').inc(2)
+        gauge = registry.gauge("depth", "Depth")
+        gauge.set(3)
+        histogram = registry.histogram("duration_seconds", "Duration", buckets=(1, 5))
+        for value in (0.5, 1, 2, 10):
+            histogram.observe(value)
+        self.assertIs(registry.counter("jobs_total", "Jobs", ("line",)).TYPE, "counter")
+        with self.assertRaises(ValueError):
+            registry.gauge("jobs_total", "Jobs", ("line",))
+        with self.assertRaises(ValueError):
+            registry.counter("jobs_total", "Jobs").inc()
+        self.assertEqual(
+            registry.render().split("\n"),
+            [
+                "# HELP jobs_total Jobs",
+                "# TYPE jobs_total counter",
+                'jobs_total{line="a \\"b\\""} 2',
+                "# HELP depth Depth",
+                "# TYPE depth gauge",
+                "depth 3",
+                "# HELP duration_seconds Duration",
+                "# TYPE duration_seconds histogram",
+                'duration_seconds_bucket{le="1"} 2',
+                'duration_seconds_bucket{le="5"} 3',
+                'duration_seconds_bucket{le="+Inf"} 4',
+                "duration_seconds_sum 13.5",
+                "duration_seconds_count 4",
+                "",
+            ],
+        )
+
+    async def test_server(self):
+        """Metrics are served on /metrics only"""
+        registry = MetricsRegistry()
+        registry.gauge("answer", "Answer").labels().set_function(lambda: 42)
+        server = MetricsServer(registry=registry)
+        await server.start()
+        try:
+            status, body = await scrape(server.port)
+            self.assertEqual(status, "HTTP/1.1 200 OK")
+            self.assertIn("answer 42\n", body)
+            status, _ = await scrape(server.port, "/")
+            self.assertEqual(status, "HTTP/1.1 404 Not Found")
+        finally:
+            await server.stop()
+
+    async def test_operation_metrics(self):
+        """Jobs and crons of an operation are counted and timed"""
+        registry = MetricsRegistry()
+        line_manager = recurring_calculator_line()
+        president = President(metrics=registry, metrics_port=0)
+        president.scheduler.max_sleep = 0.05
+        president.add_line(line_manager)
+        async with president:
+            await line_manager.perform_task(
+                JobOrder(
+                    job_description=CalculatorJobDescription(
+                        input1=1, input2=0, operation=MathematicalOperation.DIV
+                    )
+                )
+            )
+            await asyncio.sleep(0.35)
+            _, body = await scrape(president.metrics_server.port)
+        self.assertIn(
+            'telegram_task_jobs_total{line="CalculatorWorker",outcome="unfamiliar_exception"} 1',
+            body,
+        )
+        self.assertIn('telegram_task_line_queue_depth{line="CalculatorWorker"} 0', body)
+        self.assertIn("telegram_task_scheduled_calls ", body)
+        successes = registry.get("telegram_task_jobs_total").labels(
+            "CalculatorWorker", "success"
+        )
+        durations = registry.get("telegram_task_job_duration_seconds").labels(
+            "CalculatorWorker"
+        )
+        self.assertGreaterEqual(successes.value, 3)
+        self.assertEqual(durations.count, successes.value + 1)
+        self.assertEqual(
+            registry.get("telegram_task_jobs_in_flight")
+            .labels("CalculatorWorker")
+            .get(),
+            0,
+        )
+        self.assertNotIn("telegram_task_line_queue_depth{", registry.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
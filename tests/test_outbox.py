@@ -0,0 +1,87 @@
+"""Testing the outbound telegram message pipeline"""
+import unittest
+import asyncio
+import telegram.error
+from telegram_task.outbox import ReportPipeline, OutboundMessage, TokenBucket
+
+
+# pylint: disable=too-few-public-methods
+class RecordingBot:
+    """Stands in for telegram.Bot, recording the sent messages"""
+
+    def __init__(self, flood_errors: int = 0):
+        self.sent: list[str] = []
+        self.flood_errors = flood_errors
+
+    async def send_message(self, text, **_):
+        """Records the message, raising RetryAfter the first few times"""
+        if self.flood_errors:
+            self.flood_errors -= 1
+            raise telegram.error.RetryAfter(0)
+        self.sent.append(text)
+
+
+class TestOutbox(unittest.IsolatedAsyncioTestCase):
+    """Test rate limiting and coalescing of outbound messages"""
+
+    async def test_messages_are_coalesced(self):
+        """Queued messages are merged into as few messages as possible"""
+        bot = RecordingBot()
+        pipeline = ReportPipeline(bot=bot)
+        for i in range(100):
+            pipeline.submit(OutboundMessage(chat_id=1, text=f"report {i}"))
+        pipeline.submit(OutboundMessage(chat_id=2, text="other chat"))
+        sender = asyncio.create_task(pipeline.run())
+        self.assertTrue(await pipeline.flush(timeout=2))
+        pipeline.stop()
+        await sender
+        self.assertEqual(len(bot.sent), 2)
+        self.assertEqual(len(bot.sent[0].split("\n")), 100)
+
+    async def test_long_messages_are_split(self):
+        """Messages are never longer than the telegram limit"""
+        bot = RecordingBot()
+        pipeline = ReportPipeline(bot=bot, per_chat_rate=100)
+        text = "\n".join(["x" * 100] * 100)
+        pipeline.submit(OutboundMessage(chat_id=1, text=text))
+        sender = asyncio.create_task(pipeline.run())
+        self.assertTrue(await pipeline.flush(timeout=2))
+        pipeline.stop()
+        await sender
+        self.assertEqual(len(bot.sent), 3)
+        self.assertTrue(all(len(x) <= ReportPipeline.MAX_TEXT_LENGTH for x in bot.sent))
+        self.assertEqual("\n".join(bot.sent), text)
+
+    async def test_retry_after(self):
+        """Messages are retried after flood control errors"""
+        bot = RecordingBot(flood_errors=2)
+        pipeline = ReportPipeline(bot=bot, per_chat_rate=100)
+        pipeline.submit(OutboundMessage(chat_id=1, text="report"))
+        sender = asyncio.create_task(pipeline.run())
+        self.assertTrue(await pipeline.flush(timeout=2))
+        pipeline.stop()
+        await sender
+        self.assertEqual(bot.sent, ["report"])
+        self.assertEqual(pipeline.dropped_count, 0)
+
+    async def test_bounded_queue(self):
+        """Messages beyond the queue size are merged into the last one or dropped"""
+        pipeline = ReportPipeline(max_queue_size=2)
+        self.assertTrue(pipeline.submit(OutboundMessage(chat_id=1, text="a")))
+        self.assertTrue(pipeline.submit(OutboundMessage(chat_id=1, text="b")))
+        self.assertTrue(pipeline.submit(OutboundMessage(chat_id=1, text="c")))
+        self.assertFalse(pipeline.submit(OutboundMessage(chat_id=2, text="d")))
+        self.assertEqual(pipeline.queue_depth, 2)
+        self.assertEqual(pipeline.dropped_count, 1)
+
+    def test_token_bucket(self):
+        """Token bucket allows a burst, then asks to wait"""
+        bucket = TokenBucket(rate=1, capacity=2)
+        self.assertEqual(bucket.delay(), 0)
+        bucket.consume()
+        bucket.consume()
+        self.assertGreater(bucket.delay(), 0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
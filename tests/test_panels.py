@@ -0,0 +1,52 @@
+"""Testing the store of new job panels"""
+import unittest
+import time
+from telegram_task.line import LineManager, JobOrder
+from telegram_task.panels import PanelStore, JobPanel
+from telegram_task.president import President
+from telegram_task.samples import SleepyWorker, CalculatorWorker
+
+
+class TestPanels(unittest.TestCase):
+    """Test indexed lookups of panels and lines"""
+
+    def test_panel_store_lru(self):
+        """Least recently used panels are evicted beyond the size limit"""
+        line_manager = LineManager(worker=SleepyWorker())
+        store = PanelStore(max_panels=2)
+        panels = [
+            JobPanel(line=line_manager, job_order=JobOrder(), message=None)
+            for _ in range(3)
+        ]
+        store.put(panels[0])
+        store.put(panels[1])
+        self.assertIs(store.get(panels[0].job_order.job_code), panels[0])
+        store.put(panels[2])
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get(panels[1].job_order.job_code))
+        self.assertIs(store.pop(panels[0].job_order.job_code), panels[0])
+        self.assertEqual(len(store), 1)
+
+    def test_panel_store_ttl(self):
+        """Idle panels are expired"""
+        line_manager = LineManager(worker=SleepyWorker())
+        store = PanelStore(ttl=0.05)
+        panel = JobPanel(line=line_manager, job_order=JobOrder(), message=None)
+        store.put(panel)
+        self.assertIs(store.get(panel.job_order.job_code), panel)
+        time.sleep(0.1)
+        self.assertIsNone(store.get(panel.job_order.job_code))
+        self.assertEqual(len(store), 0)
+
+    def test_president_get_line(self):
+        """Lines are looked up by their display names"""
+        president = President()
+        line_manager1 = LineManager(worker=SleepyWorker())
+        line_manager2 = LineManager(worker=CalculatorWorker())
+        president.add_line(line_manager1, line_manager2)
+        self.assertIs(president.get_line(CalculatorWorker.__name__), line_manager2)
+        self.assertIsNone(president.get_line("Nobody"))
+
+
+if __name__ == "__main__":
+    unittest.main()
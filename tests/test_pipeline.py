@@ -0,0 +1,132 @@
+"""Testing the DAG of jobs"""
+import unittest
+import asyncio
+import time
+from telegram_task.line import LineManager, JobOrder, JobReport, JobDescription, Worker
+from telegram_task.pipeline import Pipeline, StepStatus
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
+from telegram_task.samples import (
+    CalculatorWorker,
+    CalculatorJobDescription,
+    MathematicalOperation,
+)
+
+
+class NapWorker(Worker):
+    """Worker which naps for a fixed while"""
+
+    async def perform_task(self, job_description) -> JobReport:
+        await asyncio.sleep(0.2)
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+def calculator_order(operation: MathematicalOperation) -> JobOrder:
+    """Returns a calculator job order, dividing by zero fails"""
+    return JobOrder(
+        job_description=CalculatorJobDescription(
+            input1=1, input2=0, operation=operation
+        )
+    )
+
+
+class TestPipeline(unittest.IsolatedAsyncioTestCase):
+    """Test running the steps by their dependencies"""
+
+    def test_add_step_validation(self):
+        """Steps depend only on those added before them"""
+        line_manager = LineManager(worker=NapWorker())
+        pipeline = Pipeline(name="P")
+        pipeline.add_step("extract", line_manager)
+        with self.assertRaises(ValueError):
+            pipeline.add_step("extract", line_manager)
+        with self.assertRaises(ValueError):
+            pipeline.add_step("report", line_manager, upstream=["transform"])
+
+    async def test_parallel_branches(self):
+        """Independent branches run in parallel, joins wait for all upstream"""
+        line_manager = LineManager(worker=NapWorker())
+        published = []
+
+        async def publisher(text: str, message_id: int = None) -> int:
+            published.append((text, message_id))
+            return 7
+
+        pipeline = Pipeline(name="P", publisher=publisher)
+        pipeline.add_step("extract", line_manager)
+        pipeline.add_step("left", line_manager, upstream=["extract"])
+        pipeline.add_step("right", line_manager, upstream=["extract"])
+        pipeline.add_step("report", line_manager, upstream=["left", "right"])
+        start = time.monotonic()
+        self.assertTrue(await pipeline.run())
+        self.assertLess(time.monotonic() - start, 0.75)
+        self.assertTrue(
+            all(x.status == StepStatus.SUCCEEDED for x in pipeline.steps.values())
+        )
+        self.assertIsNone(published[0][1])
+        self.assertTrue(all(x[1] == 7 for x in published[1:]))
+        self.assertIn("✅ 4", published[-1][0])
+
+    async def test_failure_skips_downstream_only(self):
+        """A failed step skips its own downstream, other branches go on"""
+        line_manager = LineManager(worker=CalculatorWorker())
+        pipeline = Pipeline(name="P")
+        pipeline.add_step(
+            "extract", line_manager, calculator_order(MathematicalOperation.SUM)
+        )
+        pipeline.add_step(
+            "broken",
+            line_manager,
+            calculator_order(MathematicalOperation.DIV),
+            upstream=["extract"],
+        )
+        pipeline.add_step(
+            "fine",
+            line_manager,
+            calculator_order(MathematicalOperation.MUL),
+            upstream=["extract"],
+        )
+        pipeline.add_step(
+            "after_broken",
+            line_manager,
+            calculator_order(MathematicalOperation.SUM),
+            upstream=["broken"],
+        )
+        pipeline.add_step(
+            "report",
+            line_manager,
+            calculator_order(MathematicalOperation.SUM),
+            upstream=["after_broken", "fine"],
+        )
+        self.assertFalse(await pipeline.run())
+        statuses = {x.name: x.status for x in pipeline.steps.values()}
+        self.assertEqual(
+            statuses,
+            {
+                "extract": StepStatus.SUCCEEDED,
+                "broken": StepStatus.FAILED,
+                "fine": StepStatus.SUCCEEDED,
+                "after_broken": StepStatus.SKIPPED,
+                "report": StepStatus.SKIPPED,
+            },
+        )
+
+    async def test_president_runs_pipeline_under_limits(self):
+        """Steps pass through the concurrency limits of the president"""
+        line_manager = LineManager(worker=NapWorker())
+        president = President(telegram_deputy=TelegramDeputy(), max_concurrency=1)
+        president.add_line(line_manager)
+        pipeline = Pipeline(name="P")
+        pipeline.add_step("left", line_manager)
+        pipeline.add_step("right", line_manager)
+        start = time.monotonic()
+        self.assertTrue(await president.run_pipeline(pipeline))
+        self.assertGreaterEqual(time.monotonic() - start, 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
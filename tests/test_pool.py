@@ -0,0 +1,253 @@
+"""Testing the pools of worker instances"""
+import unittest
+import asyncio
+import time
+from telegram_task.line import (
+    LineManager,
+    JobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+    BlockingWorker,
+)
+from telegram_task.pool import WorkerPool
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
+
+
+class StatefulWorker(Worker):
+    """Worker whose instance is used by one job at a time"""
+
+    instances: list = []
+
+    def __init__(self):
+        self.busy: bool = False
+        self.jobs_count: int = 0
+        StatefulWorker.instances.append(self)
+
+    async def perform_task(self, job_description) -> JobReport:
+        if self.busy:
+            raise RuntimeError("Instance is shared by overlapping jobs.")
+        self.busy = True
+        await asyncio.sleep(0.2)
+        self.busy = False
+        self.jobs_count += 1
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+class StatefulBlockingWorker(BlockingWorker):
+    """Blocking worker whose instance is used by one job at a time"""
+
+    def __init__(self):
+        self.busy: bool = False
+
+    def perform_blocking_task(self, job_description) -> JobReport:
+        if self.busy:
+            raise RuntimeError("Instance is shared by overlapping jobs.")
+        self.busy = True
+        time.sleep(0.3)
+        self.busy = False
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+class TestWorkerPool(unittest.IsolatedAsyncioTestCase):
+    """Test growing, sharing and shrinking the pool"""
+
+    async def test_grow_wait_and_reap(self):
+        """The pool grows up to its max, then jobs wait, idle ones are dropped"""
+        pool = WorkerPool(factory=object, min_size=1, max_size=2, idle_time=0.1)
+        self.assertEqual(pool.size, 0)
+        await pool.start()
+        self.assertEqual(pool.size, 1)
+        first = await pool.acquire()
+        second = await pool.acquire()
+        self.assertIsNot(first, second)
+        self.assertEqual(pool.size, 2)
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        self.assertEqual(pool.queue_depth, 1)
+        pool.release(first)
+        self.assertIs(await waiter, first)
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual((pool.size, pool.busy_count), (2, 0))
+        await asyncio.sleep(0.05)
+        self.assertEqual(pool.reap(), [])
+        await asyncio.sleep(0.1)
+        self.assertEqual((pool.size, pool.peak_size), (1, 2))
+        await pool.close()
+
+    async def test_cancelled_waiter(self):
+        """A cancelled waiter leaves the queue without losing an instance"""
+        pool = WorkerPool(factory=object, min_size=1, max_size=1)
+        await pool.start()
+        worker = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        pool.release(worker)
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual((pool.size, pool.idle_count, pool.queue_depth), (1, 1, 0))
+
+    def test_invalid_sizes(self):
+        """Sizes are validated"""
+        with self.assertRaises(ValueError):
+            WorkerPool(factory=object, min_size=3, max_size=2)
+        with self.assertRaises(ValueError):
+            LineManager()
+
+
+class TestPooledLine(unittest.IsolatedAsyncioTestCase):
+    """Test lines running their jobs on pooled instances"""
+
+    async def test_overlapping_jobs_get_own_instances(self):
+        """Overlapping jobs never share an instance, surplus jobs wait"""
+        StatefulWorker.instances = []
+        line_manager = LineManager(
+            worker_factory=StatefulWorker, min_workers=1, max_workers=3
+        )
+        self.assertEqual(line_manager.display_name, "StatefulWorker")
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *[line_manager.perform_task(job_order=JobOrder()) for _ in range(6)]
+        )
+        self.assertTrue(all(results))
+        self.assertGreaterEqual(time.monotonic() - start, 0.4)
+        self.assertEqual(line_manager.worker_pool.peak_size, 3)
+        self.assertEqual(
+            sum(x.jobs_count for x in StatefulWorker.instances), len(results)
+        )
+
+    async def test_idle_instances_expire_without_jobs(self):
+        """Surplus instances of a quiet line are dropped once they expire"""
+        line_manager = LineManager(
+            worker_factory=StatefulWorker,
+            min_workers=1,
+            max_workers=3,
+            worker_idle_time=0.2,
+        )
+        await line_manager.start()
+        await asyncio.gather(
+            *[line_manager.perform_task(job_order=JobOrder()) for _ in range(3)]
+        )
+        self.assertEqual(line_manager.worker_pool.size, 3)
+        await asyncio.sleep(0.1)
+        self.assertEqual(line_manager.worker_pool.size, 3)
+        await asyncio.sleep(0.2)
+        self.assertEqual(line_manager.worker_pool.size, 1)
+        await line_manager.stop()
+
+    async def test_abandoned_task_keeps_instance(self):
+        """An instance whose task is abandoned on timeout is not handed over"""
+        line_manager = LineManager(
+            worker_factory=StatefulBlockingWorker,
+            max_workers=1,
+            default_timeout=0.1,
+        )
+        self.assertFalse(await line_manager.perform_task(job_order=JobOrder()))
+        self.assertEqual(line_manager.worker_pool.busy_count, 1)
+        line_manager.default_timeout = None
+        self.assertTrue(await line_manager.perform_task(job_order=JobOrder()))
+        self.assertEqual(line_manager.worker_pool.busy_count, 0)
+        line_manager.shutdown()
+
+
+class ConnectedWorker(Worker):
+    """Worker holding a connection opened once, which may break"""
+
+    def __init__(self):
+        self.connections_opened: int = 0
+        self.is_connected: bool = False
+        self.jobs_count: int = 0
+
+    async def setup(self) -> None:
+        await asyncio.sleep(0.2)
+        self.connections_opened += 1
+        self.is_connected = True
+
+    async def teardown(self) -> None:
+        self.is_connected = False
+
+    async def health_check(self) -> bool:
+        return self.is_connected
+
+    async def perform_task(self, job_description) -> JobReport:
+        if not self.is_connected:
+            raise RuntimeError("Not connected.")
+        self.jobs_count += 1
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+class TestWorkerLifecycle(unittest.IsolatedAsyncioTestCase):
+    """Test setting up, checking and tearing down workers"""
+
+    async def test_president_sets_up_and_tears_down(self):
+        """Lines are set up concurrently at start and torn down at the end"""
+        workers = [ConnectedWorker() for _ in range(3)]
+        lines = [LineManager(worker=x) for x in workers]
+        lines.append(LineManager(worker_factory=ConnectedWorker, min_workers=2))
+        president = President(telegram_deputy=TelegramDeputy())
+        president.add_line(*lines)
+        operation = asyncio.create_task(president.start_operation_async(lifespan=0.5))
+        await asyncio.sleep(0.35)
+        self.assertTrue(all(x.is_connected for x in workers))
+        self.assertEqual(lines[-1].worker_pool.size, 2)
+        self.assertTrue(all(x.is_connected for x in lines[-1].worker_pool.workers))
+        for line in lines:
+            self.assertTrue(await line.perform_task(job_order=JobOrder()))
+        await operation
+        self.assertTrue(all(x.connections_opened == 1 for x in workers))
+        self.assertFalse(any(x.is_connected for x in workers))
+
+    async def test_line_added_mid_operation_is_set_up(self):
+        """A line added while operating is set up, and torn down at the end"""
+        worker = ConnectedWorker()
+        async with President(telegram_deputy=TelegramDeputy()) as president:
+            president.add_line(LineManager(worker=worker))
+            pooled_line = LineManager(worker_factory=ConnectedWorker, min_workers=2)
+            president.add_line(pooled_line)
+            await asyncio.sleep(0.3)
+            self.assertTrue(worker.is_connected)
+            pooled_workers = pooled_line.worker_pool.workers
+            self.assertEqual(len(pooled_workers), 2)
+            self.assertTrue(all(x.is_connected for x in pooled_workers))
+        self.assertEqual(worker.connections_opened, 1)
+        self.assertFalse(worker.is_connected)
+        self.assertFalse(any(x.is_connected for x in pooled_workers))
+
+    async def test_health_check_recovers_workers(self):
+        """Unhealthy workers are set up again, or replaced when pooled"""
+        line_manager = LineManager(worker=ConnectedWorker())
+        await line_manager.start()
+        line_manager.worker.is_connected = False
+        self.assertFalse(await line_manager.check_health())
+        self.assertEqual(line_manager.worker.connections_opened, 2)
+        self.assertTrue(await line_manager.check_health())
+
+        pooled_line = LineManager(worker_factory=ConnectedWorker, min_workers=2)
+        await pooled_line.start()
+        broken = pooled_line.worker_pool.workers[0]
+        broken.is_connected = False
+        self.assertFalse(await pooled_line.check_health())
+        self.assertEqual(pooled_line.worker_pool.size, 2)
+        self.assertNotIn(broken, pooled_line.worker_pool.workers)
+        self.assertTrue(all(x.is_connected for x in pooled_line.worker_pool.workers))
+        await pooled_line.stop()
+        self.assertFalse(any(x.is_connected for x in pooled_line.worker_pool.workers))
+
+
+if __name__ == "__main__":
+    unittest.main()
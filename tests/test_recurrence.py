@@ -0,0 +1,162 @@
+"""Testing the recurrence rules of recurring jobs"""
+import unittest
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytz
+from telegram_task.history import JobHistory
+from telegram_task.line import (
+    LineManager,
+    RecurringJobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+)
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
+from telegram_task.recurrence import IntervalRecurrence, CronRecurrence
+from telegram_task.samples import (
+    CalculatorWorker,
+    CalculatorJobDescription,
+    MathematicalOperation,
+)
+
+
+class SleepingWorker(Worker):
+    """Worker whose jobs outlast the interval they recur on"""
+
+    async def perform_task(self, job_description: JobDescription) -> JobReport:
+        await asyncio.sleep(10)
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
+class TestRecurrence(unittest.TestCase):
+    """Test computing the next fire times"""
+
+    def test_interval(self):
+        """Intervals are counted from the start time"""
+        start = datetime(2023, 1, 1, 10)
+        recurrence = IntervalRecurrence(interval=timedelta(minutes=5), start=start)
+        self.assertEqual(recurrence.next_after(datetime(2023, 1, 1, 9)), start)
+        self.assertEqual(recurrence.next_after(start), datetime(2023, 1, 1, 10, 5))
+        self.assertEqual(
+            recurrence.next_after(datetime(2023, 1, 1, 13, 7, 30)),
+            datetime(2023, 1, 1, 13, 10),
+        )
+        with self.assertRaises(ValueError):
+            IntervalRecurrence(interval=0)
+
+    def test_cron_five_fields(self):
+        """Standard cron expressions fire on whole minutes"""
+        recurrence = CronRecurrence("*/15 9-17 * * mon-fri")
+        # 2023-01-06 is a Friday
+        self.assertEqual(
+            recurrence.next_after(datetime(2023, 1, 6, 9, 14, 59)),
+            datetime(2023, 1, 6, 9, 15),
+        )
+        self.assertEqual(
+            recurrence.next_after(datetime(2023, 1, 6, 17, 45)),
+            datetime(2023, 1, 9, 9, 0),
+        )
+
+    def test_cron_six_fields(self):
+        """Six fields start with the seconds"""
+        recurrence = CronRecurrence("*/20 0 12 * * *")
+        self.assertEqual(
+            recurrence.next_after(datetime(2023, 1, 1, 12, 0, 20)),
+            datetime(2023, 1, 1, 12, 0, 40),
+        )
+        self.assertEqual(
+            recurrence.next_after(datetime(2023, 1, 1, 12, 0, 40)),
+            datetime(2023, 1, 2, 12, 0, 0),
+        )
+
+    def test_cron_days(self):
+        """Days of month and weekdays match either one, as in cron"""
+        recurrence = CronRecurrence("0 0 13 * 5")
+        # 2023-01-06 is a Friday, 2023-01-13 is the following one
+        self.assertEqual(
+            recurrence.next_after(datetime(2023, 1, 1)), datetime(2023, 1, 6)
+        )
+        self.assertEqual(
+            recurrence.next_after(datetime(2023, 1, 6)), datetime(2023, 1, 13)
+        )
+        self.assertEqual(
+            CronRecurrence("0 0 29 feb *").next_after(datetime(2023, 1, 1)),
+            datetime(2024, 2, 29),
+        )
+        self.assertIsNone(CronRecurrence("0 0 30 2 *").next_after(datetime(2023, 1, 1)))
+
+    def test_cron_timezone(self):
+        """Wall times of the timezone are converted to the host's local time"""
+        for tz in [pytz.timezone("Asia/Tokyo"), "Asia/Tokyo"]:
+            recurrence = CronRecurrence("30 8 * * *", timezone=tz)
+            fire_time = recurrence.next_after(datetime.now())
+            fire_time_utc = fire_time.astimezone(timezone.utc)
+            self.assertEqual((fire_time_utc.hour, fire_time_utc.minute), (23, 30))
+            self.assertLessEqual(fire_time - datetime.now(), timedelta(days=1))
+
+    def test_cron_invalid(self):
+        """Invalid expressions are rejected"""
+        for expression in ["* * * *", "60 * * * *", "* * * * mon-xyz", "*/0 * * * *"]:
+            with self.assertRaises(ValueError):
+                CronRecurrence(expression)
+
+
+class TestRecurringJobs(unittest.IsolatedAsyncioTestCase):
+    """Test recurring jobs under a president"""
+
+    async def test_president_runs_recurring_jobs(self):
+        """A single order runs on every interval, holding a single timer"""
+        job_order = RecurringJobOrder(
+            recurrence=IntervalRecurrence(interval=0.2),
+            job_description=CalculatorJobDescription(
+                input1=2, input2=3, operation=MathematicalOperation.SUM
+            ),
+        )
+        job_history = JobHistory()
+        line_manager = LineManager(
+            worker=CalculatorWorker(),
+            recurring_job_orders=[job_order],
+            job_history=job_history,
+        )
+        president = President(telegram_deputy=TelegramDeputy())
+        president.scheduler.max_sleep = 0.05
+        president.add_line(line_manager)
+        operation = asyncio.create_task(president.start_operation_async(lifespan=1.1))
+        await asyncio.sleep(0.5)
+        self.assertEqual(len(president.get_recurring_jobs()), 1)
+        self.assertLessEqual(len(president.scheduler), 2)
+        await operation
+        self.assertGreaterEqual(
+            (await job_history.stats(line_manager.display_name)).runs, 4
+        )
+
+    async def test_overlapping_runs_are_tracked_apart(self):
+        """Overlapping runs of an order can each be found and cancelled"""
+        line_manager = LineManager(
+            worker=SleepingWorker(),
+            recurring_job_orders=[
+                RecurringJobOrder(recurrence=IntervalRecurrence(interval=0.1))
+            ],
+        )
+        president = President(telegram_deputy=TelegramDeputy())
+        president.scheduler.max_sleep = 0.05
+        president.add_line(line_manager)
+        async with president:
+            await asyncio.sleep(0.45)
+            self.assertGreaterEqual(line_manager.jobs_in_flight, 3)
+            self.assertEqual(
+                len(line_manager.running_jobs), line_manager.jobs_in_flight
+            )
+            for job_code in list(line_manager.running_jobs):
+                self.assertTrue(line_manager.cancel_job(job_code))
+            await asyncio.sleep(0.01)
+            self.assertFalse(line_manager.running_jobs)
+
+
+if __name__ == "__main__":
+    unittest.main()
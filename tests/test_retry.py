@@ -0,0 +1,107 @@
+"""Testing retry policies on lines"""
+import unittest
+import asyncio
+from telegram_task.line import (
+    LineManager,
+    JobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+    TaskException,
+)
+from telegram_task.retry import RetryPolicy, RetryBudget
+from telegram_task.scheduler import Scheduler
+
+
+class FlakyWorker(Worker):
+    """Worker that fails a number of times before succeeding"""
+
+    def __init__(self, failures: int, exception_type: type[Exception] = TaskException):
+        self.failures = failures
+        self.exception_type = exception_type
+        self.attempts = 0
+
+    async def perform_task(self, job_description: JobDescription) -> JobReport:
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.exception_type("Not this time.")
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls) -> JobDescription:
+        return JobDescription()
+
+
+class TestRetry(unittest.IsolatedAsyncioTestCase):
+    """Test retry policies, budgets and their use by lines"""
+
+    def test_policy_delay(self):
+        """Delays grow exponentially, capped and jittered"""
+        policy = RetryPolicy(base_delay=1, multiplier=2, max_delay=5, jitter=0.5)
+        self.assertTrue(0.5 <= policy.delay(1) <= 1)
+        self.assertTrue(2 <= policy.delay(3) <= 4)
+        self.assertTrue(2.5 <= policy.delay(10) <= 5)
+
+    def test_budget(self):
+        """Budget allows a limited number of retries in its period"""
+        budget = RetryBudget(max_retries=2)
+        self.assertTrue(budget.try_spend())
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+
+    async def test_line_retries_until_success(self):
+        """A flaky job succeeds on its last attempt, reporting the attempts"""
+        worker = FlakyWorker(failures=2)
+        line_manager = LineManager(
+            worker=worker, retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01)
+        )
+        reports = []
+
+        def reporter(text: str) -> None:
+            reports.append(text)
+
+        self.assertTrue(
+            await line_manager.perform_task(job_order=JobOrder(), reporter=reporter)
+        )
+        self.assertEqual(worker.attempts, 3)
+        self.assertIn("(attempt 3/3) is done", reports[-1])
+
+    async def test_line_retries_on_scheduler(self):
+        """Retries are woken up by the line's scheduler when it is running"""
+        worker = FlakyWorker(failures=1)
+        line_manager = LineManager(
+            worker=worker, retry_policy=RetryPolicy(max_attempts=2, base_delay=0.05)
+        )
+        line_manager.scheduler = Scheduler()
+        driver = asyncio.create_task(line_manager.scheduler.run())
+        await asyncio.sleep(0)
+        self.assertTrue(await line_manager.perform_task(job_order=JobOrder()))
+        line_manager.scheduler.stop()
+        await driver
+        self.assertEqual(worker.attempts, 2)
+        self.assertEqual(len(line_manager.scheduler), 0)
+
+    async def test_line_gives_up(self):
+        """Non-retryable exceptions and exhausted budgets stop retries"""
+        worker = FlakyWorker(failures=5, exception_type=ValueError)
+        line_manager = LineManager(
+            worker=worker,
+            retry_policy=RetryPolicy(
+                max_attempts=3, base_delay=0.01, retry_on=(TaskException,)
+            ),
+        )
+        self.assertFalse(await line_manager.perform_task(job_order=JobOrder()))
+        self.assertEqual(worker.attempts, 1)
+        worker = FlakyWorker(failures=5)
+        line_manager = LineManager(worker=worker)
+        job_order = JobOrder(
+            retry_policy=RetryPolicy(
+                max_attempts=5, base_delay=0.01, budget=RetryBudget(max_retries=1)
+            )
+        )
+        self.assertFalse(await line_manager.perform_task(job_order=job_order))
+        self.assertEqual(worker.attempts, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
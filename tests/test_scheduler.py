@@ -0,0 +1,135 @@
+"""Testing the heap-based scheduler"""
+
+import unittest
+import asyncio
+from datetime import datetime, time, timedelta
+from telegram_task.line import LineManager, CronJobOrder
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
+from telegram_task.scheduler import Scheduler, CatchUpPolicy
+from telegram_task.samples import (
+    CalculatorWorker,
+    CalculatorJobDescription,
+    MathematicalOperation,
+)
+
+
+class TestScheduler(unittest.IsolatedAsyncioTestCase):
+    """Test the scheduler, both on its own and under a president"""
+
+    async def test_scheduler_fires_in_order(self):
+        """Calls are fired by their deadlines, not by their insertion order"""
+        scheduler = Scheduler()
+        fired = []
+
+        def make_callback(name: str):
+            async def callback():
+                fired.append(name)
+
+            return callback
+
+        now = datetime.now()
+        scheduler.schedule(now + timedelta(seconds=0.3), make_callback("late"))
+        scheduler.schedule(now + timedelta(seconds=0.1), make_callback("early"))
+        driver = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.05)
+        scheduler.schedule(now + timedelta(seconds=0.2), make_callback("middle"))
+        await asyncio.sleep(0.5)
+        scheduler.stop()
+        await driver
+        self.assertEqual(fired, ["early", "middle", "late"])
+        self.assertEqual(len(scheduler), 0)
+
+    async def test_scheduler_cancel(self):
+        """Cancelled calls are never fired"""
+        scheduler = Scheduler()
+        fired = []
+
+        async def callback():
+            fired.append(True)
+
+        call = scheduler.schedule(datetime.now() + timedelta(seconds=0.1), callback)
+        self.assertEqual(len(scheduler), 1)
+        scheduler.cancel(call)
+        self.assertEqual(len(scheduler), 0)
+        self.assertIsNone(scheduler.next_fire_time())
+        driver = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.2)
+        scheduler.stop()
+        await driver
+        self.assertFalse(fired)
+
+    async def test_president_add_and_remove_cron_job_order(self):
+        """Orders added or removed on the fly do not rebuild the day"""
+        if datetime.now().time() > time(hour=23, minute=58):
+            return
+        line_manager = LineManager(worker=CalculatorWorker())
+        president = President(telegram_deputy=TelegramDeputy())
+        president.add_line(line_manager)
+        operation = asyncio.create_task(president.start_operation_async(lifespan=2))
+        await asyncio.sleep(0.1)
+        order1 = CronJobOrder(
+            (datetime.now() + timedelta(seconds=1)).time(),
+            job_description=CalculatorJobDescription(
+                input1=2, input2=3, operation=MathematicalOperation.SUM
+            ),
+        )
+        order2 = CronJobOrder(time(hour=23, minute=59, second=59))
+        president.add_cron_job_order(line_manager, order1)
+        president.add_cron_job_order(line_manager, order2)
+        self.assertEqual(len(president.daily_cron_jobs), 2)
+        president.remove_cron_job_order(line_manager, order2)
+        self.assertEqual(len(president.daily_cron_jobs), 1)
+        await operation
+        self.assertTrue(president.daily_cron_jobs[0][2] is True)
+
+    async def test_scheduler_records_lateness(self):
+        """Overdue calls are fired right away and their lateness is recorded"""
+        scheduler = Scheduler(max_sleep=0.05)
+        fired = []
+
+        async def callback():
+            fired.append(True)
+
+        overdue = scheduler.schedule(datetime.now() - timedelta(seconds=2), callback)
+        on_time = scheduler.schedule(datetime.now() + timedelta(seconds=0.2), callback)
+        driver = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.4)
+        scheduler.stop()
+        await driver
+        self.assertEqual(len(fired), 2)
+        self.assertGreaterEqual(overdue.lateness, 2)
+        self.assertLess(on_time.lateness, 0.1)
+        self.assertEqual(scheduler.stats.fired, 2)
+        self.assertEqual(scheduler.stats.max_lateness, overdue.lateness)
+
+    async def test_president_catch_up_policy(self):
+        """Runs missed before the start are caught up only if asked to"""
+        now = datetime.now()
+        if now.time() < time(minute=10):
+            return
+        for catch_up, expected_jobs in [
+            (CatchUpPolicy.SKIP, 0),
+            (CatchUpPolicy.RUN_ONCE, 1),
+        ]:
+            line_manager = LineManager(
+                worker=CalculatorWorker(),
+                cron_job_orders=[
+                    CronJobOrder(
+                        (now - timedelta(minutes=5)).time(),
+                        job_description=CalculatorJobDescription(
+                            input1=2, input2=3, operation=MathematicalOperation.SUM
+                        ),
+                    )
+                ],
+            )
+            president = President(telegram_deputy=TelegramDeputy(), catch_up=catch_up)
+            president.add_line(line_manager)
+            await president.start_operation_async(lifespan=0.5)
+            self.assertEqual(len(president.daily_cron_jobs), expected_jobs)
+            if expected_jobs:
+                self.assertTrue(president.daily_cron_jobs[0][2] is True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Testing the precompiled schemas of job descriptions"""
+import unittest
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+from telegram_task.line import JobDescription
+from telegram_task.schema import schema_of
+from telegram_task.samples import CalculatorJobDescription, MathematicalOperation
+
+
+@dataclass
+class Interval:
+    """Nested field of the sample job description"""
+
+    start: date = None
+    length: int = 0
+
+
+@dataclass
+class ReportJobDescription(JobDescription):
+    """Sample job description with optional and nested fields"""
+
+    limit: Optional[int] = None
+    interval: Interval = None
+
+
+class TestSchema(unittest.TestCase):
+    """Test building, caching and using the schemas"""
+
+    def test_schema_is_cached(self):
+        """Schemas are built once per job description class"""
+        self.assertIs(
+            schema_of(CalculatorJobDescription), schema_of(CalculatorJobDescription)
+        )
+        self.assertEqual(len(schema_of(JobDescription).fields), 0)
+
+    def test_convert(self):
+        """Input is converted to the types of the fields"""
+        schema = schema_of(CalculatorJobDescription)
+        self.assertEqual(schema.convert("input1", "3.5"), 3.5)
+        self.assertIs(schema.convert("operation", "MUL"), MathematicalOperation.MUL)
+        with self.assertRaises(KeyError):
+            schema.convert("unknown", "3")
+
+    def test_convert_optional_and_nested(self):
+        """Optional fields accept none and nested dataclasses accept JSON"""
+        schema = schema_of(ReportJobDescription)
+        self.assertIsNone(schema.convert("limit", "None"))
+        self.assertEqual(schema.convert("limit", "5"), 5)
+        self.assertEqual(
+            schema.convert("interval", '{"start": "2023-01-02", "length": 3}'),
+            Interval(start=date(2023, 1, 2), length=3),
+        )
+        with self.assertRaises(ValueError):
+            schema.convert("interval", "[1, 2]")
+
+    def test_render_and_keyboard(self):
+        """Panels show every field with an edit button"""
+        schema = schema_of(ReportJobDescription)
+        text = schema.render(ReportJobDescription(limit=4))
+        self.assertIn("<b>limit</b> (int?) ➡️  4", text)
+        rows = schema.keyboard_rows(job_code="abc")
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(
+            rows[0][0].switch_inline_query_current_chat,
+            "SpecificNewJobPanelUpdate limit on job abc : ",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""Testing the graceful shutdown of the operation"""
+import unittest
+import asyncio
+import os
+import tempfile
+import time
+from telegram_task.fakebot import FakeBotApi
+from telegram_task.line import (
+    LineManager,
+    JobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+    TaskException,
+)
+from telegram_task.journal import JobJournal
+from telegram_task.deputy import TelegramDeputy
+from telegram_task.president import President
+from telegram_task.retry import RetryPolicy
+
+
+class SlowWorker(Worker):
+    """Worker which takes a fixed while, counting finished jobs"""
+
+    def __init__(self, duration: float = 0.3):
+        self.duration: float = duration
+        self.finished_count: int = 0
+        self.is_torn_down: bool = False
+
+    async def perform_task(self, job_description) -> JobReport:
+        await asyncio.sleep(self.duration)
+        self.finished_count += 1
+        return JobReport()
+
+    async def teardown(self) -> None:
+        self.is_torn_down = True
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+class FailingWorker(Worker):
+    """Worker whose jobs always fail, counting the attempts"""
+
+    def __init__(self):
+        self.attempts: int = 0
+
+    async def perform_task(self, job_description) -> JobReport:
+        self.attempts += 1
+        raise TaskException("Not this time.")
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+class TestShutdown(unittest.IsolatedAsyncioTestCase):
+    """Test draining jobs and stopping in order"""
+
+    async def test_context_manager_drains_jobs(self):
+        """Running jobs finish, queued and new ones are rejected"""
+        worker = SlowWorker()
+        line_manager = LineManager(worker=worker, max_concurrency=1)
+        async with President(telegram_deputy=TelegramDeputy()) as president:
+            president.add_line(line_manager)
+            self.assertTrue(president.is_running)
+            jobs = [
+                asyncio.create_task(line_manager.perform_task(job_order=JobOrder()))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.1)
+        self.assertFalse(president.is_running)
+        self.assertEqual(await asyncio.gather(*jobs), [True, False])
+        self.assertEqual(worker.finished_count, 1)
+        self.assertTrue(worker.is_torn_down)
+        self.assertFalse(await line_manager.perform_task(job_order=JobOrder()))
+
+    async def test_deadline_cancels_jobs(self):
+        """Jobs still running at the deadline are cancelled"""
+        worker = SlowWorker(duration=5)
+        line_manager = LineManager(worker=worker)
+        president = President(telegram_deputy=TelegramDeputy(), shutdown_timeout=0.2)
+        president.add_line(line_manager)
+        operation = asyncio.create_task(president.start_operation_async())
+        await asyncio.sleep(0.1)
+        job = asyncio.create_task(line_manager.perform_task(job_order=JobOrder()))
+        await asyncio.sleep(0.1)
+        start = time.monotonic()
+        president.stop_operation()
+        await operation
+        self.assertLess(time.monotonic() - start, 1)
+        with self.assertRaises(asyncio.CancelledError):
+            await job
+        self.assertEqual(worker.finished_count, 0)
+
+    async def test_jobs_waiting_for_retry_end(self):
+        """A job waiting for its retry is woken up and ends without retrying"""
+        worker = FailingWorker()
+        line_manager = LineManager(
+            worker=worker, retry_policy=RetryPolicy(max_attempts=3, base_delay=60)
+        )
+        president = President(shutdown_timeout=2)
+        president.add_line(line_manager)
+        async with president:
+            job = asyncio.create_task(line_manager.perform_task(job_order=JobOrder()))
+            await asyncio.sleep(0.1)
+            self.assertEqual(line_manager.jobs_in_flight, 1)
+            start = time.monotonic()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(job.done())
+        self.assertFalse(job.result())
+        self.assertEqual(worker.attempts, 1)
+
+    async def test_update_handlers_are_drained(self):
+        """Updates being handled are finished before telegram is stopped"""
+        fake_api = FakeBotApi()
+        deputy = TelegramDeputy(
+            telegram_app=fake_api.build_application(), telegram_admin_id=42
+        )
+        handled = []
+
+        async def slow_handler(update) -> None:
+            await asyncio.sleep(0.3)
+            handled.append(update.update_id)
+
+        deputy.update_dispatcher.handler = slow_handler
+        president = President(telegram_deputy=deputy)
+        president.add_line(LineManager(worker=SlowWorker()))
+        async with president:
+            update_id = fake_api.push_message(".", chat_id=42)
+            while not deputy.update_dispatcher.stats.in_flight:
+                await asyncio.sleep(0.01)
+        self.assertEqual(handled, [update_id])
+
+    async def test_failed_operation_cancels_the_others(self):
+        """An operation failing ends the operation, cancelling the others"""
+        fake_api = FakeBotApi()
+        deputy = TelegramDeputy(
+            telegram_app=fake_api.build_application(), telegram_admin_id=42
+        )
+        line_manager = LineManager(worker=SlowWorker())
+
+        async def broken_health_check() -> bool:
+            raise RuntimeError("Health check is broken.")
+
+        line_manager.check_health = broken_health_check
+        president = President(telegram_deputy=deputy, health_check_interval=0.1)
+        president.add_line(line_manager)
+        with self.assertRaises(RuntimeError):
+            await president.start_operation_async(lifespan=5)
+        self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+
+    async def test_rejected_jobs_stay_journaled(self):
+        """Jobs rejected on shutdown are left in the journal to be replayed"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        job_journal = JobJournal(path=os.path.join(directory.name, "journal.db"))
+        line_manager = LineManager(worker=SlowWorker(), max_concurrency=1)
+        async with President(
+            telegram_deputy=TelegramDeputy(), job_journal=job_journal
+        ) as president:
+            president.add_line(line_manager)
+            jobs = [
+                asyncio.create_task(
+                    president.perform_job(line=line_manager, job_order=JobOrder())
+                )
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.1)
+        self.assertEqual(await asyncio.gather(*jobs), [True, False])
+        await job_journal.drain()
+        self.assertEqual(len(job_journal.unfinished()), 1)
+        job_journal.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
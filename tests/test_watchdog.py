@@ -0,0 +1,90 @@
+"""Testing the event loop monitor catching the code blocking the loop"""
+import unittest
+import asyncio
+import time
+from telegram_task.line import (
+    LineManager,
+    JobOrder,
+    JobReport,
+    JobDescription,
+    Worker,
+)
+from telegram_task.metrics import MetricsRegistry
+from telegram_task.president import President
+from telegram_task.watchdog import LoopMonitor
+
+
+class BlockingLoopWorker(Worker):
+    """Worker which mistakenly blocks the event loop it runs on"""
+
+    async def perform_task(self, job_description) -> JobReport:
+        time.sleep(0.3)
+        return JobReport()
+
+    @classmethod
+    def default_job_description(cls):
+        return JobDescription()
+
+
+class TestLoopMonitor(unittest.IsolatedAsyncioTestCase):
+    """Test sampling the loop lag and attributing its stalls"""
+
+    async def test_stalls_of_jobs(self):
+        """Stalls are traced back to the job, alerts on a line are throttled"""
+        alerts = []
+        registry = MetricsRegistry()
+        line_manager = LineManager(
+            worker_factory=BlockingLoopWorker, min_workers=1, max_workers=2
+        )
+        president = President(stall_threshold=0.1, metrics=registry)
+        president.loop_monitor.interval = 0.05
+        president.loop_monitor.alert = alerts.append
+        president.add_line(line_manager)
+        job_orders = [JobOrder(), JobOrder()]
+        async with president:
+            for job_order in job_orders:
+                await asyncio.sleep(0.1)
+                await line_manager.perform_task(job_order)
+            await asyncio.sleep(0.1)
+        stalls = list(president.loop_monitor.stalls)
+        self.assertEqual(
+            [(x.line, x.job_code) for x in stalls],
+            [("BlockingLoopWorker", x.job_code) for x in job_orders],
+        )
+        self.assertGreater(stalls[0].blocked_for, 0.2)
+        self.assertIn("time.sleep(0.3)", stalls[0].stack)
+        self.assertEqual(len(alerts), 1)
+        self.assertIn(str(job_orders[0].job_code), alerts[0])
+        self.assertGreater(president.loop_monitor.stats.max_lag, 0.2)
+        self.assertEqual(
+            registry.get("telegram_task_event_loop_stalls_total")
+            .labels("BlockingLoopWorker")
+            .value,
+            2,
+        )
+
+    async def test_stalls_outside_jobs(self):
+        """Blocking callbacks are caught too, held alerts are counted"""
+        alerts = []
+        monitor = LoopMonitor(
+            stall_threshold=0.1,
+            interval=0.05,
+            alert_interval=0.5,
+            alert=alerts.append,
+            metrics=MetricsRegistry(),
+        )
+        task = asyncio.create_task(monitor.run())
+        for _ in range(3):
+            await asyncio.sleep(0.1)
+            asyncio.get_running_loop().call_soon(time.sleep, 0.3)
+        await asyncio.sleep(0.1)
+        monitor.stop()
+        await task
+        self.assertEqual(monitor.stats.stalls, 3)
+        self.assertEqual(monitor.stalls[0].culprit, "code outside the jobs")
+        self.assertEqual(len(alerts), 2)
+        self.assertIn("1 more stalls were not alerted", alerts[1])
+
+
+if __name__ == "__main__":
+    unittest.main()